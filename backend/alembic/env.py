@@ -13,7 +13,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.core.config import settings
 from app.db.session import Base
-from app.models import Country, Indicator, IndicatorValue, MomentumScore, PillarScore
+from app.models import Country, Indicator, IndicatorValue, SeriesFingerprint, MomentumScore, PillarScore, DataSnapshot, SnapshotPayload, LeaderboardEntry, PipelineRun, PipelineStageRun
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,74 @@
+"""Deduplicate indicator values and make their (country, indicator, date) index unique
+
+The streaming fetch upserts with ON CONFLICT (country_code, indicator_id,
+date), which needs a unique index on those columns. Databases created
+before the index became unique still have a plain index and may hold
+duplicate observations; the newest row (highest id) of each duplicate
+group is kept.
+
+Revision ID: 4f2b8c1d9e7a
+Revises:
+Create Date: 2026-10-19 06:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2b8c1d9e7a'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLE = "indicator_values"
+INDEX = "ix_indicator_values_country_indicator_date"
+COLUMNS = ["country_code", "indicator_id", "date"]
+
+
+def _index(bind):
+    """The (country, indicator, date) index as reported by the inspector, if any"""
+    for index in sa.inspect(bind).get_indexes(TABLE):
+        if index["name"] == INDEX:
+            return index
+    return None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Fresh databases get the unique index from create_all (seed_data.py)
+    if not sa.inspect(bind).has_table(TABLE):
+        return
+
+    index = _index(bind)
+    if index is not None and index["unique"]:
+        return
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            f"DELETE FROM {TABLE} a USING {TABLE} b "
+            "WHERE a.country_code = b.country_code "
+            "AND a.indicator_id = b.indicator_id "
+            "AND a.date = b.date "
+            "AND a.id < b.id"
+        )
+    else:
+        op.execute(
+            f"DELETE FROM {TABLE} WHERE id NOT IN ("
+            f"SELECT MAX(id) FROM {TABLE} GROUP BY country_code, indicator_id, date)"
+        )
+
+    if index is not None:
+        op.drop_index(INDEX, table_name=TABLE)
+    op.create_index(INDEX, TABLE, COLUMNS, unique=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE) or _index(bind) is None:
+        return
+
+    # Removed duplicates are not restored
+    op.drop_index(INDEX, table_name=TABLE)
+    op.create_index(INDEX, TABLE, COLUMNS)
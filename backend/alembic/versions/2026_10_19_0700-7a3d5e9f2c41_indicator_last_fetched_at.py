@@ -0,0 +1,48 @@
+"""Add indicators.last_fetched_at
+
+The scheduler fetches an indicator only when its release cadence has
+elapsed since the last completed fetch. create_all (seed_data.py) does not
+add columns to existing tables, so databases created before the column
+existed need it added here.
+
+Revision ID: 7a3d5e9f2c41
+Revises: 4f2b8c1d9e7a
+Create Date: 2026-10-19 07:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3d5e9f2c41'
+down_revision = '4f2b8c1d9e7a'
+branch_labels = None
+depends_on = None
+
+TABLE = "indicators"
+COLUMN = "last_fetched_at"
+
+
+def _has_column(bind) -> bool:
+    """Whether the indicators table already has the column"""
+    return any(column["name"] == COLUMN for column in sa.inspect(bind).get_columns(TABLE))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Fresh databases get the column from create_all (seed_data.py)
+    if not sa.inspect(bind).has_table(TABLE) or _has_column(bind):
+        return
+
+    op.add_column(TABLE, sa.Column(COLUMN, sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE) or not _has_column(bind):
+        return
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.drop_column(COLUMN)
@@ -0,0 +1,59 @@
+"""Add pillar_scores.as_of_date and pillar_scores.is_stale
+
+Slow pillars carry a release forward between monthly runs and record the
+observation their score is based on and whether it is older than the
+pillar's staleness limit. create_all (seed_data.py) does not add columns
+to existing tables. Existing rows get no as_of_date, so the next score run
+recomputes their slow pillars instead of carrying them forward.
+
+Revision ID: b6e1c3a8d452
+Revises: 7a3d5e9f2c41
+Create Date: 2026-10-19 08:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1c3a8d452'
+down_revision = '7a3d5e9f2c41'
+branch_labels = None
+depends_on = None
+
+TABLE = "pillar_scores"
+COLUMNS = ["as_of_date", "is_stale"]
+
+
+def _existing_columns(bind):
+    """Names of COLUMNS the pillar_scores table already has"""
+    existing = {column["name"] for column in sa.inspect(bind).get_columns(TABLE)}
+    return [name for name in COLUMNS if name in existing]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Fresh databases get the columns from create_all (seed_data.py)
+    if not sa.inspect(bind).has_table(TABLE):
+        return
+
+    existing = _existing_columns(bind)
+    if "as_of_date" not in existing:
+        op.add_column(TABLE, sa.Column("as_of_date", sa.DateTime(), nullable=True))
+    if "is_stale" not in existing:
+        op.add_column(TABLE, sa.Column("is_stale", sa.Boolean(), server_default=sa.false()))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE):
+        return
+
+    existing = _existing_columns(bind)
+    if not existing:
+        return
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for name in reversed(existing):
+            batch_op.drop_column(name)
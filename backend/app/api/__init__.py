@@ -2,7 +2,7 @@
 API Router - Aggregates all API endpoints
 """
 from fastapi import APIRouter
-from app.api.endpoints import countries, momentum, indicators
+from app.api.endpoints import countries, momentum, indicators, dashboard, export, events, cache, jobs
 
 api_router = APIRouter()
 
@@ -24,3 +24,33 @@ api_router.include_router(
     prefix="/indicators",
     tags=["indicators"]
 )
+
+api_router.include_router(
+    dashboard.router,
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
+
+api_router.include_router(
+    export.router,
+    prefix="/export",
+    tags=["export"]
+)
+
+api_router.include_router(
+    events.router,
+    prefix="/events",
+    tags=["events"]
+)
+
+api_router.include_router(
+    cache.router,
+    prefix="/cache",
+    tags=["cache"]
+)
+
+api_router.include_router(
+    jobs.router,
+    prefix="/jobs",
+    tags=["jobs"]
+)
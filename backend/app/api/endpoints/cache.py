@@ -0,0 +1,18 @@
+"""
+Cache API Endpoints
+"""
+from fastapi import APIRouter
+from app.core.cache import response_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_cache_stats():
+    """
+    Get response cache statistics for this worker
+
+    Counts hits, misses, stores and bytes read/written since the worker
+    started; the memory backend also reports its current size.
+    """
+    return response_cache.stats()
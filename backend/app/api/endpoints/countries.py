@@ -1,58 +1,237 @@
 """
 Countries API Endpoints
 """
-from typing import List
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.db.session import get_db
+import math
+from typing import Dict, List, Optional
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy import and_, desc, func, select, tuple_
+from app.db.replica import get_read_db
+from app.core.cache import CachePolicy, cached_response, data_version
+from app.utils.params import split_codes
+from app.core.serialization import rows_to_json, schema_columns
 from app.schemas.country import Country, CountryDetail
 from app.models.country import Country as CountryModel
-from app.models.momentum import MomentumScore
+from app.models.momentum import MomentumScore, PillarScore
+from app.services.history_store import SLOW_PILLAR_NAMES, history_store
 
 router = APIRouter()
 
+# Columns backing the Country response schema (fast serialization path)
+COUNTRY_COLUMNS = schema_columns(CountryModel, Country)
+COUNTRY_FIELDS = list(Country.model_fields)
+
+# Cache behaviour per route. The country list is shared by every client, so
+# it is served stale while rebuilding; per-country routes have many distinct
+# keys and only coalesce concurrent misses.
+COUNTRIES_CACHE_POLICY = CachePolicy(single_flight=True, stale_while_revalidate=True)
+COUNTRY_DETAIL_CACHE_POLICY = CachePolicy(single_flight=True, stale_while_revalidate=False)
+
 
 @router.get("/", response_model=List[Country])
 async def get_countries(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Keyset cursor: code of the last country received"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get list of all countries with basic info
+
+    Ordered by code. Prefer `after` (keyset) over `skip` for paging,
+    since offsets get slower the deeper the page.
     """
-    countries = db.query(CountryModel).filter(
+    return await cached_response(
+        request,
+        db,
+        lambda session: _build_countries(session, skip, limit, after),
+        policy=COUNTRIES_CACHE_POLICY
+    )
+
+
+async def _build_countries(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    after: Optional[str]
+) -> bytes:
+    """Query active countries as JSON bytes"""
+    stmt = select(*COUNTRY_COLUMNS).filter(
         CountryModel.is_active == True
-    ).offset(skip).limit(limit).all()
+    ).order_by(CountryModel.code)
+
+    if after:
+        stmt = stmt.filter(CountryModel.code > after.upper())
+
+    result = await db.execute(stmt.offset(skip).limit(limit))
+
+    return rows_to_json(result.all(), COUNTRY_FIELDS)
+
+
+@router.get("/batch", response_model=List[CountryDetail])
+async def get_countries_batch(
+    request: Request,
+    codes: str = Query(..., description="Comma-separated country codes, e.g. USA,DEU"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get detailed information for several countries in one request
+    Unknown codes are omitted from the response
+    """
+    country_codes = split_codes(codes)
+
+    if not country_codes:
+        raise HTTPException(status_code=422, detail="No country codes given")
 
-    return countries
+    return await cached_response(
+        request,
+        db,
+        lambda session: _build_countries_batch(session, country_codes),
+        response_model=List[CountryDetail],
+        policy=COUNTRY_DETAIL_CACHE_POLICY
+    )
+
+
+async def _build_countries_batch(db: AsyncSession, country_codes: List[str]) -> List[dict]:
+    """Query countries with their latest scores in one statement"""
+    # Latest score per country via a window function, in the same query
+    ranked = select(
+        MomentumScore,
+        func.row_number().over(
+            partition_by=MomentumScore.country_code,
+            order_by=desc(MomentumScore.date)
+        ).label("row_number")
+    ).filter(
+        MomentumScore.country_code.in_(country_codes)
+    ).subquery()
+
+    latest_score = aliased(MomentumScore, ranked)
+
+    result = await db.execute(
+        select(
+            CountryModel,
+            latest_score
+        ).outerjoin(
+            latest_score,
+            and_(
+                latest_score.country_code == CountryModel.code,
+                ranked.c.row_number == 1
+            )
+        ).filter(
+            CountryModel.code.in_(country_codes)
+        )
+    )
+    rows = result.all()
+    vintages = await _pillar_vintages(
+        db, {country.code: score.date for country, score in rows if score is not None}
+    )
+    details = {
+        country.code: _country_detail(country, score, vintages.get(country.code, []))
+        for country, score in rows
+    }
+
+    return [details[code] for code in dict.fromkeys(country_codes) if code in details]
 
 
 @router.get("/{country_code}", response_model=CountryDetail)
 async def get_country_detail(
+    request: Request,
     country_code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get detailed information for a specific country
     """
+    return await cached_response(
+        request,
+        db,
+        lambda session: _build_country_detail(session, country_code),
+        response_model=CountryDetail,
+        policy=COUNTRY_DETAIL_CACHE_POLICY
+    )
+
+
+async def _build_country_detail(db: AsyncSession, country_code: str) -> dict:
+    """Query a country and its latest score"""
     # Get country
-    country = db.query(CountryModel).filter(
-        CountryModel.code == country_code.upper()
-    ).first()
+    country = await db.get(CountryModel, country_code.upper())
 
     if not country:
         raise HTTPException(status_code=404, detail="Country not found")
 
     # Get latest momentum score
-    latest_score = db.query(MomentumScore).filter(
-        MomentumScore.country_code == country_code.upper()
-    ).order_by(desc(MomentumScore.date)).first()
+    result = await db.execute(
+        select(MomentumScore).filter(
+            MomentumScore.country_code == country_code.upper()
+        ).order_by(desc(MomentumScore.date)).limit(1)
+    )
+    latest_score = result.scalars().first()
 
-    # Build response
-    country_dict = {
+    vintages = await _pillar_vintages(
+        db, {country.code: latest_score.date} if latest_score else {}
+    )
+
+    return _country_detail(country, latest_score, vintages.get(country.code, []))
+
+
+async def _pillar_vintages(db: AsyncSession, score_dates: Dict[str, datetime]) -> Dict[str, List[dict]]:
+    """
+    Query the slow pillar vintages behind each country's latest score
+
+    Args:
+        db: Async database session
+        score_dates: Country code -> date of its latest score
+
+    Returns:
+        Country code -> PillarVintage dictionaries (countries without slow
+        pillar scores are omitted)
+    """
+    if not score_dates or not SLOW_PILLAR_NAMES:
+        return {}
+
+    result = await db.execute(
+        select(
+            PillarScore.country_code,
+            PillarScore.pillar_name,
+            PillarScore.as_of_date,
+            PillarScore.is_stale
+        ).filter(
+            tuple_(PillarScore.country_code, PillarScore.date).in_(list(score_dates.items())),
+            PillarScore.pillar_name.in_(SLOW_PILLAR_NAMES)
+        ).order_by(PillarScore.pillar_name)
+    )
+
+    vintages: Dict[str, List[dict]] = {}
+    for code, pillar_name, as_of_date, is_stale in result.all():
+        vintages.setdefault(code, []).append({
+            "pillar_name": pillar_name,
+            "as_of_date": as_of_date,
+            "is_stale": bool(is_stale)
+        })
+    return vintages
+
+
+def _country_detail(
+    country: CountryModel,
+    latest_score: Optional[MomentumScore],
+    pillar_vintage: List[dict]
+) -> dict:
+    """
+    Build a CountryDetail response
+
+    Args:
+        country: Country model
+        latest_score: Latest momentum score for the country, if any
+        pillar_vintage: Slow pillar vintages behind that score
+
+    Returns:
+        Dictionary matching the CountryDetail schema
+    """
+    return {
         "code": country.code,
         "name": country.name,
         "region": country.region,
@@ -64,53 +243,56 @@ async def get_country_detail(
         "updated_at": country.updated_at,
         "latest_momentum_score": latest_score.momentum_score if latest_score else None,
         "latest_classification": latest_score.classification if latest_score else None,
-        "global_rank": latest_score.global_rank if latest_score else None
+        "global_rank": latest_score.global_rank if latest_score else None,
+        "pillar_vintage": pillar_vintage
     }
 
-    return country_dict
-
 
 @router.get("/{country_code}/momentum-history")
 async def get_country_momentum_history(
     country_code: str,
     months: int = 12,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get historical momentum scores for a country
+
+    Served from the in-memory score history of the current data version.
     """
-    # Verify country exists
-    country = db.query(CountryModel).filter(
-        CountryModel.code == country_code.upper()
-    ).first()
+    store = await history_store.get(await data_version.get(db))
+    code = country_code.upper()
 
-    if not country:
+    if code not in store.names:
         raise HTTPException(status_code=404, detail="Country not found")
 
-    # Calculate date threshold
-    cutoff_date = datetime.utcnow() - timedelta(days=months * 30)
+    # Calendar months, not 30-day blocks
+    cutoff_date = datetime.utcnow() - relativedelta(months=months)
+    rows = store.row_range(code, start=cutoff_date)
 
-    # Get historical scores
-    scores = db.query(MomentumScore).filter(
-        MomentumScore.country_code == country_code.upper(),
-        MomentumScore.date >= cutoff_date
-    ).order_by(MomentumScore.date).all()
+    dates = store.dates[rows].tolist()
+    scores = {series: values[rows].tolist() for series, values in store.scores.items()}
+    classifications = store.labels(rows)
+    ranks = store.ranks[rows].tolist()
 
-    # Format response
     history = [
         {
-            "date": score.date.isoformat(),
-            "momentum_score": score.momentum_score,
-            "structural_score": score.structural_score,
-            "combined_score": score.combined_score,
-            "classification": score.classification,
-            "global_rank": score.global_rank
+            "date": date.isoformat(),
+            "momentum_score": _value(scores["momentum_score"][i]),
+            "structural_score": _value(scores["structural_score"][i]),
+            "combined_score": _value(scores["combined_score"][i]),
+            "classification": classifications[i],
+            "global_rank": ranks[i] or None
         }
-        for score in scores
+        for i, date in enumerate(dates)
     ]
 
     return {
-        "country_code": country_code.upper(),
-        "country_name": country.name,
+        "country_code": code,
+        "country_name": store.names[code],
         "history": history
     }
+
+
+def _value(value: float) -> Optional[float]:
+    """Map the store's NaN placeholder back to None"""
+    return None if math.isnan(value) else value
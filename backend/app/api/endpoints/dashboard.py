@@ -0,0 +1,91 @@
+"""
+Dashboard API Endpoints
+"""
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
+from app.db.replica import get_read_db
+from app.core.cache import cached_response, data_version
+from app.schemas.country import Country as CountrySchema
+from app.schemas.dashboard import DashboardBootstrap
+from app.schemas.momentum import MomentumScore as MomentumScoreSchema
+from app.services.leaderboard import PERIOD_COLUMNS, build_leaderboard
+from app.services.map_payload import build_feature_collection
+from app.models.country import Country
+from app.models.momentum import MomentumScore
+
+router = APIRouter()
+
+COUNTRY_FIELDS = list(CountrySchema.model_fields)
+MOMENTUM_SCORE_FIELDS = list(MomentumScoreSchema.model_fields)
+
+
+@router.get("/bootstrap", response_model=DashboardBootstrap)
+async def get_dashboard_bootstrap(
+    request: Request,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get everything the dashboard needs in one response:
+    countries, latest scores, leaderboards for every period and both
+    map variants, all computed from a single snapshot read
+    """
+    return await cached_response(
+        request,
+        db,
+        lambda session: _build_bootstrap(session, limit)
+    )
+
+
+async def _build_bootstrap(db: AsyncSession, limit: int) -> dict:
+    """Build the bootstrap bundle from one countries-outer-join-latest-scores query"""
+    version = await data_version.get(db)
+
+    latest_date = select(func.max(MomentumScore.date)).scalar_subquery()
+
+    result = await db.execute(
+        select(
+            Country,
+            MomentumScore
+        ).outerjoin(
+            MomentumScore,
+            and_(
+                MomentumScore.country_code == Country.code,
+                MomentumScore.date == latest_date
+            )
+        ).order_by(Country.code)
+    )
+    rows = result.all()
+
+    countries = [country for country, _ in rows if country.is_active]
+    scored = [(score, country) for country, score in rows if score is not None]
+
+    # Same ordering as /momentum/latest
+    scored.sort(key=lambda pair: (pair[0].global_rank is None, pair[0].global_rank))
+
+    mapped = [
+        (score, country) for score, country in scored
+        if country.latitude is not None and country.longitude is not None
+    ]
+
+    return {
+        "data_version": version,
+        "date": scored[0][0].date if scored else None,
+        "countries": [
+            {field: getattr(country, field) for field in COUNTRY_FIELDS}
+            for country in countries
+        ],
+        "latest": [
+            {field: getattr(score, field) for field in MOMENTUM_SCORE_FIELDS}
+            for score, _ in scored
+        ],
+        "leaderboards": {
+            period: build_leaderboard(period, scored, limit)
+            for period in PERIOD_COLUMNS
+        },
+        "map_data": {
+            "momentum": build_feature_collection(mapped, include_structural=False),
+            "combined": build_feature_collection(mapped, include_structural=True),
+        },
+    }
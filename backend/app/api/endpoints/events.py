@@ -0,0 +1,69 @@
+"""
+Events API Endpoints
+Pushes pipeline and snapshot events to the dashboard over Server-Sent Events
+"""
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.events import broadcaster
+
+router = APIRouter()
+
+# Client reconnect delay advertised in the stream (milliseconds)
+RETRY_MILLISECONDS = 5000
+
+
+async def _event_stream(request: Request, last_id: int) -> AsyncIterator[bytes]:
+    """
+    Yield buffered events after last_id, then new events as they are published
+
+    A comment line is sent every SSE_HEARTBEAT_SECONDS so proxies keep the
+    connection open and disconnected clients are noticed.
+    """
+    yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+
+    while not await request.is_disconnected():
+        events = await broadcaster.wait(last_id, settings.SSE_HEARTBEAT_SECONDS)
+
+        if not events:
+            yield b": heartbeat\n\n"
+            continue
+
+        for event in events:
+            yield event.encode()
+        last_id = events[-1].id
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Replay buffered events after this id"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Stream data refresh events (text/event-stream)
+
+    Events:
+    - `fetch_done`: the fetch stage of a refresh job finished
+    - `job_done`: a refresh job started by POST /indicators/refresh finished
+    - `scores_written`: the score stage of a refresh job stored new scores
+    - `snapshot`: the data version changed; includes the map feature delta
+
+    Reconnecting clients resume from the Last-Event-ID header.
+    """
+    if last_event_id is not None and last_event_id.isdigit():
+        last_id = int(last_event_id)
+    elif since is not None:
+        last_id = since
+    else:
+        last_id = broadcaster.last_id
+
+    return StreamingResponse(
+        _event_stream(request, last_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,239 @@
+"""
+Bulk Export API Endpoints
+Streams full indicator and score history as NDJSON or CSV
+"""
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.replica import read_engine, read_session
+from app.models.indicator import Indicator, IndicatorValue
+from app.models.momentum import MomentumScore
+from app.services import columnar
+from app.utils.params import split_codes
+
+router = APIRouter()
+
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+INDICATOR_VALUE_COLUMNS = [
+    IndicatorValue.id,
+    IndicatorValue.country_code,
+    Indicator.code.label("indicator_code"),
+    Indicator.pillar,
+    IndicatorValue.date,
+    IndicatorValue.raw_value,
+    IndicatorValue.calculated_value,
+    IndicatorValue.percentile_rank,
+    IndicatorValue.z_score,
+    IndicatorValue.is_estimate,
+]
+
+MOMENTUM_SCORE_COLUMNS = [
+    MomentumScore.id,
+    MomentumScore.country_code,
+    MomentumScore.date,
+    MomentumScore.momentum_score,
+    MomentumScore.structural_score,
+    MomentumScore.combined_score,
+    MomentumScore.classification,
+    MomentumScore.global_rank,
+    MomentumScore.score_change_1m,
+    MomentumScore.score_change_3m,
+    MomentumScore.score_change_6m,
+]
+
+
+async def _stream_rows(stmt: Select, fmt: str) -> AsyncIterator[bytes]:
+    """
+    Stream query results in batches through a server-side cursor
+
+    The generator owns its own session because the request-scoped
+    session is closed before a streaming response body is sent.
+
+    Args:
+        stmt: Select statement (ordered by id)
+        fmt: "ndjson" or "csv"
+
+    Yields:
+        Encoded chunks, one per fetched batch
+    """
+    keys = list(stmt.selected_columns.keys())
+
+    async with read_session() as db:
+        result = await db.stream(
+            stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+
+            async for rows in result.partitions():
+                writer.writerows(
+                    [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                    for row in rows
+                )
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+            # Header only, for empty results
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            async for rows in result.partitions():
+                yield b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def _streaming_response(stmt: Select, fmt: str, name: str) -> StreamingResponse:
+    """Wrap a select statement in a streaming export response"""
+    return StreamingResponse(
+        _stream_rows(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+
+@router.get("/indicator-values")
+async def export_indicator_values(
+    format: str = Query("ndjson", regex=EXPORT_FORMAT_PATTERN),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    countries: Optional[str] = Query(None, description="Comma-separated country codes"),
+    indicators: Optional[str] = Query(None, description="Comma-separated indicator codes"),
+    pillars: Optional[str] = Query(None, description="Comma-separated pillar names"),
+    after: Optional[int] = Query(None, description="Keyset cursor: id of the last row received"),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """
+    Export indicator values as NDJSON or CSV
+
+    Rows are ordered by id; to page, pass the id of the last row received
+    as `after` together with `limit`.
+    """
+    stmt = select(*INDICATOR_VALUE_COLUMNS).join(
+        Indicator,
+        IndicatorValue.indicator_id == Indicator.id
+    ).order_by(IndicatorValue.id)
+
+    stmt = _apply_common_filters(stmt, IndicatorValue, start_date, end_date, countries, after, limit)
+
+    indicator_codes = split_codes(indicators, upper=False)
+    if indicator_codes:
+        stmt = stmt.filter(Indicator.code.in_(indicator_codes))
+
+    pillar_names = split_codes(pillars, upper=False)
+    if pillar_names:
+        stmt = stmt.filter(Indicator.pillar.in_(pillar_names))
+
+    return _streaming_response(stmt, format, "indicator_values")
+
+
+@router.get("/momentum-scores")
+async def export_momentum_scores(
+    format: str = Query("ndjson", regex=EXPORT_FORMAT_PATTERN),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    countries: Optional[str] = Query(None, description="Comma-separated country codes"),
+    after: Optional[int] = Query(None, description="Keyset cursor: id of the last row received"),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """
+    Export momentum scores as NDJSON or CSV
+
+    Rows are ordered by id; to page, pass the id of the last row received
+    as `after` together with `limit`.
+    """
+    stmt = select(*MOMENTUM_SCORE_COLUMNS).order_by(MomentumScore.id)
+
+    stmt = _apply_common_filters(stmt, MomentumScore, start_date, end_date, countries, after, limit)
+
+    return _streaming_response(stmt, format, "momentum_scores")
+
+
+@router.get("/columnar/{dataset}")
+async def export_columnar(
+    dataset: str,
+    format: str = Query("arrow", regex="^(arrow|parquet)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    countries: Optional[str] = Query(None, description="Comma-separated country codes"),
+):
+    """
+    Export the indicator panel or score history as an Arrow IPC stream or Parquet file
+
+    dataset: indicator-panel or score-history
+    """
+    if dataset not in columnar.DATASETS:
+        raise HTTPException(status_code=404, detail="Unknown dataset")
+
+    # Reads on the sync engine (COPY on Postgres) and encodes batch by batch;
+    # the sync generator is iterated in the thread pool, off the event loop
+    batches = columnar.iter_batches(
+        await read_engine(),
+        dataset,
+        start_date,
+        end_date,
+        split_codes(countries)
+    )
+
+    extension = "arrows" if format == "arrow" else "parquet"
+
+    return StreamingResponse(
+        columnar.encode_stream(batches, columnar.dataset_schema(dataset), format),
+        media_type=columnar.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'}
+    )
+
+
+def _apply_common_filters(
+    stmt: Select,
+    model,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    countries: Optional[str],
+    after: Optional[int],
+    limit: Optional[int]
+) -> Select:
+    """
+    Apply date range, country and keyset filters shared by all exports
+
+    Args:
+        stmt: Select statement
+        model: Model with id, country_code and date columns
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        countries: Comma-separated country codes
+        after: Only return rows with a greater id
+        limit: Maximum number of rows
+
+    Returns:
+        Filtered select statement
+    """
+    if start_date:
+        stmt = stmt.filter(model.date >= start_date)
+    if end_date:
+        stmt = stmt.filter(model.date <= end_date)
+
+    country_codes = split_codes(countries)
+    if country_codes:
+        stmt = stmt.filter(model.country_code.in_(country_codes))
+
+    if after is not None:
+        stmt = stmt.filter(model.id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
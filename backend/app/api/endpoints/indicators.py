@@ -1,107 +1,196 @@
 """
 Indicators API Endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from app.db.session import get_db
+from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy import desc, func, select
+from app.db.replica import get_read_db
+from app.utils.params import split_codes
+from app.core.serialization import json_response, rows_to_json, schema_columns
 from app.schemas.indicator import Indicator, IndicatorValue
 from app.models.indicator import Indicator as IndicatorModel
 from app.models.indicator import IndicatorValue as IndicatorValueModel
 from app.models.country import Country
+from app.services.jobs import REFRESH_STAGES, job_runner, run_refresh_pipeline
 
 router = APIRouter()
 
+# Columns backing the Indicator response schema (fast serialization path)
+INDICATOR_COLUMNS = schema_columns(IndicatorModel, Indicator)
+INDICATOR_FIELDS = list(Indicator.model_fields)
+
 
 @router.get("/", response_model=List[Indicator])
 async def get_all_indicators(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get list of all indicators used in the CMI
     """
-    indicators = db.query(IndicatorModel).order_by(
-        IndicatorModel.pillar,
-        IndicatorModel.code
-    ).all()
+    result = await db.execute(
+        select(*INDICATOR_COLUMNS).order_by(
+            IndicatorModel.pillar,
+            IndicatorModel.code
+        )
+    )
+
+    return json_response(rows_to_json(result.all(), INDICATOR_FIELDS))
+
+
+async def _get_latest_indicator_values(
+    db: AsyncSession,
+    country_codes: List[str]
+) -> Dict[str, dict]:
+    """
+    Get latest indicator values for several countries in a single query
+
+    Ranks each country's observations per indicator by date with a window
+    function and keeps the most recent one, joined to indicator and country
+    metadata.
 
-    return indicators
+    Args:
+        db: Database session
+        country_codes: Upper-case country codes
+
+    Returns:
+        Dictionary mapping country codes to response payloads
+        (only countries with at least one value are included)
+    """
+    ranked = select(
+        IndicatorValueModel,
+        func.row_number().over(
+            partition_by=(
+                IndicatorValueModel.country_code,
+                IndicatorValueModel.indicator_id
+            ),
+            order_by=desc(IndicatorValueModel.date)
+        ).label("row_number")
+    ).filter(
+        IndicatorValueModel.country_code.in_(country_codes)
+    ).subquery()
+
+    latest_value = aliased(IndicatorValueModel, ranked)
+
+    result = await db.execute(
+        select(
+            latest_value,
+            IndicatorModel,
+            Country
+        ).join(
+            IndicatorModel,
+            latest_value.indicator_id == IndicatorModel.id
+        ).join(
+            Country,
+            latest_value.country_code == Country.code
+        ).filter(
+            ranked.c.row_number == 1
+        ).order_by(
+            latest_value.country_code,
+            IndicatorModel.id
+        )
+    )
+
+    # Build response
+    countries = {}
+
+    for value, indicator, country in result.all():
+        country_data = countries.setdefault(country.code, {
+            "country_code": country.code,
+            "country_name": country.name,
+            "indicators": {}
+        })
+
+        country_data["indicators"][indicator.code] = {
+            "indicator_name": indicator.name,
+            "pillar": indicator.pillar,
+            "raw_value": value.raw_value,
+            "calculated_value": value.calculated_value,
+            "percentile_rank": value.percentile_rank,
+            "z_score": value.z_score,
+            "date": value.date.isoformat() if value.date else None,
+            "unit": indicator.unit
+        }
+
+    return countries
+
+
+@router.get("/latest")
+async def get_multi_country_indicators(
+    countries: str = Query(..., description="Comma-separated country codes, e.g. USA,DEU"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get latest indicator values for several countries at once
+    """
+    country_codes = split_codes(countries)
+
+    if not country_codes:
+        raise HTTPException(status_code=422, detail="No country codes given")
+
+    latest = await _get_latest_indicator_values(db, country_codes)
+
+    # Countries without any indicator data still need a name
+    missing = [code for code in country_codes if code not in latest]
+    if missing:
+        result = await db.execute(
+            select(Country).filter(Country.code.in_(missing))
+        )
+        for country in result.scalars().all():
+            latest[country.code] = {
+                "country_code": country.code,
+                "country_name": country.name,
+                "indicators": {}
+            }
+
+    return {
+        "countries": [latest[code] for code in country_codes if code in latest]
+    }
 
 
 @router.get("/{country_code}/latest")
 async def get_country_indicators(
     country_code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get latest indicator values for a specific country
     """
-    # Verify country exists
-    country = db.query(Country).filter(
-        Country.code == country_code.upper()
-    ).first()
+    country_code = country_code.upper()
 
-    if not country:
-        raise HTTPException(status_code=404, detail="Country not found")
+    latest = await _get_latest_indicator_values(db, [country_code])
 
-    # Get all indicators
-    indicators = db.query(IndicatorModel).all()
+    if country_code in latest:
+        return latest[country_code]
 
-    # Build response
-    indicator_data = {}
-
-    for indicator in indicators:
-        # Get latest value for this indicator and country
-        latest_value = db.query(IndicatorValueModel).filter(
-            IndicatorValueModel.country_code == country_code.upper(),
-            IndicatorValueModel.indicator_id == indicator.id
-        ).order_by(desc(IndicatorValueModel.date)).first()
-
-        if latest_value:
-            indicator_data[indicator.code] = {
-                "indicator_name": indicator.name,
-                "pillar": indicator.pillar,
-                "raw_value": latest_value.raw_value,
-                "calculated_value": latest_value.calculated_value,
-                "percentile_rank": latest_value.percentile_rank,
-                "z_score": latest_value.z_score,
-                "date": latest_value.date.isoformat() if latest_value.date else None,
-                "unit": indicator.unit
-            }
+    # No values yet - verify country exists
+    country = await db.get(Country, country_code)
+
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
 
     return {
-        "country_code": country_code.upper(),
+        "country_code": country_code,
         "country_name": country.name,
-        "indicators": indicator_data
+        "indicators": {}
     }
 
 
-def run_data_refresh():
-    """Background task to refresh data"""
-    # This would trigger the data fetching pipeline
-    # For now, just a placeholder
-    import subprocess
-    import sys
-    from pathlib import Path
-
-    script_path = Path(__file__).resolve().parents[3] / "scripts" / "fetch_data.py"
-    subprocess.Popen([sys.executable, str(script_path)])
-
-
-@router.post("/refresh")
-async def refresh_indicators(
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
+@router.post("/refresh", status_code=202)
+async def refresh_indicators():
     """
-    Trigger a manual refresh of indicator data
+    Trigger a refresh: fetch indicator data, recalculate scores, publish a snapshot
     (Admin endpoint - should be protected in production)
+
+    While a refresh is queued or running, the existing job is returned
+    instead of starting another one.
     """
-    # Add refresh task to background
-    background_tasks.add_task(run_data_refresh)
+    job, created = job_runner.submit("refresh", REFRESH_STAGES, run_refresh_pipeline)
 
     return {
-        "status": "refresh_started",
-        "message": "Data refresh job initiated. This may take several minutes."
+        "status": "refresh_started" if created else "refresh_already_running",
+        "job_id": job.id,
+        "message": "Data refresh job initiated. This may take several minutes. "
+                   f"Poll /jobs/{job.id} or subscribe to /events/stream for completion."
     }
@@ -0,0 +1,23 @@
+"""
+Jobs API Endpoints
+"""
+from fastapi import APIRouter, HTTPException
+from app.schemas.job import Job
+from app.services.jobs import job_runner
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """
+    Get the status, stage, progress and duration of a job
+
+    Jobs are tracked by the worker process that accepted them.
+    """
+    job = job_runner.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.as_dict()
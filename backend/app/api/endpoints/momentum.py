@@ -1,176 +1,234 @@
 """
 Momentum Scores API Endpoints
 """
-from typing import List
-from datetime import datetime
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from app.db.session import get_db
+import gzip
+import orjson
+from typing import List, Optional
+from datetime import date, datetime, time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
+from app.core.config import settings
+from app.db.replica import get_read_db
+from app.core.cache import (
+    CachePolicy,
+    CachedResponse,
+    accepts_gzip,
+    build_response,
+    cached_response,
+    data_version,
+    get_or_build,
+    make_etag,
+    serialize,
+)
+from app.core.serialization import dumps, json_response, rows_to_json, schema_columns
+from app.utils.params import split_codes
+from app.services.history_store import history_store
+from app.services.leaderboard import PERIOD_PATTERN, load_leaderboard, period_months, query_leaderboard
+from app.services.map_payload import build_feature_collection, load_map_payload, map_scores_query
+from app.models.snapshot import parse_run_id
 from app.schemas.momentum import MomentumScore, MomentumLeaderboard, CountryMomentumSummary
 from app.models.momentum import MomentumScore as MomentumScoreModel
-from app.models.country import Country
 
 router = APIRouter()
 
+# Columns backing the MomentumScore response schema (fast serialization path)
+MOMENTUM_SCORE_COLUMNS = schema_columns(MomentumScoreModel, MomentumScore)
+MOMENTUM_SCORE_FIELDS = list(MomentumScore.model_fields)
+
+# Cache behaviour per route: these are requested by every dashboard load, so
+# concurrent misses share one build and the previous snapshot is served
+# while the new one is built
+LATEST_CACHE_POLICY = CachePolicy(single_flight=True, stale_while_revalidate=True)
+LEADERBOARD_CACHE_POLICY = CachePolicy(single_flight=True, stale_while_revalidate=True)
+MAP_DATA_CACHE_POLICY = CachePolicy(single_flight=True, stale_while_revalidate=True)
+
 
 @router.get("/latest", response_model=List[MomentumScore])
 async def get_latest_momentum_scores(
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get the latest momentum scores for all countries
     """
+    return await cached_response(
+        request,
+        db,
+        _build_latest_momentum_scores,
+        policy=LATEST_CACHE_POLICY
+    )
+
+
+async def _build_latest_momentum_scores(db: AsyncSession) -> bytes:
+    """Query the latest momentum scores for all countries as JSON bytes"""
     # Get the most recent date
-    latest_date = db.query(func.max(MomentumScoreModel.date)).scalar()
+    latest_date = await db.scalar(select(func.max(MomentumScoreModel.date)))
 
     if not latest_date:
-        return []
+        return dumps([])
 
-    # Get all scores for that date
-    scores = db.query(MomentumScoreModel).filter(
-        MomentumScoreModel.date == latest_date
-    ).order_by(MomentumScoreModel.global_rank).all()
+    # Get all scores for that date as plain column tuples
+    result = await db.execute(
+        select(*MOMENTUM_SCORE_COLUMNS).filter(
+            MomentumScoreModel.date == latest_date
+        ).order_by(MomentumScoreModel.global_rank)
+    )
 
-    return scores
+    return rows_to_json(result.all(), MOMENTUM_SCORE_FIELDS)
 
 
 @router.get("/leaderboard", response_model=MomentumLeaderboard)
 async def get_momentum_leaderboard(
-    period: str = Query("1m", regex="^(1m|3m|6m)$"),
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    request: Request,
+    period: str = Query("1m", regex=PERIOD_PATTERN),
+    limit: int = Query(10, ge=1, le=settings.LEADERBOARD_TOP_K),
+    region: Optional[str] = None,
+    income_group: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get top improvers and decliners
-    period: 1m, 3m, or 6m
+    period: any horizon in months, e.g. 1m, 3m, 6m, 12m or 24m
+    region / income_group: optional country filters
     """
-    # Map period to score change column
-    period_map = {
-        "1m": "score_change_1m",
-        "3m": "score_change_3m",
-        "6m": "score_change_6m"
-    }
-
-    change_column = period_map[period]
-
-    # Get latest date
-    latest_date = db.query(func.max(MomentumScoreModel.date)).scalar()
+    try:
+        period_months(period)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await cached_response(
+        request,
+        db,
+        lambda session: _build_momentum_leaderboard(session, period, limit, region, income_group),
+        response_model=MomentumLeaderboard,
+        policy=LEADERBOARD_CACHE_POLICY
+    )
+
+
+async def _build_momentum_leaderboard(
+    db: AsyncSession,
+    period: str,
+    limit: int,
+    region: Optional[str],
+    income_group: Optional[str]
+) -> dict:
+    """Read the precomputed top-k for the current snapshot, or query it"""
+    version = await data_version.get(db)
+
+    leaderboard = await load_leaderboard(
+        db, parse_run_id(version), period, limit, region, income_group
+    )
+    if leaderboard is not None:
+        return leaderboard
+
+    return await query_leaderboard(db, period, limit, region, income_group)
+
+
+@router.get("/history")
+async def get_momentum_history(
+    codes: str = Query(..., description="Comma-separated country codes, e.g. USA,CHN,IND"),
+    start: Optional[date] = Query(None, alias="from", description="Inclusive start date"),
+    end: Optional[date] = Query(None, alias="to", description="Inclusive end date"),
+    pillars: bool = True,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Compare score histories of several countries
 
-    if not latest_date:
-        return {
-            "period": period,
-            "improvers": [],
-            "decliners": []
+    Served from the in-memory score history of the current data version.
+    Each country's series are parallel arrays (null where missing);
+    unknown codes are omitted.
+    """
+    country_codes = split_codes(codes)
+
+    if not country_codes:
+        raise HTTPException(status_code=422, detail="No country codes given")
+
+    start_time = datetime.combine(start, time.min) if start else None
+    end_time = datetime.combine(end, time.max) if end else None
+
+    version = await data_version.get(db)
+    store = await history_store.get(version)
+
+    countries = []
+    for code in dict.fromkeys(country_codes):
+        if code not in store.names:
+            continue
+
+        rows = store.row_range(code, start_time, end_time)
+        series = {
+            "country_code": code,
+            "country_name": store.names[code],
+            "dates": store.dates[rows],
+            **{name: values[rows] for name, values in store.scores.items()},
+            "classification": store.labels(rows),
+            "global_rank": [rank or None for rank in store.ranks[rows].tolist()],
         }
+        if pillars:
+            series["pillars"] = {name: values[rows] for name, values in store.pillars.items()}
+            # datetime64 NaT is not serializable; tolist() maps it to None
+            series["pillar_as_of"] = {
+                name: values[rows].tolist() for name, values in store.pillar_as_of.items()
+            }
+            series["pillar_stale"] = {name: values[rows] for name, values in store.pillar_stale.items()}
+        countries.append(series)
+
+    body = orjson.dumps(
+        {"data_version": version, "countries": countries},
+        option=orjson.OPT_SERIALIZE_NUMPY
+    )
 
-    # Get scores with change values
-    scores = db.query(
-        MomentumScoreModel,
-        Country
-    ).join(
-        Country,
-        MomentumScoreModel.country_code == Country.code
-    ).filter(
-        MomentumScoreModel.date == latest_date
-    ).all()
-
-    # Build list with change values
-    countries_with_change = []
-    for score, country in scores:
-        change_value = getattr(score, change_column)
-        if change_value is not None:
-            countries_with_change.append({
-                "country_code": country.code,
-                "country_name": country.name,
-                "momentum_score": score.momentum_score,
-                "score_change": change_value,
-                "classification": score.classification,
-                "global_rank": score.global_rank
-            })
-
-    # Sort by change (descending for improvers, ascending for decliners)
-    countries_with_change.sort(key=lambda x: x["score_change"], reverse=True)
-
-    # Get top improvers and decliners
-    improvers = countries_with_change[:limit]
-    decliners = countries_with_change[-limit:][::-1]  # Reverse to get worst first
-
-    return {
-        "period": period,
-        "improvers": improvers,
-        "decliners": decliners
-    }
+    return json_response(body, headers={"X-Data-Version": version})
 
 
 @router.get("/map-data")
 async def get_map_data(
+    request: Request,
     include_structural: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get momentum data formatted for map visualization
     Returns GeoJSON with country scores
+
+    Served from the pre-compressed payload built by the pipeline for the
+    current data version; falls back to building it from the database
+    when no payload exists for that version.
     """
+    version = await data_version.get(db)
+    encoding = "gzip" if accepts_gzip(request) else None
+    key = (request.url.path, include_structural, encoding)
+
+    async def build_entry(session: AsyncSession) -> CachedResponse:
+        compressed = await load_map_payload(session, parse_run_id(version), include_structural)
+
+        if compressed is None:
+            body = serialize(await _build_map_data(session, include_structural))
+            return CachedResponse(body=body, etag=make_etag(body), version=version)
+
+        body = compressed if encoding else gzip.decompress(compressed)
+        return CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            version=version,
+            content_encoding=encoding
+        )
+
+    entry, stale = await get_or_build(key, version, db, build_entry, MAP_DATA_CACHE_POLICY)
+
+    return build_response(request, entry, stale, vary_encoding=True)
+
+
+async def _build_map_data(db: AsyncSession, include_structural: bool):
+    """Query latest scores and build the GeoJSON FeatureCollection"""
     # Get latest date
-    latest_date = db.query(func.max(MomentumScoreModel.date)).scalar()
+    latest_date = await db.scalar(select(func.max(MomentumScoreModel.date)))
 
     if not latest_date:
-        return {
-            "type": "FeatureCollection",
-            "features": []
-        }
+        return build_feature_collection([], include_structural)
 
     # Get scores with country info
-    scores = db.query(
-        MomentumScoreModel,
-        Country
-    ).join(
-        Country,
-        MomentumScoreModel.country_code == Country.code
-    ).filter(
-        MomentumScoreModel.date == latest_date,
-        Country.latitude.isnot(None),
-        Country.longitude.isnot(None)
-    ).all()
-
-    # Helper function to get color based on classification
-    def get_color(classification):
-        color_map = {
-            "Strongly Improving": "#2E7D32",  # Dark green
-            "Improving": "#66BB6A",  # Green
-            "Neutral": "#FDD835",  # Yellow
-            "Deteriorating": "#FB8C00",  # Orange
-            "Strongly Deteriorating": "#D32F2F"  # Red
-        }
-        return color_map.get(classification, "#9E9E9E")  # Gray default
-
-    # Build GeoJSON features
-    features = []
-    for score, country in scores:
-        score_value = score.combined_score if include_structural else score.momentum_score
-
-        feature = {
-            "type": "Feature",
-            "geometry": {
-                "type": "Point",
-                "coordinates": [country.longitude, country.latitude]
-            },
-            "properties": {
-                "country_code": country.code,
-                "country_name": country.name,
-                "momentum_score": score.momentum_score,
-                "structural_score": score.structural_score,
-                "combined_score": score.combined_score,
-                "classification": score.classification,
-                "global_rank": score.global_rank,
-                "color": get_color(score.classification),
-                "score": score_value  # The score to display
-            }
-        }
-        features.append(feature)
+    result = await db.execute(map_scores_query(latest_date))
 
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+    return build_feature_collection(result.all(), include_structural)
@@ -0,0 +1,559 @@
+"""
+Response Cache
+Caches serialized read-endpoint responses keyed by (route, params, data version)
+"""
+import asyncio
+import hashlib
+import logging
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_backends import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.replica import read_session, replica_router
+from app.services.snapshot import get_data_version
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Serialized response body and its strong ETag"""
+    body: bytes
+    etag: str
+    version: str
+    content_encoding: Optional[str] = None
+
+
+class DataVersionTracker:
+    """
+    Remembers the current data version for a short time so that
+    cache lookups do not need a database round-trip on every request
+
+    While a LISTEN connection is up (`pushed`), new versions arrive via
+    set() and the remembered version is trusted without expiry.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        """
+        Initialize tracker
+
+        Args:
+            ttl_seconds: How long a looked-up version is trusted
+        """
+        self.ttl_seconds = ttl_seconds
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self.pushed = False
+
+    async def get(self, db: AsyncSession) -> str:
+        """
+        Get the current data version, refreshing it when expired
+
+        Args:
+            db: Async database session
+
+        Returns:
+            Data version string
+        """
+        now = time.monotonic()
+        expired = not self.pushed and now - self._checked_at >= self.ttl_seconds
+        if self._version is None or expired:
+            self._version = await get_data_version(db)
+            self._checked_at = now
+        return self._version
+
+    def set(self, version: str):
+        """
+        Swap in a new data version
+
+        Cache entries keyed on the previous version stop matching
+        immediately (ResponseCache drops them on the next lookup).
+
+        Args:
+            version: New data version
+        """
+        self._version = version
+        self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Force the next lookup to hit the database"""
+        self._version = None
+
+
+# Binary entry layout: format, flags, raw 16-byte ETag digest, body
+ENTRY_HEADER = struct.Struct(">BB16s")
+ENTRY_FORMAT = 1
+FLAG_ZLIB = 1  # Body is zlib-compressed for storage
+FLAG_GZIP_ENCODED = 2  # Body is served with Content-Encoding: gzip
+
+
+def encode_entry(entry: CachedResponse, compress: bool) -> bytes:
+    """
+    Pack a cached response into compact bytes
+
+    Args:
+        entry: Cached response
+        compress: zlib-compress bodies of at least CACHE_COMPRESS_MIN_BYTES
+            (bodies that are already gzip-encoded are stored as is)
+
+    Returns:
+        Packed bytes
+    """
+    flags = FLAG_GZIP_ENCODED if entry.content_encoding == "gzip" else 0
+    body = entry.body
+
+    if compress and not flags and len(body) >= settings.CACHE_COMPRESS_MIN_BYTES:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+
+    digest = bytes.fromhex(entry.etag.strip('"'))
+    return ENTRY_HEADER.pack(ENTRY_FORMAT, flags, digest) + body
+
+
+def decode_entry(data: bytes, version: str) -> Optional[CachedResponse]:
+    """
+    Unpack bytes written by encode_entry
+
+    Args:
+        data: Packed bytes
+        version: Data version the entry was stored under
+
+    Returns:
+        Cached response, or None if the format is not recognized
+    """
+    if len(data) < ENTRY_HEADER.size:
+        return None
+
+    format_version, flags, digest = ENTRY_HEADER.unpack_from(data)
+    if format_version != ENTRY_FORMAT:
+        return None
+
+    body = data[ENTRY_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    return CachedResponse(
+        body=body,
+        etag='"' + digest.hex() + '"',
+        version=version,
+        content_encoding="gzip" if flags & FLAG_GZIP_ENCODED else None
+    )
+
+
+class ResponseCache:
+    """
+    Cache of serialized responses on top of a pluggable backend
+
+    Keys combine the data version with the route and parameters, so
+    entries for an old version are never served and simply expire.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: int,
+        enabled: bool = True
+    ):
+        """
+        Initialize cache
+
+        Args:
+            backend: Storage backend
+            ttl_seconds: Expiry of stored entries
+            enabled: If False, lookups always miss and nothing is stored
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._version: Optional[str] = None
+
+    @staticmethod
+    def storage_key(key: Tuple, version: str) -> str:
+        """Build the backend key for a route key and data version"""
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return f"cmi:response:{version}:{digest}"
+
+    async def get(self, key: Tuple, version: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Route and parameter key
+            version: Current data version
+
+        Returns:
+            Cached response or None
+        """
+        if not self.enabled:
+            return None
+
+        if version != self._version:
+            # Data changed; entries held in this process are now unreachable
+            self.backend.clear()
+            self._version = version
+
+        data = await self.backend.get(self.storage_key(key, version))
+        if data is None:
+            return None
+
+        return decode_entry(data, version)
+
+    async def set(self, key: Tuple, entry: CachedResponse):
+        """
+        Store a response
+
+        Args:
+            key: Route and parameter key
+            entry: Serialized response
+        """
+        if not self.enabled:
+            return
+
+        await self.backend.set(
+            self.storage_key(key, entry.version),
+            encode_entry(entry, self.backend.compress),
+            self.ttl_seconds
+        )
+
+    def clear(self):
+        """Drop responses held in this process"""
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Backend name and hit/miss/byte counters"""
+        return {"enabled": self.enabled, **self.backend.describe()}
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Per-route behaviour on a cache miss
+
+    single_flight: Concurrent identical misses share one build
+    stale_while_revalidate: Serve the previous version's response while
+        one background task builds the current one
+    """
+    single_flight: bool = True
+    stale_while_revalidate: bool = False
+
+
+DEFAULT_CACHE_POLICY = CachePolicy()
+
+
+class StaleResponses:
+    """
+    Last response built per key, whatever its data version
+
+    Kept in process for routes using stale-while-revalidate, so a stale
+    answer is available right after the version changes.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize store
+
+        Args:
+            max_entries: Maximum number of keys kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        """Get the last entry built for a key"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Tuple, entry: CachedResponse):
+        """Remember the latest entry for a key"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+data_version = DataVersionTracker(settings.DATA_VERSION_TTL_SECONDS)
+response_cache = ResponseCache(
+    create_cache_backend(),
+    settings.CACHE_TTL_SECONDS,
+    enabled=settings.RESPONSE_CACHE_ENABLED
+)
+stale_responses = StaleResponses(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+# Builds in progress, keyed by (route key, data version)
+_inflight: Dict[Tuple, "asyncio.Task"] = {}
+
+# Versions differ between primary and replica; re-read it after a switch
+replica_router.on_switch.append(lambda use_replica: data_version.invalidate())
+
+
+def invalidate_caches():
+    """
+    Invalidate all cached responses
+
+    Called when the version is unknown, e.g. after losing the LISTEN
+    connection; known new versions are swapped in with data_version.set().
+    """
+    data_version.invalidate()
+    response_cache.clear()
+
+
+def serialize(data: Any, response_model: Any = None) -> bytes:
+    """
+    Serialize response data to JSON bytes
+
+    Args:
+        data: Data returned by a response builder; bytes are treated
+            as already-encoded JSON
+        response_model: Optional response model used to validate ORM objects
+
+    Returns:
+        JSON bytes
+    """
+    if isinstance(data, bytes):
+        return data
+
+    if response_model is not None:
+        adapter = TypeAdapter(response_model)
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+    return dumps(data)
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    Args:
+        if_none_match: Header value (may list several tags)
+        etag: Current ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    Check whether the client accepts gzip-encoded responses
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        True if Accept-Encoding allows gzip
+    """
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def build_response(
+    request: Request,
+    entry: CachedResponse,
+    stale: bool = False,
+    vary_encoding: bool = False
+) -> Response:
+    """
+    Build the HTTP response for a cached entry, answering 304 when possible
+
+    Args:
+        request: Incoming request
+        entry: Cached response
+        stale: Entry is from a previous data version and is being rebuilt;
+            marked with X-Cache: stale and not cached by clients
+        vary_encoding: The entry was chosen by Accept-Encoding; sends
+            Vary: Accept-Encoding on every variant, identity included
+
+    Returns:
+        Response
+    """
+    max_age = 0 if stale else settings.CACHE_MAX_AGE_SECONDS
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={max_age}",
+        "X-Data-Version": entry.version,
+    }
+
+    if stale:
+        headers["X-Cache"] = "stale"
+
+    if entry.content_encoding:
+        headers["Content-Encoding"] = entry.content_encoding
+
+    if vary_encoding or entry.content_encoding:
+        headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def _store(key: Tuple, entry: CachedResponse, policy: CachePolicy):
+    """Store a freshly built entry in the response cache (and stale store)"""
+    await response_cache.set(key, entry)
+    if policy.stale_while_revalidate:
+        stale_responses.set(key, entry)
+
+
+async def _run_build(
+    key: Tuple,
+    build_entry: Callable[[AsyncSession], Awaitable[CachedResponse]],
+    policy: CachePolicy
+) -> CachedResponse:
+    """Build and store an entry using a session of its own"""
+    async with read_session() as session:
+        entry = await build_entry(session)
+    await _store(key, entry, policy)
+    return entry
+
+
+def _log_build_failure(task: "asyncio.Task"):
+    """Log errors of builds that may have no waiter (background revalidation)"""
+    if task.cancelled():
+        return
+
+    error = task.exception()
+    if error is not None and not isinstance(error, HTTPException):
+        logger.error("Cached response build failed", exc_info=error)
+
+
+def _start_build(
+    key: Tuple,
+    version: str,
+    build_entry: Callable[[AsyncSession], Awaitable[CachedResponse]],
+    policy: CachePolicy
+) -> "asyncio.Task":
+    """
+    Start building an entry, or join the build already in flight
+
+    Args:
+        key: Route and parameter key
+        version: Data version being built
+        build_entry: Coroutine function building the entry from a session
+        policy: Route cache policy
+
+    Returns:
+        Task resolving to the built entry
+    """
+    flight_key = (key, version)
+    task = _inflight.get(flight_key)
+
+    if task is None:
+        task = asyncio.create_task(_run_build(key, build_entry, policy))
+        _inflight[flight_key] = task
+        task.add_done_callback(lambda done: _inflight.pop(flight_key, None))
+        task.add_done_callback(_log_build_failure)
+
+    return task
+
+
+async def get_or_build(
+    key: Tuple,
+    version: str,
+    db: AsyncSession,
+    build_entry: Callable[[AsyncSession], Awaitable[CachedResponse]],
+    policy: CachePolicy = DEFAULT_CACHE_POLICY
+) -> Tuple[CachedResponse, bool]:
+    """
+    Get a cached entry, building it on a miss according to the route policy
+
+    With single-flight, concurrent misses for the same key and version
+    share one build task (run in its own session, so it survives the
+    request that started it). With stale-while-revalidate, a miss is
+    answered from the last entry built for the key while one background
+    task rebuilds it.
+
+    Args:
+        key: Route and parameter key
+        version: Current data version
+        db: Async database session of the request
+        build_entry: Coroutine function building the entry from a session
+        policy: Route cache policy
+
+    Returns:
+        Tuple of (entry, whether the entry is stale)
+    """
+    if not response_cache.enabled:
+        return await build_entry(db), False
+
+    entry = await response_cache.get(key, version)
+    if entry is not None:
+        return entry, False
+
+    if policy.stale_while_revalidate:
+        stale = stale_responses.get(key)
+        if stale is not None:
+            if stale.version == version:
+                return stale, False
+            _start_build(key, version, build_entry, policy)
+            return stale, True
+
+    if policy.single_flight:
+        entry = await asyncio.shield(_start_build(key, version, build_entry, policy))
+    else:
+        entry = await build_entry(db)
+        await _store(key, entry, policy)
+
+    return entry, False
+
+
+async def cached_response(
+    request: Request,
+    db: AsyncSession,
+    build: Callable[[AsyncSession], Awaitable[Any]],
+    response_model: Any = None,
+    policy: CachePolicy = DEFAULT_CACHE_POLICY
+) -> Response:
+    """
+    Serve a read endpoint through the response cache
+
+    Args:
+        request: Incoming request (route and query params form the key)
+        db: Async database session
+        build: Coroutine function computing the response data from a session
+        response_model: Optional response model used for serialization
+        policy: Route cache policy (single-flight, stale-while-revalidate)
+
+    Returns:
+        Response with ETag and Cache-Control headers, or 304
+    """
+    version = await data_version.get(db)
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+    async def build_entry(session: AsyncSession) -> CachedResponse:
+        body = serialize(await build(session), response_model)
+        return CachedResponse(body=body, etag=make_etag(body), version=version)
+
+    entry, stale = await get_or_build(key, version, db, build_entry, policy)
+
+    return build_response(request, entry, stale)
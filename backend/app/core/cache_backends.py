@@ -0,0 +1,210 @@
+"""
+Response Cache Backends
+Storage for serialized responses: in-process LRU or a shared Redis server
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache backend"""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    errors: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counters plus hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            **asdict(self),
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class CacheBackend:
+    """
+    Base class for cache backends
+
+    Values are opaque bytes; keys already include the data version, so a
+    backend never needs to know about versions.
+    """
+
+    name = "base"
+
+    # Whether values should be compressed before storing
+    compress = False
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None on a miss"""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        """Store a value that expires after ttl_seconds"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop entries held by this process (no-op for shared backends)"""
+
+    def describe(self) -> Dict[str, Any]:
+        """Backend name and statistics"""
+        return {"backend": self.name, **self.stats.as_dict()}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize backend
+
+        Args:
+            max_entries: Maximum number of entries kept
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._entries.get(key)
+
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                self._discard(key)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self.stats.bytes_read += len(item[1])
+        return item[1]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        self._discard(key)
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._bytes += len(value)
+        self.stats.sets += 1
+        self.stats.bytes_written += len(value)
+
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            **super().describe(),
+            "entries": len(self._entries),
+            "bytes_stored": self._bytes,
+        }
+
+    def _discard(self, key: str):
+        """Remove an entry if present"""
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[1])
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-protocol server
+
+    Entries outlive deploys, so new workers start warm. Errors are logged
+    and treated as misses so an unavailable server never fails a request.
+    """
+
+    name = "redis"
+    compress = True
+
+    def __init__(self, client):
+        """
+        Initialize backend
+
+        Args:
+            client: redis.asyncio.Redis compatible client (e.g. fakeredis)
+        """
+        super().__init__()
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        """
+        Create a backend connected to a Redis URL
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+
+        Returns:
+            RedisCacheBackend
+        """
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package") from e
+
+        return cls(redis.Redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.client.get(key)
+        except Exception:
+            logger.warning("Redis cache get failed", exc_info=True)
+            self.stats.errors += 1
+            return None
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self.stats.bytes_read += len(value)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        try:
+            await self.client.set(key, value, ex=ttl_seconds)
+        except Exception:
+            logger.warning("Redis cache set failed", exc_info=True)
+            self.stats.errors += 1
+            return
+
+        self.stats.sets += 1
+        self.stats.bytes_written += len(value)
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    Create the backend selected by settings.CACHE_BACKEND
+
+    Returns:
+        CacheBackend
+    """
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisCacheBackend.from_url(settings.REDIS_URL)
+
+    if settings.CACHE_BACKEND != "memory":
+        raise RuntimeError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
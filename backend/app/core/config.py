@@ -1,7 +1,7 @@
 """
 Application Configuration
 """
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl
 
@@ -17,6 +17,25 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_URL_ASYNC: str
+    DATABASE_URL_PIPELINE: Optional[str] = None  # Batch jobs (default: DATABASE_URL)
+
+    # Read replica for the API (unset: all reads go to the primary)
+    DATABASE_URL_REPLICA: Optional[str] = None
+    DATABASE_URL_REPLICA_ASYNC: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 60.0  # Fall back to the primary beyond this lag
+    REPLICA_CHECK_SECONDS: float = 5.0  # How often replica lag is measured
+
+    # Connection pools
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Longest wait for a free connection
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this (-1: never)
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # API statements (0: no limit)
+    DB_PGBOUNCER: bool = False  # PgBouncer transaction pooling: NullPool, no prepared statements
+    PIPELINE_POOL_SIZE: int = 2
+    PIPELINE_MAX_OVERFLOW: int = 2
+    PIPELINE_STATEMENT_TIMEOUT_MS: int = 0  # Batch statements (0: no limit)
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -25,9 +44,59 @@ class Settings(BaseSettings):
     FRED_API_KEY: str = ""
     WORLD_BANK_API_KEY: str = ""
 
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256  # Memory backend only
+    CACHE_BACKEND: str = "memory"  # memory or redis
+    REDIS_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: int = 86400
+    CACHE_COMPRESS_MIN_BYTES: int = 1024  # Shared backend compresses larger bodies
+    CACHE_MAX_AGE_SECONDS: int = 60
+    DATA_VERSION_TTL_SECONDS: float = 5.0
+    DATA_VERSION_NOTIFY: bool = True  # Postgres LISTEN/NOTIFY instead of polling
+
+    # Leaderboards precomputed for each snapshot
+    LEADERBOARD_PERIODS: List[str] = ["1m", "3m", "6m", "12m", "24m"]
+    LEADERBOARD_TOP_K: int = 25  # Longest list served from the precomputed entries
+
+    # Score history shared by worker processes through memory-mapped files,
+    # e.g. /dev/shm/cmi-history (unset: each worker keeps a private copy)
+    HISTORY_SNAPSHOT_DIR: Optional[str] = None
+
+    # Bulk export
+    EXPORT_BATCH_SIZE: int = 5000  # Rows fetched per server-side cursor batch
+
+    # Server-Sent Events
+    EVENTS_POLL_SECONDS: float = 5.0  # Version polling interval when LISTEN is unavailable
+    EVENTS_BUFFER_SIZE: int = 100  # Recent events kept for reconnecting clients
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Prometheus /metrics endpoint
+    METRICS_QUERY_HEADERS: bool = False  # X-DB-Query-Count / X-DB-Query-Time-Ms response headers
+
+    # Background jobs
+    JOB_WORKERS: int = 1  # Worker threads running pipeline jobs
+    JOB_HISTORY_SIZE: int = 50  # Finished jobs kept for GET /jobs/{id}
+
     # Scheduler
     DATA_UPDATE_CRON: str = "0 2 1 * *"
-    ENABLE_SCHEDULER: bool = False
+    ENABLE_SCHEDULER: bool = False  # Run the scheduler in the API process
+    SCHEDULER_STAGGER_MINUTES: int = 20  # Offset between sources
+    SCHEDULER_REVISION_MONTHS: int = 12  # Stored history rewritten by incremental fetches
+    SCHEDULER_LOCK_WAIT_SECONDS: float = 3600.0  # Wait for a running pipeline before skipping
+
+    # Streaming fetch: fetch, transform and write stages overlap
+    FETCH_STREAMING: bool = False
+    STREAM_FETCH_WORKERS: int = 8  # Concurrent downloads
+    STREAM_TRANSFORM_WORKERS: int = 2  # Concurrent momentum calculations
+    STREAM_QUEUE_SIZE: int = 32  # Series buffered between stages (bounds memory)
+    STREAM_BATCH_ROWS: int = 5000  # Rows per batched upsert
+    STREAM_FLUSH_SECONDS: float = 2.0  # Longest wait before a partial batch is written
+
+    # Pipeline runs (scripts/update_all.py)
+    PIPELINE_CHECKPOINT_DIR: str = "/var/tmp/cmi-pipeline"  # Stage outputs kept for --resume
+    PIPELINE_WORKERS: int = 4  # Stages run in parallel
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -0,0 +1,333 @@
+"""
+Request Metrics
+Per-route latency histograms and SQL statement counts, exported in the
+Prometheus text format
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statements-per-request buckets (catches N+1 query patterns)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route label for requests that did not match a route
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request"""
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Stats of the request being handled (propagates into SQLAlchemy's greenlets)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize histogram
+
+        Args:
+            buckets: Upper bounds in increasing order (+Inf is implicit)
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        """Render bucket, sum and count samples"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process request and database metrics for this worker
+    """
+
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.queries_per_request: Dict[Tuple[str, str], Histogram] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.db_queries: Dict[Tuple[str, str], int] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+        self.pool_checkouts: Dict[str, int] = {}
+
+    def record_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        queries: QueryStats
+    ):
+        """
+        Record a finished request
+
+        Args:
+            method: HTTP method
+            route: Route path template, e.g. /api/v1/countries/{country_code}
+            status: Response status code
+            seconds: Handling time
+            queries: SQL statements executed for the request
+        """
+        key = (method, route)
+
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.queries_per_request[key] = Histogram(QUERY_COUNT_BUCKETS)
+
+        self.latency[key].observe(seconds)
+        self.queries_per_request[key].observe(queries.count)
+        self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+        self.db_queries[key] = self.db_queries.get(key, 0) + queries.count
+        self.db_seconds[key] = self.db_seconds.get(key, 0.0) + queries.seconds
+
+    def render(self, engines: Dict[str, Engine]) -> str:
+        """
+        Render all metrics in the Prometheus text format
+
+        Args:
+            engines: Sync engines by name (as passed to instrument_engine)
+
+        Returns:
+            Exposition text
+        """
+        lines = [
+            "# HELP http_request_duration_seconds Request handling time",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += histogram.render("http_request_duration_seconds", _labels(method=method, route=route))
+
+        lines += [
+            "# HELP http_requests_total Requests handled",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+        lines += [
+            "# HELP db_queries_per_request SQL statements executed per request",
+            "# TYPE db_queries_per_request histogram",
+        ]
+        for (method, route), histogram in sorted(self.queries_per_request.items()):
+            lines += histogram.render("db_queries_per_request", _labels(method=method, route=route))
+
+        lines += [
+            "# HELP db_queries_total SQL statements executed",
+            "# TYPE db_queries_total counter",
+        ]
+        for (method, route), count in sorted(self.db_queries.items()):
+            lines.append(f"db_queries_total{{{_labels(method=method, route=route)}}} {count}")
+
+        lines += [
+            "# HELP db_query_duration_seconds_total Time spent executing SQL statements",
+            "# TYPE db_query_duration_seconds_total counter",
+        ]
+        for (method, route), seconds in sorted(self.db_seconds.items()):
+            lines.append(f"db_query_duration_seconds_total{{{_labels(method=method, route=route)}}} {seconds}")
+
+        lines += [
+            "# HELP db_pool_checkouts_total Connections checked out of the pool",
+            "# TYPE db_pool_checkouts_total counter",
+        ]
+        for name, count in sorted(self.pool_checkouts.items()):
+            lines.append(f"db_pool_checkouts_total{{{_labels(engine=name)}}} {count}")
+
+        lines += [
+            "# HELP db_pool_connections Pool connections by state",
+            "# TYPE db_pool_connections gauge",
+        ]
+        for name, engine in sorted(engines.items()):
+            stats = pool_stats(engine)
+            for state in ("checked_out", "checked_in", "overflow", "size"):
+                if stats.get(state) is not None:
+                    lines.append(f"db_pool_connections{{{_labels(engine=name, state=state)}}} {stats[state]}")
+
+        lines += [
+            "# HELP db_pool_wait_seconds Time waiting for a pool connection",
+            "# TYPE db_pool_wait_seconds histogram",
+        ]
+        for name, engine in sorted(engines.items()):
+            wait_time = getattr(engine.pool, "wait_time", None)
+            if wait_time is not None:
+                lines += wait_time.render("db_pool_wait_seconds", _labels(engine=name))
+
+        lines += [
+            "# HELP db_pool_timeouts_total Checkouts that timed out waiting for a connection",
+            "# TYPE db_pool_timeouts_total counter",
+        ]
+        for name, engine in sorted(engines.items()):
+            timeouts = getattr(engine.pool, "timeouts", None)
+            if timeouts is not None:
+                lines.append(f"db_pool_timeouts_total{{{_labels(engine=name)}}} {timeouts}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _labels(**labels) -> str:
+    """Format Prometheus labels, escaping values"""
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def _escape_label(value) -> str:
+    """Escape a label value for the Prometheus text format (backslash, quote, newline)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    Count statements and pool checkouts of an engine
+
+    Statements are attributed to the request in current_query_stats; the
+    context variable reaches SQLAlchemy's async greenlets as well.
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        name: Engine label in metrics
+    """
+    metrics.pool_checkouts.setdefault(name, 0)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - started
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.pool_checkouts[name] += 1
+
+
+def pool_stats(engine: Engine) -> dict:
+    """
+    Get connection pool statistics
+
+    Args:
+        engine: Sync engine
+
+    Returns:
+        Dictionary with pool class, size, checked out/in and overflow counts
+        and checkout waits (None where the pool class does not track them)
+    """
+    pool = engine.pool
+    wait_time = getattr(pool, "wait_time", None)
+
+    def stat(method: str):
+        return getattr(pool, method)() if hasattr(pool, method) else None
+
+    return {
+        "pool": type(pool).__name__,
+        "size": stat("size"),
+        "checked_out": stat("checkedout"),
+        "checked_in": stat("checkedin"),
+        "overflow": stat("overflow"),
+        "wait_seconds_total": round(wait_time.sum, 6) if wait_time else None,
+        "timeouts": getattr(pool, "timeouts", None),
+    }
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each request and counting its SQL statements
+
+    Adds X-DB-Query-Count and X-DB-Query-Time-Ms headers when
+    METRICS_QUERY_HEADERS is enabled; statements executed after the
+    response headers are sent (streaming bodies) only reach the metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Optional[Dict[object, str]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_headers(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.METRICS_QUERY_HEADERS:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            metrics.record_request(
+                scope["method"],
+                self._route(scope),
+                status,
+                time.perf_counter() - started,
+                stats
+            )
+
+    def _route(self, scope) -> str:
+        """Path template of the matched route (keeps label cardinality bounded)"""
+        if self._routes is None:
+            app = scope.get("app")
+            self._routes = {
+                route.endpoint: route.path
+                for route in getattr(app, "routes", [])
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)
@@ -0,0 +1,46 @@
+"""
+Connection Pools
+Queue pools that record how long checkouts wait for a connection
+"""
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Histogram
+
+# Checkout wait buckets in seconds
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolTelemetry:
+    """
+    Checkout wait times and timeouts of a pool
+
+    Mixed into the queue pools; _do_get is the point where a checkout
+    blocks when all connections (including overflow) are in use. The
+    measured time includes opening a new connection when one is created.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(PoolTelemetry, QueuePool):
+    """QueuePool with checkout wait telemetry"""
+
+
+class TimedAsyncAdaptedQueuePool(PoolTelemetry, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait telemetry"""
@@ -0,0 +1,177 @@
+"""
+Read Replica Routing
+Sends API reads to the replica while it is fresh enough, otherwise to the primary
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import (
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    engine,
+    replica_engine,
+)
+from app.models.snapshot import DataSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Chooses the database that serves API reads
+
+    Lag is measured in published snapshots: the replica is current when it
+    has the primary's latest snapshot; otherwise its lag is the time since
+    that snapshot was published. Reads use the replica until the lag
+    exceeds REPLICA_MAX_LAG_SECONDS (or the replica cannot be reached),
+    then the primary until the replica has caught up completely, so the
+    data version a worker serves never goes backwards.
+    """
+
+    def __init__(
+        self,
+        replica: Optional[async_sessionmaker],
+        max_lag_seconds: float,
+        check_seconds: float
+    ):
+        """
+        Initialize router
+
+        Args:
+            replica: Replica session factory (None: always use the primary)
+            max_lag_seconds: Largest tolerated replica lag
+            check_seconds: How long a lag measurement is trusted
+        """
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.use_replica = replica is not None
+        self.lag_seconds: Optional[float] = None
+        self.on_switch: List[Callable[[bool], None]] = []
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a replica is configured"""
+        return self.replica is not None
+
+    async def route(self) -> async_sessionmaker:
+        """
+        Get the session factory for a read, re-measuring lag when due
+
+        Returns:
+            Replica or primary session factory
+        """
+        if not self.enabled:
+            return AsyncSessionLocal
+
+        due = self._checked_at is None or time.monotonic() - self._checked_at >= self.check_seconds
+        if due and not self._lock.locked():
+            async with self._lock:
+                await self.check()
+
+        return self.replica if self.use_replica else AsyncSessionLocal
+
+    async def check(self):
+        """Measure replica lag and switch between replica and primary"""
+        self._checked_at = time.monotonic()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                latest = (await db.execute(
+                    select(DataSnapshot.id, DataSnapshot.created_at)
+                    .order_by(desc(DataSnapshot.id))
+                    .limit(1)
+                )).first()
+            async with self.replica() as db:
+                replica_id = await db.scalar(select(func.max(DataSnapshot.id)))
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            self.lag_seconds = None
+            self._switch(False)
+            return
+
+        if latest is None or (replica_id or 0) >= latest.id:
+            self.lag_seconds = 0.0
+            self._switch(True)
+            return
+
+        self.lag_seconds = max(0.0, (datetime.utcnow() - latest.created_at).total_seconds())
+        if self.lag_seconds > self.max_lag_seconds:
+            self._switch(False)
+
+    def status(self) -> dict:
+        """Routing state for /health"""
+        return {
+            "enabled": self.enabled,
+            "serving": "replica" if self.enabled and self.use_replica else "primary",
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+    def _switch(self, use_replica: bool):
+        """Change the read target and notify listeners"""
+        if use_replica == self.use_replica:
+            return
+
+        self.use_replica = use_replica
+        logger.warning(
+            "Routing API reads to the %s (replica lag %s s)",
+            "replica" if use_replica else "primary",
+            self.lag_seconds
+        )
+        for listener in self.on_switch:
+            listener(use_replica)
+
+
+replica_router = ReplicaRouter(
+    ReplicaSessionLocal,
+    settings.REPLICA_MAX_LAG_SECONDS,
+    settings.REPLICA_CHECK_SECONDS
+)
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Open a session for read-only queries on the routed database
+
+    Yields:
+        Async session on the replica or the primary
+    """
+    session_factory = await replica_router.route()
+    async with session_factory() as db:
+        yield db
+
+
+async def get_read_db():
+    """
+    Dependency for getting read-only async database sessions
+
+    Used by the read endpoints; writes keep using get_async_db.
+    """
+    async with read_session() as db:
+        yield db
+
+
+async def read_engine() -> Engine:
+    """
+    Get the sync engine for a read on the routed database
+
+    Returns:
+        Replica engine (if configured and routed to) or the primary engine
+    """
+    await replica_router.route()
+    if replica_router.use_replica and replica_engine is not None:
+        return replica_engine
+    return engine
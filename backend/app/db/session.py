@@ -1,21 +1,166 @@
 """
 Database Session Management
 """
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
+
+def engine_options(
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    statement_timeout_ms: int,
+    pgbouncer: bool = False,
+    is_async: bool = False
+) -> dict:
+    """
+    Build create_engine keyword arguments from the pool settings
+
+    Args:
+        url: Database URL
+        pool_size: Persistent connections kept in the pool
+        max_overflow: Extra connections allowed under load
+        statement_timeout_ms: Postgres statement_timeout (0 disables it)
+        pgbouncer: Connect through PgBouncer in transaction pooling mode:
+            no client-side pool and no prepared statement caching
+        is_async: Options for create_async_engine (asyncpg driver)
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    options = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args = {}
+    backend = make_url(url).get_backend_name()
+
+    if pgbouncer:
+        # PgBouncer owns the pool; holding connections here would pin server connections
+        options["poolclass"] = NullPool
+    elif backend != "sqlite":
+        # SQLite (local development) keeps the dialect's default pool
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS
+        )
+
+    if backend == "postgresql":
+        if pgbouncer and is_async:
+            # Prepared statements do not survive transaction pooling
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__"
+            )
+
+        # PgBouncer rejects startup parameters; set the timeout on the role instead
+        if statement_timeout_ms and not pgbouncer:
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    return options
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    **engine_options(
+        settings.DATABASE_URL,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer=settings.DB_PGBOUNCER
+    )
+)
+
+# Create async engine for the API (asyncpg driver)
+async_engine = create_async_engine(
+    settings.DATABASE_URL_ASYNC,
+    **engine_options(
+        settings.DATABASE_URL_ASYNC,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer=settings.DB_PGBOUNCER,
+        is_async=True
+    )
 )
 
+# Engine for the batch pipeline (fetch, scoring, exports): a small pool and
+# no API statement timeout, optionally connecting directly to Postgres
+pipeline_engine = create_engine(
+    settings.DATABASE_URL_PIPELINE or settings.DATABASE_URL,
+    **engine_options(
+        settings.DATABASE_URL_PIPELINE or settings.DATABASE_URL,
+        settings.PIPELINE_POOL_SIZE,
+        settings.PIPELINE_MAX_OVERFLOW,
+        settings.PIPELINE_STATEMENT_TIMEOUT_MS,
+        pgbouncer=settings.DB_PGBOUNCER and not settings.DATABASE_URL_PIPELINE
+    )
+)
+
+# Optional read replica for the API (see app/db/replica.py for routing)
+replica_engine = create_engine(
+    settings.DATABASE_URL_REPLICA,
+    **engine_options(
+        settings.DATABASE_URL_REPLICA,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer=settings.DB_PGBOUNCER
+    )
+) if settings.DATABASE_URL_REPLICA else None
+
+replica_async_engine = create_async_engine(
+    settings.DATABASE_URL_REPLICA_ASYNC,
+    **engine_options(
+        settings.DATABASE_URL_REPLICA_ASYNC,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer=settings.DB_PGBOUNCER,
+        is_async=True
+    )
+) if settings.DATABASE_URL_REPLICA_ASYNC else None
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for the scripts and background jobs
+PipelineSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=pipeline_engine)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+) if replica_async_engine is not None else None
+
 # Base class for models
 Base = declarative_base()
 
@@ -29,3 +174,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting async database sessions
+
+    Used by the read endpoints so that database round-trips
+    do not block the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,59 @@
 """
 Country Momentum Index - FastAPI Application Entry Point
 """
+import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics, pool_stats
 from app.api import api_router
+from app.db.replica import replica_router
+from app.db.session import async_engine, engine, pipeline_engine, replica_async_engine
+from app.services.events import watch_data_version
+from app.services.jobs import job_runner
+from app.services.scheduler import create_scheduler, indicator_sources
+
+# Engines reported in /health and /metrics
+ENGINES = {
+    "async": async_engine.sync_engine,
+    "sync": engine,
+    "pipeline": pipeline_engine,
+}
+if replica_async_engine is not None:
+    ENGINES["replica"] = replica_async_engine.sync_engine
+
+# Count statements and pool checkouts of every engine
+for name, instrumented in ENGINES.items():
+    instrument_engine(instrumented, name)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background tasks"""
+    watcher = asyncio.create_task(watch_data_version())
+
+    scheduler = None
+    if settings.ENABLE_SCHEDULER:
+        scheduler = create_scheduler(await asyncio.to_thread(indicator_sources))
+        scheduler.start()
+
+    yield
+
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await watcher
+    job_runner.shutdown()
+    await async_engine.dispose()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
@@ -19,8 +66,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Query-Time-Ms"],
 )
 
+# Request latency and SQL statement metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -37,8 +88,33 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "database": "connected",
+    """Detailed health check: pings the database and reports pool usage"""
+    started = time.perf_counter()
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        database = "connected"
+    except Exception as e:
+        database = f"error: {type(e).__name__}"
+
+    body = {
+        "status": "healthy" if database == "connected" else "unhealthy",
+        "database": database,
+        "database_latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "replica": replica_router.status(),
+        "pools": {
+            name: {**pool_stats(pooled), "checkouts": metrics.pool_checkouts[name]}
+            for name, pooled in ENGINES.items()
+        },
     }
+    return JSONResponse(body, status_code=200 if database == "connected" else 503)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Prometheus metrics of this worker process"""
+        return Response(
+            metrics.render(ENGINES),
+            media_type="text/plain; version=0.0.4"
+        )
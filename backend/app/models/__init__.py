@@ -2,13 +2,22 @@
 Database Models
 """
 from app.models.country import Country
-from app.models.indicator import Indicator, IndicatorValue
+from app.models.indicator import Indicator, IndicatorValue, SeriesFingerprint
 from app.models.momentum import MomentumScore, PillarScore
+from app.models.snapshot import DataSnapshot, SnapshotPayload
+from app.models.leaderboard import LeaderboardEntry
+from app.models.pipeline import PipelineRun, PipelineStageRun
 
 __all__ = [
     "Country",
     "Indicator",
     "IndicatorValue",
+    "SeriesFingerprint",
     "MomentumScore",
     "PillarScore",
+    "DataSnapshot",
+    "SnapshotPayload",
+    "LeaderboardEntry",
+    "PipelineRun",
+    "PipelineStageRun",
 ]
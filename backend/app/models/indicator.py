@@ -1,7 +1,7 @@
 """
 Indicator Models
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -33,6 +33,7 @@ class Indicator(Base):
     # Metadata
     unit = Column(String(50))  # %, index, USD, etc.
     frequency = Column(String(20))  # monthly, quarterly, annual
+    last_fetched_at = Column(DateTime)  # Last completed fetch (scheduler cadence)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -49,6 +50,11 @@ class IndicatorValue(Base):
     Stores raw and calculated values for each indicator
     """
     __tablename__ = "indicator_values"
+    __table_args__ = (
+        # Serves latest-value lookups per (country, indicator); unique so
+        # batched ingest can upsert with ON CONFLICT
+        Index("ix_indicator_values_country_indicator_date", "country_code", "indicator_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -76,3 +82,30 @@ class IndicatorValue(Base):
 
     def __repr__(self):
         return f"<IndicatorValue(country={self.country_code}, indicator={self.indicator_id}, date={self.date})>"
+
+
+class SeriesFingerprint(Base):
+    """
+    Content hash of the last stored series per (country, indicator)
+    Lets fetches skip series whose source data has not changed
+    """
+    __tablename__ = "series_fingerprints"
+    __table_args__ = (
+        Index("ix_series_fingerprints_country_indicator", "country_code", "indicator_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Foreign keys
+    country_code = Column(String(3), ForeignKey("countries.code"), nullable=False)
+    indicator_id = Column(Integer, ForeignKey("indicators.id"), nullable=False, index=True)
+
+    # Fingerprint
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of dates, values and calculation method
+    observations = Column(Integer)  # Observations in the fetched series
+
+    # Metadata
+    changed_at = Column(DateTime, default=datetime.utcnow)  # Last time the content changed
+
+    def __repr__(self):
+        return f"<SeriesFingerprint(country={self.country_code}, indicator={self.indicator_id})>"
@@ -0,0 +1,43 @@
+"""
+Leaderboard Model
+"""
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
+from app.db.session import Base
+
+
+class LeaderboardEntry(Base):
+    """
+    Precomputed top-k leaderboard rows
+    Built once per snapshot for every horizon, region and income group,
+    so leaderboard requests read at most k rows per list
+    """
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        Index(
+            "ix_leaderboard_entries_lookup",
+            "snapshot_id", "period", "region", "income_group", "direction", "position"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Foreign key
+    snapshot_id = Column(Integer, ForeignKey("data_snapshots.id"), nullable=False)
+
+    # Leaderboard identification
+    period = Column(String(10), nullable=False)  # e.g., "3m", "12m"
+    region = Column(String(50), nullable=False)  # Region name or "all"
+    income_group = Column(String(50), nullable=False)  # Income group or "all"
+    direction = Column(String(10), nullable=False)  # "improvers" or "decliners"
+    position = Column(Integer, nullable=False)  # 1-based position in the list
+
+    # Country summary (CountryMomentumSummary fields)
+    country_code = Column(String(3), ForeignKey("countries.code"), nullable=False)
+    country_name = Column(String(100), nullable=False)
+    momentum_score = Column(Float, nullable=False)
+    score_change = Column(Float, nullable=False)
+    classification = Column(String(50))
+    global_rank = Column(Integer)
+
+    def __repr__(self):
+        return f"<LeaderboardEntry(snapshot={self.snapshot_id}, period={self.period}, {self.direction} #{self.position})>"
@@ -1,7 +1,7 @@
 """
 Momentum Score Models
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index, Boolean
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -29,6 +29,11 @@ class PillarScore(Base):
     raw_score = Column(Float)  # Weighted average of indicators
     percentile_rank = Column(Float)  # Cross-country percentile (0-100)
 
+    # Data vintage: latest observation the score is based on (slow pillars
+    # carry a release forward until the next one)
+    as_of_date = Column(DateTime)
+    is_stale = Column(Boolean, default=False)  # as_of_date older than the pillar's staleness limit
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -45,6 +50,14 @@ class MomentumScore(Base):
     Combines all pillar scores into final CMI score
     """
     __tablename__ = "momentum_scores"
+    __table_args__ = (
+        # Score history lookups (horizon self-joins, country history)
+        Index("ix_momentum_scores_country_date", "country_code", "date"),
+        # Leaderboard ORDER BY ... LIMIT on the stored change columns
+        Index("ix_momentum_scores_date_change_1m", "date", "score_change_1m"),
+        Index("ix_momentum_scores_date_change_3m", "date", "score_change_3m"),
+        Index("ix_momentum_scores_date_change_6m", "date", "score_change_6m"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -0,0 +1,67 @@
+"""
+Pipeline Run Models
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.session import Base
+
+
+class PipelineRun(Base):
+    """
+    Runs of the data update pipeline (scripts/update_all.py)
+    A resumed run points at the failed run whose checkpoints it reuses
+    """
+    __tablename__ = "pipeline_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Outcome
+    status = Column(String(20), nullable=False)  # running, succeeded, failed
+
+    # Timing
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+
+    # Resume
+    resumed_from_id = Column(Integer, ForeignKey("pipeline_runs.id"))
+    checkpoint_dir = Column(String(500), nullable=False)
+
+    # Relationships
+    stages = relationship("PipelineStageRun", back_populates="run")
+
+    def __repr__(self):
+        return f"<PipelineRun(id={self.id}, status={self.status})>"
+
+
+class PipelineStageRun(Base):
+    """
+    Stages executed (or restored from a checkpoint) by a pipeline run
+    """
+    __tablename__ = "pipeline_stage_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Foreign key
+    run_id = Column(Integer, ForeignKey("pipeline_runs.id"), nullable=False, index=True)
+
+    # Stage identification
+    stage = Column(String(100), nullable=False)  # e.g., "fetch:IMF", "score"
+    status = Column(String(20), nullable=False)  # succeeded, failed
+
+    # Timing and volume
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+    rows = Column(Integer)  # Rows in the stage's output frames
+
+    # Loaded from the checkpoint of an earlier run instead of executed
+    from_checkpoint = Column(Boolean, default=False)
+    error = Column(Text)
+
+    # Relationships
+    run = relationship("PipelineRun", back_populates="stages")
+
+    def __repr__(self):
+        return f"<PipelineStageRun(run={self.run_id}, stage={self.stage}, status={self.status})>"
@@ -0,0 +1,88 @@
+"""
+Data Snapshot Model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.session import Base
+
+
+class DataSnapshot(Base):
+    """
+    Published data snapshots
+    One row per completed score calculation run; the id is the run id
+    """
+    __tablename__ = "data_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Latest momentum score date at publication time
+    score_date = Column(DateTime)
+
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    payloads = relationship("SnapshotPayload", back_populates="snapshot")
+
+    @property
+    def version(self) -> str:
+        """Data version string: latest score date plus run id"""
+        return format_data_version(self.score_date, self.id)
+
+    def __repr__(self):
+        return f"<DataSnapshot(id={self.id}, score_date={self.score_date})>"
+
+
+class SnapshotPayload(Base):
+    """
+    Pre-serialized response payloads built once per snapshot
+    e.g. the GeoJSON map variants, stored compressed
+    """
+    __tablename__ = "snapshot_payloads"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Foreign key
+    snapshot_id = Column(Integer, ForeignKey("data_snapshots.id"), nullable=False, index=True)
+
+    # Payload identification
+    name = Column(String(50), nullable=False)  # e.g., "map-data", "map-data-structural"
+    content_encoding = Column(String(20), nullable=False)  # e.g., "gzip"
+
+    # Serialized body
+    content = Column(LargeBinary, nullable=False)
+
+    # Relationships
+    snapshot = relationship("DataSnapshot", back_populates="payloads")
+
+    def __repr__(self):
+        return f"<SnapshotPayload(snapshot={self.snapshot_id}, name={self.name})>"
+
+
+def format_data_version(score_date, run_id) -> str:
+    """
+    Format a data version string
+
+    Args:
+        score_date: Latest score date (or None if no scores exist)
+        run_id: Snapshot run id
+
+    Returns:
+        Version string such as "20240131-12"
+    """
+    date_part = score_date.strftime("%Y%m%d") if score_date else "none"
+    return f"{date_part}-{run_id or 0}"
+
+
+def parse_run_id(version: str) -> int:
+    """
+    Extract the snapshot run id from a data version string
+
+    Args:
+        version: Version string produced by format_data_version
+
+    Returns:
+        Run id (0 if no snapshot has been published)
+    """
+    return int(version.rsplit("-", 1)[1])
@@ -1,9 +1,10 @@
 """
 Country Pydantic Schemas
 """
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
+from app.schemas.momentum import PillarVintage
 
 
 class CountryBase(BaseModel):
@@ -31,6 +32,7 @@ class CountryDetail(Country):
     latest_momentum_score: Optional[float] = None
     latest_classification: Optional[str] = None
     global_rank: Optional[int] = None
+    pillar_vintage: List[PillarVintage] = []  # Slow pillars behind the latest score
 
     class Config:
         from_attributes = True
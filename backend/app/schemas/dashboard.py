@@ -0,0 +1,18 @@
+"""
+Dashboard Pydantic Schemas
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from app.schemas.country import Country
+from app.schemas.momentum import MomentumScore, MomentumLeaderboard
+
+
+class DashboardBootstrap(BaseModel):
+    """Everything the dashboard needs on first load, from one snapshot"""
+    data_version: str
+    date: Optional[datetime] = None
+    countries: List[Country]
+    latest: List[MomentumScore]
+    leaderboards: Dict[str, MomentumLeaderboard]  # keyed by period: 1m, 3m, 6m
+    map_data: Dict[str, dict]  # GeoJSON keyed by "momentum" and "combined"
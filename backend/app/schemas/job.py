@@ -0,0 +1,22 @@
+"""
+Job Pydantic Schemas
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class Job(BaseModel):
+    """Status of a background pipeline job"""
+    id: str
+    kind: str  # e.g. refresh
+    status: str  # queued, running, succeeded, failed, skipped
+    stage: Optional[str] = None  # Current (or last) stage
+    stages: List[str]
+    progress: float  # 0-1 across all stages
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    error: Optional[str] = None
+    result: Dict = {}
@@ -13,6 +13,15 @@ class PillarScoreBase(BaseModel):
     pillar_name: str
     raw_score: Optional[float] = None
     percentile_rank: Optional[float] = None
+    as_of_date: Optional[datetime] = None
+    is_stale: bool = False
+
+
+class PillarVintage(BaseModel):
+    """Release a carried-forward (slow) pillar score is based on"""
+    pillar_name: str
+    as_of_date: Optional[datetime] = None
+    is_stale: bool = False
 
 
 class PillarScore(PillarScoreBase):
@@ -64,6 +73,8 @@ class CountryMomentumSummary(BaseModel):
 
 class MomentumLeaderboard(BaseModel):
     """Leaderboard of top improvers and decliners"""
-    period: str  # 1m, 3m, 6m
+    period: str  # e.g. 1m, 3m, 6m, 12m
+    region: Optional[str] = None
+    income_group: Optional[str] = None
     improvers: List[CountryMomentumSummary]
     decliners: List[CountryMomentumSummary]
@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from datetime import datetime
+from dateutil.relativedelta import relativedelta
 
 
 class PillarCalculator:
@@ -22,6 +23,13 @@ class PillarCalculator:
         'structural': 0.15
     }
 
+    # Pillars built from annual releases, with the months after which their
+    # latest observation counts as stale. They are computed once per
+    # release and carried forward between monthly runs.
+    SLOW_PILLARS = {
+        'structural': 24
+    }
+
     # Indicator weights within each pillar
     INDICATOR_WEIGHTS = {
         'external_sector': {
@@ -111,6 +119,24 @@ class PillarCalculator:
 
         return pillar_scores
 
+    @staticmethod
+    def is_stale(pillar_name: str, as_of_date: Optional[datetime], date: datetime) -> bool:
+        """
+        Check whether a slow pillar's latest release is too old
+
+        Args:
+            pillar_name: Name of the pillar
+            as_of_date: Latest observation the score is based on
+            date: Calculation date
+
+        Returns:
+            True if the pillar is slow and its release is older than its limit
+        """
+        months = PillarCalculator.SLOW_PILLARS.get(pillar_name)
+        if months is None or as_of_date is None:
+            return False
+        return as_of_date < date - relativedelta(months=months)
+
     @staticmethod
     def calculate_momentum_score(
         pillar_scores: Dict[str, float],
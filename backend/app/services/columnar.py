@@ -0,0 +1,348 @@
+"""
+Columnar Export Service
+Builds the indicator panel and score history as typed Apache Arrow tables
+for Arrow IPC / Parquet export
+"""
+import io
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+
+from app.models.indicator import Indicator, IndicatorValue
+from app.models.momentum import MomentumScore
+
+COUNTRY_CODE_TYPE = pa.dictionary(pa.int16(), pa.string())
+CATEGORY_TYPE = pa.dictionary(pa.int16(), pa.string())
+
+# Dataset definitions: (column expression, Arrow type) in output order
+DATASETS = {
+    "indicator-panel": {
+        "model": IndicatorValue,
+        "columns": [
+            (IndicatorValue.country_code, COUNTRY_CODE_TYPE),
+            (Indicator.code.label("indicator_code"), CATEGORY_TYPE),
+            (Indicator.pillar, CATEGORY_TYPE),
+            (IndicatorValue.date, pa.timestamp("us")),
+            (IndicatorValue.raw_value, pa.float32()),
+            (IndicatorValue.calculated_value, pa.float32()),
+            (IndicatorValue.percentile_rank, pa.float32()),
+            (IndicatorValue.z_score, pa.float32()),
+        ],
+    },
+    "score-history": {
+        "model": MomentumScore,
+        "columns": [
+            (MomentumScore.country_code, COUNTRY_CODE_TYPE),
+            (MomentumScore.date, pa.timestamp("us")),
+            (MomentumScore.momentum_score, pa.float32()),
+            (MomentumScore.structural_score, pa.float32()),
+            (MomentumScore.combined_score, pa.float32()),
+            (MomentumScore.classification, CATEGORY_TYPE),
+            (MomentumScore.global_rank, pa.int32()),
+            (MomentumScore.score_change_1m, pa.float32()),
+            (MomentumScore.score_change_3m, pa.float32()),
+            (MomentumScore.score_change_6m, pa.float32()),
+        ],
+    },
+}
+
+# Bytes of COPY output parsed per record batch
+COPY_BLOCK_BYTES = 8 << 20
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _dataset_query(
+    dataset: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    country_codes: Optional[List[str]] = None
+):
+    """
+    Build the select statement for a dataset
+
+    Args:
+        dataset: Dataset name (key of DATASETS)
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        country_codes: Restrict to these countries
+
+    Returns:
+        SQLAlchemy select statement
+    """
+    spec = DATASETS[dataset]
+    model = spec["model"]
+
+    stmt = select(*[column for column, _ in spec["columns"]])
+
+    if model is IndicatorValue:
+        stmt = stmt.join(Indicator, IndicatorValue.indicator_id == Indicator.id)
+
+    if start_date:
+        stmt = stmt.filter(model.date >= start_date)
+    if end_date:
+        stmt = stmt.filter(model.date <= end_date)
+    if country_codes:
+        stmt = stmt.filter(model.country_code.in_(country_codes))
+
+    return stmt.order_by(model.country_code, model.date)
+
+
+def dataset_schema(dataset: str) -> pa.Schema:
+    """Arrow schema of a dataset"""
+    return pa.schema([
+        (column.key, arrow_type) for column, arrow_type in DATASETS[dataset]["columns"]
+    ])
+
+
+def _cast_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Cast a record batch to the dataset schema"""
+    return pa.Table.from_batches([batch]).cast(schema).combine_chunks().to_batches()[0]
+
+
+def _iter_postgres_copy(engine: Engine, stmt, schema: pa.Schema) -> Iterator[pa.RecordBatch]:
+    """
+    Stream a query through COPY ... TO STDOUT into Arrow's streaming CSV reader
+
+    COPY runs in a helper thread writing into a pipe, and values go from
+    the server's CSV output straight into typed Arrow column buffers one
+    block at a time, without creating a Python object per row or value or
+    holding the whole result. Full exports may run longer than the API's
+    statement timeout, so it is lifted for the COPY's transaction.
+    """
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    # The CSV reader only builds dictionaries with int32 indices
+    column_types = {
+        field.name: (
+            pa.dictionary(pa.int32(), field.type.value_type)
+            if pa.types.is_dictionary(field.type) else field.type
+        )
+        for field in schema
+    }
+
+    read_fd, write_fd = os.pipe()
+    errors: List[BaseException] = []
+    raw = engine.raw_connection()
+
+    def copy():
+        try:
+            with os.fdopen(write_fd, "wb") as sink, raw.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = 0")
+                cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", sink)
+        except BaseException as e:  # BrokenPipeError if the reader stopped early
+            errors.append(e)
+
+    thread = threading.Thread(target=copy, name="cmi-copy", daemon=True)
+    thread.start()
+
+    try:
+        with os.fdopen(read_fd, "rb") as source:
+            # The CSV reader rejects empty input
+            if source.peek(1):
+                reader = pa_csv.open_csv(
+                    source,
+                    read_options=pa_csv.ReadOptions(column_names=schema.names, block_size=COPY_BLOCK_BYTES),
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=column_types,
+                        strings_can_be_null=True
+                    )
+                )
+                for batch in reader:
+                    yield _cast_batch(batch, schema)
+    except pa.ArrowInvalid:
+        # Truncated input: report the COPY's error if it failed
+        thread.join()
+        if errors:
+            raise errors[0]
+        raise
+    finally:
+        thread.join()
+        raw.close()  # Rolls back the transaction, ending the SET LOCAL
+
+    if errors:
+        raise errors[0]
+
+
+def _iter_generic(engine: Engine, stmt, schema: pa.Schema, batch_size: int = 50000) -> Iterator[pa.RecordBatch]:
+    """
+    Read a query in batches for databases without COPY (e.g. SQLite)
+
+    Each batch is transposed into columns and converted to Arrow arrays.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for rows in result.partitions():
+            columns = list(zip(*rows))
+            yield _cast_batch(pa.record_batch(
+                [
+                    pa.array(values, type=field.type)
+                    if not pa.types.is_dictionary(field.type)
+                    else pa.array(values, type=pa.string()).dictionary_encode()
+                    for values, field in zip(columns, schema)
+                ],
+                names=schema.names
+            ), schema)
+
+
+def iter_batches(
+    engine: Engine,
+    dataset: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    country_codes: Optional[List[str]] = None
+) -> Iterator[pa.RecordBatch]:
+    """
+    Read a dataset as typed Arrow record batches
+
+    Only one batch is held at a time. Each batch carries its own
+    dictionaries for the dictionary-encoded columns.
+
+    Args:
+        engine: Synchronous SQLAlchemy engine
+        dataset: "indicator-panel" or "score-history"
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        country_codes: Restrict to these countries
+
+    Yields:
+        Record batches with the dataset schema
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+    stmt = _dataset_query(dataset, start_date, end_date, country_codes)
+    schema = dataset_schema(dataset)
+
+    if engine.dialect.name == "postgresql":
+        yield from _iter_postgres_copy(engine, stmt, schema)
+    else:
+        yield from _iter_generic(engine, stmt, schema)
+
+
+def build_table(
+    engine: Engine,
+    dataset: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    country_codes: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Build a typed Arrow table for a dataset
+
+    Country codes and other categories are dictionary-encoded and values
+    are float32.
+
+    Args:
+        engine: Synchronous SQLAlchemy engine
+        dataset: "indicator-panel" or "score-history"
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        country_codes: Restrict to these countries
+
+    Returns:
+        Arrow table
+    """
+    batches = list(iter_batches(engine, dataset, start_date, end_date, country_codes))
+    if not batches:
+        return dataset_schema(dataset).empty_table()
+
+    # Unify dictionaries so every chunk shares one code table
+    return pa.Table.from_batches(batches).unify_dictionaries().combine_chunks()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file handing out what was written since the last drain
+
+    It keeps counting the position, which the Parquet writer records as
+    column chunk offsets, while the written bytes are released.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Take the bytes written since the last drain"""
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def encode_stream(batches: Iterable[pa.RecordBatch], schema: pa.Schema, fmt: str) -> Iterator[bytes]:
+    """
+    Encode record batches incrementally as an Arrow IPC stream or a Parquet file
+
+    Each batch is encoded and handed out as soon as it arrives (one IPC
+    message or one Parquet row group), so the whole file is never held.
+
+    Args:
+        batches: Record batches with the given schema
+        schema: Arrow schema
+        fmt: "arrow" or "parquet"
+
+    Yields:
+        Encoded chunks
+    """
+    sink = _ChunkSink()
+
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    elif fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+
+    yield sink.drain()
+
+
+def encode_table(table: pa.Table, fmt: str) -> bytes:
+    """
+    Encode a table as an Arrow IPC stream or a Parquet file
+
+    Args:
+        table: Arrow table
+        fmt: "arrow" or "parquet"
+
+    Returns:
+        Encoded bytes
+    """
+    sink = io.BytesIO()
+
+    if fmt == "arrow":
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif fmt == "parquet":
+        pq.write_table(table, sink, compression="zstd")
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    return sink.getvalue()
@@ -0,0 +1,235 @@
+"""
+Event Broadcasting Service
+Fans pipeline and data-version events out to Server-Sent Events listeners
+"""
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.core.cache import data_version, invalidate_caches
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.replica import read_session, replica_router
+from app.models.snapshot import parse_run_id
+from app.services.history_store import history_store
+from app.services.map_payload import load_map_features
+from app.services.notifications import listen_data_version
+from app.services.snapshot import get_data_version
+
+logger = logging.getLogger(__name__)
+
+# Map variants carried in snapshot deltas (same keys as the dashboard bootstrap)
+MAP_VARIANTS = {"momentum": False, "combined": True}
+
+
+@dataclass
+class ServerEvent:
+    """A published event"""
+    id: int
+    event: str
+    data: bytes
+
+    def encode(self) -> bytes:
+        """Encode in text/event-stream format"""
+        return (
+            f"id: {self.id}\nevent: {self.event}\n".encode()
+            + b"data: " + self.data + b"\n\n"
+        )
+
+
+class EventBroadcaster:
+    """
+    Single in-process broadcaster for all connected listeners
+
+    Events go into one shared ring buffer. Listeners only remember the id
+    of the last event they received and wait on a shared asyncio.Event that
+    is swapped on every publish, so an idle listener holds no queue or
+    task of its own.
+    """
+
+    def __init__(self, buffer_size: int):
+        """
+        Initialize broadcaster
+
+        Args:
+            buffer_size: Number of recent events kept for late or
+                reconnecting listeners (Last-Event-ID)
+        """
+        self._events: "deque[ServerEvent]" = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._changed = asyncio.Event()
+        self.listeners = 0
+
+    @property
+    def last_id(self) -> int:
+        """Id of the most recent event"""
+        return self._last_id
+
+    def publish(self, event: str, data: dict) -> ServerEvent:
+        """
+        Publish an event to all listeners
+
+        Must be called from the event loop thread.
+
+        Args:
+            event: Event name
+            data: JSON-serializable payload
+
+        Returns:
+            The published event
+        """
+        self._last_id += 1
+        server_event = ServerEvent(id=self._last_id, event=event, data=dumps(data))
+        self._events.append(server_event)
+
+        # Wake everyone currently waiting, then start a new generation
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+        return server_event
+
+    def events_after(self, last_id: int) -> List[ServerEvent]:
+        """
+        Get buffered events newer than an event id
+
+        Args:
+            last_id: Id of the last event the listener received
+
+        Returns:
+            Events in publication order
+        """
+        return [event for event in self._events if event.id > last_id]
+
+    async def wait(self, last_id: int, timeout: float) -> List[ServerEvent]:
+        """
+        Wait for events newer than an event id
+
+        Args:
+            last_id: Id of the last event the listener received
+            timeout: Seconds to wait before returning an empty list
+
+        Returns:
+            New events (empty on timeout)
+        """
+        events = self.events_after(last_id)
+        if events:
+            return events
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        return self.events_after(last_id)
+
+
+broadcaster = EventBroadcaster(settings.EVENTS_BUFFER_SIZE)
+
+
+def diff_map_features(
+    previous: Dict[str, dict],
+    current: Dict[str, dict]
+) -> dict:
+    """
+    Compute the map delta between two snapshots
+
+    Args:
+        previous: Country code -> GeoJSON feature before
+        current: Country code -> GeoJSON feature after
+
+    Returns:
+        Dictionary with changed/added features and removed country codes
+    """
+    return {
+        "changed": [
+            feature for code, feature in current.items()
+            if previous.get(code) != feature
+        ],
+        "removed": [code for code in previous if code not in current],
+    }
+
+
+async def watch_data_version(poll_seconds: Optional[float] = None):
+    """
+    Track the data version and publish events when it changes
+
+    On Postgres, new versions are pushed by the pipeline's NOTIFY and
+    swapped into this worker's cache tracker as soon as they arrive; the
+    database is only queried once per change, to build the map delta.
+    Without a LISTEN connection the version is polled instead, as it is
+    with replica routing: the replica may receive a version after its
+    notification, so the version is always read from the routed database.
+
+    On a change, the in-memory score history is reloaded and a `snapshot`
+    event is published with the map delta for both map variants, so clients
+    can update in place. (`scores_written` comes from the refresh job when
+    its score stage commits; see run_refresh_stages.)
+
+    Args:
+        poll_seconds: Polling interval (default: settings.EVENTS_POLL_SECONDS)
+    """
+    poll_seconds = poll_seconds or settings.EVENTS_POLL_SECONDS
+    version = None
+    features: Dict[str, Dict[str, dict]] = {}
+    wake = asyncio.Event()
+
+    def on_version(notified: str):
+        # Swap the cache version immediately; events follow on the next loop
+        if not replica_router.enabled:
+            data_version.set(notified)
+        wake.set()
+
+    def on_connection_change(connected: bool):
+        data_version.pushed = connected and not replica_router.enabled
+        if not connected:
+            # Notifications may have been missed
+            invalidate_caches()
+        wake.set()
+
+    listener = asyncio.create_task(listen_data_version(on_version, on_connection_change))
+
+    try:
+        while True:
+            wake.clear()
+            failed = False
+
+            try:
+                async with read_session() as db:
+                    current = await get_data_version(db)
+
+                    if current != version:
+                        data_version.set(current)
+                        await history_store.refresh(current)
+
+                        run_id = parse_run_id(current)
+                        current_features = {
+                            variant: await load_map_features(db, run_id, include_structural)
+                            for variant, include_structural in MAP_VARIANTS.items()
+                        }
+
+                        if version is not None:
+                            broadcaster.publish("snapshot", {
+                                "version": current,
+                                "previous_version": version,
+                                "map_delta": {
+                                    variant: diff_map_features(features[variant], current_features[variant])
+                                    for variant in MAP_VARIANTS
+                                },
+                            })
+
+                        version, features = current, current_features
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Data version watcher failed")
+                failed = True
+
+            timeout = None if data_version.pushed and not failed else poll_seconds
+            try:
+                await asyncio.wait_for(wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        listener.cancel()
@@ -0,0 +1,181 @@
+"""
+Series Fingerprints
+Content hashes and diffs that keep unchanged observations from being rewritten
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.indicator import IndicatorValue, SeriesFingerprint
+
+
+@dataclass
+class RevisionStats:
+    """Series and observation counts of one source in a fetch"""
+    series: int = 0
+    unchanged: int = 0
+    new_observations: int = 0
+    revised_observations: int = 0
+
+    @property
+    def changed(self) -> int:
+        """Series whose content changed"""
+        return self.series - self.unchanged
+
+
+def series_hash(df: pd.DataFrame, calculation_method: Optional[str]) -> str:
+    """
+    Hash a fetched series
+
+    The hash covers the dates and values (in date order) and the
+    indicator's calculation method, whose change also requires new
+    momentum values.
+
+    Args:
+        df: DataFrame with date and value columns
+        calculation_method: Indicator calculation method
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    df = df.sort_values("date")
+    digest = hashlib.sha256((calculation_method or "").encode())
+    digest.update(pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]").astype(np.int64).tobytes())
+    # NaN has several bit patterns; hash missing values as one
+    values = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=np.float64)
+    digest.update(np.where(np.isnan(values), np.nan, values).tobytes())
+    return digest.hexdigest()
+
+
+def stored_series(db, country_code: str, indicator_id: int) -> pd.DataFrame:
+    """
+    Load the stored observations of a series
+
+    Args:
+        db: Session or connection
+        country_code: Country code
+        indicator_id: Indicator id
+
+    Returns:
+        DataFrame with date, raw_value and calculated_value columns
+    """
+    rows = db.execute(
+        select(IndicatorValue.date, IndicatorValue.raw_value, IndicatorValue.calculated_value).filter(
+            IndicatorValue.country_code == country_code,
+            IndicatorValue.indicator_id == indicator_id
+        )
+    ).all()
+    return pd.DataFrame(rows, columns=["date", "raw_value", "calculated_value"])
+
+
+def diff_series(df: pd.DataFrame, stored: pd.DataFrame) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Find the observations that are new or differ from the stored ones
+
+    Args:
+        df: Processed series with date, value and momentum columns
+        stored: Output of stored_series
+
+    Returns:
+        Tuple of (rows of df to store, new observations, revised observations)
+    """
+    if "momentum" not in df:
+        df = df.assign(momentum=np.nan)
+
+    merged = df.assign(date=pd.to_datetime(df["date"])).merge(
+        stored.assign(date=pd.to_datetime(stored["date"])),
+        on="date",
+        how="left",
+        indicator=True
+    )
+    is_new = (merged["_merge"] == "left_only").to_numpy()
+
+    def differs(left: str, right: str) -> np.ndarray:
+        a = pd.to_numeric(merged[left], errors="coerce").to_numpy(dtype=np.float64)
+        b = pd.to_numeric(merged[right], errors="coerce").to_numpy(dtype=np.float64)
+        return ~((a == b) | (np.isnan(a) & np.isnan(b)))
+
+    is_revised = ~is_new & (differs("value", "raw_value") | differs("momentum", "calculated_value"))
+    changed = df.iloc[np.flatnonzero(is_new | is_revised)]
+
+    return changed, int(is_new.sum()), int(is_revised.sum())
+
+
+class FingerprintStore:
+    """
+    Stored series fingerprints, loaded once per indicator
+
+    Lookups after load() only read a dictionary, so worker threads can
+    call matches() while the owning thread records new fingerprints later.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize store
+
+        Args:
+            db: Database session (the owning thread's)
+        """
+        self.db = db
+        self._rows: Dict[Tuple[str, int], SeriesFingerprint] = {}
+        self._hashes: Dict[Tuple[str, int], str] = {}
+        self._loaded = set()
+
+    def load(self, indicator_ids: Iterable[int]):
+        """Load the fingerprints of indicators not loaded yet"""
+        missing = set(indicator_ids) - self._loaded
+        if not missing:
+            return
+
+        for fingerprint in self.db.query(SeriesFingerprint).filter(
+            SeriesFingerprint.indicator_id.in_(missing)
+        ).all():
+            key = (fingerprint.country_code, fingerprint.indicator_id)
+            self._rows[key] = fingerprint
+            self._hashes[key] = fingerprint.content_hash
+        self._loaded |= missing
+
+    def matches(self, country_code: str, indicator_id: int, content_hash: str) -> bool:
+        """
+        Check whether a series is unchanged since it was last stored
+
+        Args:
+            country_code: Country code
+            indicator_id: Indicator id
+            content_hash: Hash of the fetched series
+
+        Returns:
+            True if the stored fingerprint has the same hash
+        """
+        if indicator_id not in self._loaded:
+            self.load([indicator_id])
+        return self._hashes.get((country_code, indicator_id)) == content_hash
+
+    def record(self, country_code: str, indicator_id: int, content_hash: str, observations: int):
+        """
+        Record a stored series' fingerprint (committed with the session)
+
+        Args:
+            country_code: Country code
+            indicator_id: Indicator id
+            content_hash: Hash of the series
+            observations: Observations in the series
+        """
+        key = (country_code, indicator_id)
+        fingerprint = self._rows.get(key)
+
+        if fingerprint is None:
+            fingerprint = SeriesFingerprint(country_code=country_code, indicator_id=indicator_id)
+            self.db.add(fingerprint)
+            self._rows[key] = fingerprint
+
+        fingerprint.content_hash = content_hash
+        fingerprint.observations = observations
+        fingerprint.changed_at = datetime.utcnow()
+        self._hashes[key] = content_hash
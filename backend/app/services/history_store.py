@@ -0,0 +1,261 @@
+"""
+Score History Store
+In-memory columnar copy of the score history, reloaded per data version
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.replica import read_session
+from app.models.country import Country
+from app.models.momentum import MomentumScore, PillarScore
+from app.services.calculators.pillar import PillarCalculator
+from app.services.snapshot import get_data_version
+
+logger = logging.getLogger(__name__)
+
+PILLAR_NAMES = list(PillarCalculator.PILLAR_WEIGHTS)
+
+# Pillars carried forward between releases; their vintage is kept per row
+SLOW_PILLAR_NAMES = [name for name in PILLAR_NAMES if name in PillarCalculator.SLOW_PILLARS]
+
+# Score series held per country, in response order
+SCORE_SERIES = ["momentum_score", "structural_score", "combined_score"]
+
+
+@dataclass
+class HistoryStore:
+    """
+    Score history for all countries as flat column arrays
+
+    Rows are sorted by (country, date); a country's rows are the range
+    offsets[i]:offsets[i + 1], so every per-country array is a view and a
+    date range within it is found with a binary search.
+    """
+    version: str
+    names: Dict[str, str]  # Every known country, code -> name
+    codes: List[str]  # Countries with scores, in row order
+    offsets: np.ndarray  # int64 [len(codes) + 1]
+    dates: np.ndarray  # datetime64[us] [rows]
+    scores: Dict[str, np.ndarray]  # SCORE_SERIES -> float64 [rows], NaN if missing
+    ranks: np.ndarray  # int32 [rows], 0 if missing
+    classifications: np.ndarray  # int16 [rows], index into labels, -1 if missing
+    classification_labels: List[str]
+    pillars: Dict[str, np.ndarray]  # PILLAR_NAMES -> float64 [rows] percentile ranks
+    pillar_as_of: Dict[str, np.ndarray]  # SLOW_PILLAR_NAMES -> datetime64[us] [rows], NaT if missing
+    pillar_stale: Dict[str, np.ndarray]  # SLOW_PILLAR_NAMES -> bool [rows]
+
+    def __post_init__(self):
+        self._positions = {code: i for i, code in enumerate(self.codes)}
+
+    def row_range(
+        self,
+        code: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> slice:
+        """
+        Get the rows of a country within a date range
+
+        Args:
+            code: Country code
+            start: Inclusive start date
+            end: Inclusive end date
+
+        Returns:
+            Slice into the flat arrays (empty if the country has no scores)
+        """
+        position = self._positions.get(code)
+        if position is None:
+            return slice(0, 0)
+
+        first, last = int(self.offsets[position]), int(self.offsets[position + 1])
+        dates = self.dates[first:last]
+
+        if start is not None:
+            first += int(np.searchsorted(dates, np.datetime64(start, "us"), side="left"))
+        if end is not None:
+            last = int(self.offsets[position]) + int(
+                np.searchsorted(dates, np.datetime64(end, "us"), side="right")
+            )
+
+        return slice(first, max(first, last))
+
+    def labels(self, rows: slice) -> List[Optional[str]]:
+        """Classification labels for a row range"""
+        return [
+            self.classification_labels[index] if index >= 0 else None
+            for index in self.classifications[rows].tolist()
+        ]
+
+
+async def load_history_store(db: AsyncSession, version: str) -> HistoryStore:
+    """
+    Load the score history into a HistoryStore
+
+    Args:
+        db: Async database session
+        version: Data version the history belongs to
+
+    Returns:
+        HistoryStore
+    """
+    countries = (await db.execute(select(Country.code, Country.name))).all()
+
+    result = await db.execute(
+        select(
+            MomentumScore.country_code,
+            MomentumScore.date,
+            MomentumScore.momentum_score,
+            MomentumScore.structural_score,
+            MomentumScore.combined_score,
+            MomentumScore.global_rank,
+            MomentumScore.classification
+        ).order_by(MomentumScore.country_code, MomentumScore.date)
+    )
+    rows = result.all()
+
+    codes: List[str] = []
+    offsets = [0]
+    for index, row in enumerate(rows):
+        if not codes or row.country_code != codes[-1]:
+            if codes:
+                offsets.append(index)
+            codes.append(row.country_code)
+    offsets.append(len(rows))
+    if not codes:
+        offsets = [0]
+
+    labels = sorted({row.classification for row in rows if row.classification})
+    label_index = {label: i for i, label in enumerate(labels)}
+
+    def column(values, dtype):
+        return np.array([np.nan if value is None else value for value in values], dtype=dtype)
+
+    # Pillar percentiles (and slow pillar vintages) aligned to the score rows
+    row_index = {(row.country_code, row.date): i for i, row in enumerate(rows)}
+    pillars = {name: np.full(len(rows), np.nan) for name in PILLAR_NAMES}
+    pillar_as_of = {
+        name: np.full(len(rows), np.datetime64("NaT"), dtype="datetime64[us]")
+        for name in SLOW_PILLAR_NAMES
+    }
+    pillar_stale = {name: np.zeros(len(rows), dtype=bool) for name in SLOW_PILLAR_NAMES}
+
+    pillar_rows = await db.execute(
+        select(
+            PillarScore.country_code,
+            PillarScore.date,
+            PillarScore.pillar_name,
+            PillarScore.percentile_rank,
+            PillarScore.as_of_date,
+            PillarScore.is_stale
+        )
+    )
+    for code, date, pillar_name, percentile_rank, as_of_date, is_stale in pillar_rows.all():
+        i = row_index.get((code, date))
+        if i is None:
+            continue
+        if pillar_name in pillars and percentile_rank is not None:
+            pillars[pillar_name][i] = percentile_rank
+        if pillar_name in pillar_as_of:
+            if as_of_date is not None:
+                pillar_as_of[pillar_name][i] = np.datetime64(as_of_date, "us")
+            pillar_stale[pillar_name][i] = bool(is_stale)
+
+    return HistoryStore(
+        version=version,
+        names={code: name for code, name in countries},
+        codes=codes,
+        offsets=np.array(offsets, dtype=np.int64),
+        dates=np.array([row.date for row in rows], dtype="datetime64[us]"),
+        scores={
+            series: column([getattr(row, series) for row in rows], np.float64)
+            for series in SCORE_SERIES
+        },
+        ranks=np.array([row.global_rank or 0 for row in rows], dtype=np.int32),
+        classifications=np.array(
+            [label_index.get(row.classification, -1) for row in rows],
+            dtype=np.int16
+        ),
+        classification_labels=labels,
+        pillars=pillars,
+        pillar_as_of=pillar_as_of,
+        pillar_stale=pillar_stale
+    )
+
+
+class HistoryStoreHolder:
+    """
+    Holds the current HistoryStore and swaps it when the data version changes
+
+    With HISTORY_SNAPSHOT_DIR set, the store is a read-only mapping of a
+    snapshot shared by all workers on the host instead of a private copy.
+    """
+
+    def __init__(self):
+        self.store: Optional[HistoryStore] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, version: str) -> HistoryStore:
+        """
+        Get the store for a data version, reloading it if outdated
+
+        Args:
+            version: Current data version
+
+        Returns:
+            HistoryStore
+        """
+        store = self.store
+        if store is None or store.version != version:
+            store = await self.refresh(version)
+        return store
+
+    async def refresh(self, version: Optional[str] = None) -> HistoryStore:
+        """
+        Reload the store (once, if several callers ask concurrently)
+
+        Args:
+            version: Data version to load (default: look it up)
+
+        Returns:
+            HistoryStore
+        """
+        async with self._lock:
+            if self.store is not None and version is not None and self.store.version == version:
+                return self.store
+
+            if version is None:
+                async with read_session() as db:
+                    version = await get_data_version(db)
+
+            if settings.HISTORY_SNAPSHOT_DIR:
+                # Imported here: shared_snapshot imports HistoryStore from this module
+                from app.services.shared_snapshot import load_shared_history_store
+
+                self.store = await load_shared_history_store(
+                    Path(settings.HISTORY_SNAPSHOT_DIR),
+                    version,
+                    lambda: self._load(version)
+                )
+            else:
+                self.store = await self._load(version)
+
+            logger.info("Loaded score history for %s (%d rows)", version, len(self.store.dates))
+            return self.store
+
+    async def _load(self, version: str) -> HistoryStore:
+        """Load the store from the database"""
+        async with read_session() as db:
+            return await load_history_store(db, version)
+
+
+history_store = HistoryStoreHolder()
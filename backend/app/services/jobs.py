@@ -0,0 +1,391 @@
+"""
+Job Runner
+Runs pipeline jobs on a bounded thread pool, one pipeline at a time cluster-wide
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import PipelineSessionLocal, pipeline_engine
+from app.models.indicator import Indicator, SeriesFingerprint
+from app.models.snapshot import DataSnapshot
+from app.services.events import broadcaster
+from app.services.snapshot import publish_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held while a pipeline runs (any process)
+PIPELINE_LOCK_KEY = 72_201_944
+LOCK_POLL_SECONDS = 5.0
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+FINISHED = (SUCCEEDED, FAILED, SKIPPED)
+
+REFRESH_STAGES = ["fetch", "score", "snapshot"]
+
+
+class PipelineBusyError(RuntimeError):
+    """Another process holds the pipeline lock"""
+
+
+@dataclass
+class Job:
+    """State of a submitted job"""
+    id: str
+    kind: str
+    stages: List[str]
+    status: str = QUEUED
+    stage: Optional[str] = None
+    progress: float = 0.0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Dict = field(default_factory=dict)
+    _started: Optional[float] = None
+    _duration: Optional[float] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        """Running time so far, or the total once finished"""
+        if self._duration is not None:
+            return self._duration
+        if self._started is not None:
+            return round(time.monotonic() - self._started, 3)
+        return None
+
+    def start_stage(self, stage: str):
+        """Enter the next stage"""
+        self.stage = stage
+        self.set_progress(0.0)
+
+    def set_progress(self, fraction: float):
+        """
+        Report progress within the current stage
+
+        Args:
+            fraction: Completed fraction of the stage (0-1)
+        """
+        index = self.stages.index(self.stage)
+        self.progress = round((index + min(max(fraction, 0.0), 1.0)) / len(self.stages), 4)
+
+    def publish(self, event: str, data: dict):
+        """
+        Announce an event to event stream listeners from the job's thread
+
+        Args:
+            event: Event name
+            data: JSON-serializable payload (the job id is added)
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(broadcaster.publish, event, {"job_id": self.id, **data})
+
+    def as_dict(self) -> dict:
+        """Job dictionary matching the Job schema"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.duration_seconds,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobRunner:
+    """
+    Bounded pool of worker threads running pipeline jobs
+
+    Submitting a kind of job that is already queued or running returns the
+    existing job instead of starting another one. Finished jobs are kept
+    (up to history_size) so their status stays readable.
+    """
+
+    def __init__(self, max_workers: int, history_size: int):
+        """
+        Initialize runner
+
+        Args:
+            max_workers: Worker threads
+            history_size: Jobs remembered for status lookups
+        """
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cmi-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        stages: List[str],
+        run: Callable[[Job], None]
+    ) -> Tuple[Job, bool]:
+        """
+        Queue a job unless one of the same kind is active
+
+        Must be called from the event loop; completion is announced to
+        event stream listeners as a `job_done` event, and jobs can publish
+        their own events through Job.publish.
+
+        Args:
+            kind: Job kind, the deduplication key
+            stages: Stage names, in order
+            run: Function doing the work in a worker thread; it reports
+                progress on the Job it receives
+
+        Returns:
+            Tuple of (job, whether it was newly created)
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            active = self._active.get(kind)
+            if active is not None:
+                return active, False
+
+            job = Job(id=uuid.uuid4().hex, kind=kind, stages=stages)
+            self._active[kind] = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history_size:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.status not in FINISHED:
+                    break
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._execute, job, run, loop)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id"""
+        return self._jobs.get(job_id)
+
+    def shutdown(self):
+        """Stop accepting jobs and drop queued ones (running jobs finish)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job: Job, run: Callable[[Job], None], loop: asyncio.AbstractEventLoop):
+        """Run a job in a worker thread and record its outcome"""
+        job.status = RUNNING
+        job.started_at = datetime.utcnow()
+        job._started = time.monotonic()
+        job._loop = loop
+
+        try:
+            run(job)
+            job.status = SUCCEEDED
+            job.progress = 1.0
+        except PipelineBusyError as e:
+            job.status = SKIPPED
+            job.error = str(e)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.status = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = datetime.utcnow()
+            job._duration = round(time.monotonic() - job._started, 3)
+            with self._lock:
+                self._active.pop(job.kind, None)
+
+        job.publish("job_done", {
+            "kind": job.kind,
+            "status": job.status,
+            "duration_seconds": job.duration_seconds,
+        })
+
+
+job_runner = JobRunner(settings.JOB_WORKERS, settings.JOB_HISTORY_SIZE)
+
+# Serializes pipelines within this process
+_local_lock = threading.Lock()
+
+
+@contextmanager
+def pipeline_lock(wait_seconds: float = 0) -> Iterator[bool]:
+    """
+    Hold the cluster-wide pipeline lock
+
+    Pipelines in this process are serialized with a thread lock; across
+    processes a session-level Postgres advisory lock is held on a dedicated
+    pipeline connection (so DATABASE_URL_PIPELINE must not go through
+    PgBouncer transaction pooling). Other databases have no cluster-wide lock.
+
+    Args:
+        wait_seconds: How long to keep retrying while another pipeline
+            holds the lock
+
+    Yields:
+        True if the lock was acquired, False if another pipeline holds it
+    """
+    if wait_seconds > 0:
+        locked = _local_lock.acquire(timeout=wait_seconds)
+    else:
+        locked = _local_lock.acquire(blocking=False)
+
+    if not locked:
+        yield False
+        return
+
+    try:
+        if pipeline_engine.dialect.name != "postgresql":
+            yield True
+        else:
+            with _advisory_lock(wait_seconds) as acquired:
+                yield acquired
+    finally:
+        _local_lock.release()
+
+
+@contextmanager
+def _advisory_lock(wait_seconds: float) -> Iterator[bool]:
+    """Hold the Postgres advisory lock (see pipeline_lock)"""
+    with pipeline_engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        deadline = time.monotonic() + wait_seconds
+
+        while True:
+            acquired = connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": PIPELINE_LOCK_KEY}
+            )
+            if acquired or time.monotonic() >= deadline:
+                break
+            time.sleep(LOCK_POLL_SECONDS)
+
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": PIPELINE_LOCK_KEY}
+                )
+
+
+def run_refresh_pipeline(job: Job):
+    """
+    Fetch all indicator data, recalculate scores and publish a snapshot
+
+    Args:
+        job: Job receiving stage and progress updates
+
+    Raises:
+        PipelineBusyError: If another process is running the pipeline
+    """
+    with pipeline_lock() as acquired:
+        if not acquired:
+            raise PipelineBusyError("Another pipeline run holds the lock")
+
+        db = PipelineSessionLocal()
+        try:
+            run_refresh_stages(job, db)
+        finally:
+            db.close()
+
+
+def changed_since_snapshot(db: Session) -> bool:
+    """
+    Check whether any series changed after the latest snapshot was published
+
+    Args:
+        db: Database session
+
+    Returns:
+        False only if every fingerprinted series is older than the latest
+        snapshot (True when either is missing)
+    """
+    published = db.query(func.max(DataSnapshot.created_at)).scalar()
+    changed = db.query(func.max(SeriesFingerprint.changed_at)).scalar()
+    return published is None or changed is None or changed > published
+
+
+def run_refresh_stages(
+    job: Job,
+    db: Session,
+    indicators: Optional[List[Indicator]] = None,
+    incremental: bool = False
+):
+    """
+    Run the fetch, score and snapshot stages (caller holds the pipeline lock)
+
+    Scoring and publishing are skipped when no fetched series changed
+    since the latest snapshot. The end of the fetch and score stages is
+    announced as `fetch_done` and `scores_written` events.
+
+    Args:
+        job: Job receiving stage and progress updates
+        db: Pipeline database session
+        indicators: Indicators to fetch (default: all)
+        incremental: Only store recent observations (see
+            DataFetchOrchestrator.fetch_indicators)
+    """
+    # The pipeline classes live in the scripts package (backend/ is on sys.path)
+    from scripts.calculate_scores import ScoreCalculationPipeline
+    from scripts.fetch_data import DataFetchOrchestrator
+
+    job.start_stage("fetch")
+    orchestrator = DataFetchOrchestrator(db)
+    if indicators is None:
+        revisions = orchestrator.fetch_all_indicators(progress=job.set_progress)
+    else:
+        revisions = orchestrator.fetch_indicators(
+            indicators,
+            incremental=incremental,
+            revision_months=settings.SCHEDULER_REVISION_MONTHS,
+            progress=job.set_progress
+        )
+    job.result = {
+        **job.result,
+        "revisions": {
+            source: {**asdict(stats), "changed": stats.changed}
+            for source, stats in revisions.items()
+        },
+    }
+
+    unchanged = not changed_since_snapshot(db)
+    job.publish("fetch_done", {
+        "changed": sum(stats.changed for stats in revisions.values()),
+        "unchanged": unchanged,
+    })
+
+    if unchanged:
+        logger.info("No series changed since the last snapshot; scores are current")
+        job.result = {**job.result, "unchanged": True}
+        return
+
+    job.start_stage("score")
+    score_date = ScoreCalculationPipeline(db).calculate_all_scores(
+        progress=job.set_progress,
+        publish=False
+    )
+    job.publish("scores_written", {
+        "score_date": score_date.date().isoformat() if score_date else None,
+    })
+
+    job.start_stage("snapshot")
+    snapshot = publish_snapshot(db)
+    job.set_progress(1.0)
+    job.result = {**job.result, "version": snapshot.version}
@@ -0,0 +1,405 @@
+"""
+Leaderboard Service
+Ranks countries by momentum score change
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Select, and_, asc, delete, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.country import Country
+from app.models.leaderboard import LeaderboardEntry
+from app.models.momentum import MomentumScore
+from app.models.snapshot import DataSnapshot
+
+# Map period to score change column
+PERIOD_COLUMNS = {
+    "1m": "score_change_1m",
+    "3m": "score_change_3m",
+    "6m": "score_change_6m"
+}
+
+# Any horizon in months, e.g. 12m or 24m
+PERIOD_PATTERN = "^[0-9]{1,3}m$"
+MAX_PERIOD_MONTHS = 120
+
+# Tolerance when matching the score a horizon ago (as in calculate_scores.py)
+HORIZON_WINDOW_DAYS = 15
+
+# Region / income group value meaning "no filter" in precomputed entries
+ALL_GROUPS = "all"
+
+DIRECTIONS = ("improvers", "decliners")
+
+# Snapshots whose precomputed leaderboards are kept (older ones are pruned)
+RETAINED_SNAPSHOTS = 2
+
+SUMMARY_FIELDS = [
+    "country_code",
+    "country_name",
+    "momentum_score",
+    "score_change",
+    "classification",
+    "global_rank",
+]
+
+
+def period_months(period: str) -> int:
+    """
+    Parse a horizon such as "12m"
+
+    Args:
+        period: Horizon string
+
+    Returns:
+        Number of months
+
+    Raises:
+        ValueError: If the horizon is malformed or out of range
+    """
+    if not period.endswith("m") or not period[:-1].isdigit():
+        raise ValueError(f"Invalid period: {period}")
+
+    months = int(period[:-1])
+    if not 1 <= months <= MAX_PERIOD_MONTHS:
+        raise ValueError(f"Period must be between 1m and {MAX_PERIOD_MONTHS}m")
+
+    return months
+
+
+def score_changes_query(
+    period: str,
+    latest_date,
+    region: Optional[str] = None,
+    income_group: Optional[str] = None
+) -> Tuple[Select, object]:
+    """
+    Select countries with a score change over a horizon at the latest date
+
+    Stored horizons (1m, 3m, 6m) read their score_change column. Other
+    horizons join each country's latest score to its score a horizon
+    earlier (the most recent one within HORIZON_WINDOW_DAYS of the target
+    date, picked with a window function).
+
+    Args:
+        period: Horizon such as "3m" or "24m"
+        latest_date: Latest score date
+        region: Optional region filter
+        income_group: Optional income group filter
+
+    Returns:
+        Tuple of (statement with SUMMARY_FIELDS plus region and
+        income_group columns, score change expression for ordering)
+    """
+    if period in PERIOD_COLUMNS:
+        change = getattr(MomentumScore, PERIOD_COLUMNS[period])
+        stmt = select(
+            MomentumScore.country_code,
+            Country.name.label("country_name"),
+            MomentumScore.momentum_score,
+            change.label("score_change"),
+            MomentumScore.classification,
+            MomentumScore.global_rank,
+            Country.region,
+            Country.income_group
+        ).join(
+            Country,
+            MomentumScore.country_code == Country.code
+        ).filter(
+            MomentumScore.date == latest_date,
+            change.isnot(None)
+        )
+    else:
+        target_date = latest_date - relativedelta(months=period_months(period))
+        window = timedelta(days=HORIZON_WINDOW_DAYS)
+
+        past = select(
+            MomentumScore.country_code,
+            MomentumScore.momentum_score,
+            func.row_number().over(
+                partition_by=MomentumScore.country_code,
+                order_by=desc(MomentumScore.date)
+            ).label("row_number")
+        ).filter(
+            MomentumScore.date >= target_date - window,
+            MomentumScore.date <= target_date + window
+        ).subquery()
+
+        change = MomentumScore.momentum_score - past.c.momentum_score
+        stmt = select(
+            MomentumScore.country_code,
+            Country.name.label("country_name"),
+            MomentumScore.momentum_score,
+            change.label("score_change"),
+            MomentumScore.classification,
+            MomentumScore.global_rank,
+            Country.region,
+            Country.income_group
+        ).join(
+            Country,
+            MomentumScore.country_code == Country.code
+        ).join(
+            past,
+            and_(
+                past.c.country_code == MomentumScore.country_code,
+                past.c.row_number == 1
+            )
+        ).filter(
+            MomentumScore.date == latest_date
+        )
+
+    if region:
+        stmt = stmt.filter(Country.region == region)
+    if income_group:
+        stmt = stmt.filter(Country.income_group == income_group)
+
+    return stmt, change
+
+
+def leaderboard_query(
+    period: str,
+    latest_date,
+    direction: str,
+    limit: int,
+    region: Optional[str] = None,
+    income_group: Optional[str] = None
+) -> Select:
+    """
+    Select the top improvers or decliners with ORDER BY ... LIMIT
+
+    Args:
+        period: Horizon such as "3m" or "24m"
+        latest_date: Latest score date
+        direction: "improvers" (largest change first) or "decliners"
+            (smallest change first)
+        limit: Number of countries
+        region: Optional region filter
+        income_group: Optional income group filter
+
+    Returns:
+        Statement selecting SUMMARY_FIELDS
+    """
+    stmt, change = score_changes_query(period, latest_date, region, income_group)
+    order = desc(change) if direction == "improvers" else asc(change)
+
+    return stmt.order_by(order, MomentumScore.country_code).limit(limit)
+
+
+async def query_leaderboard(
+    db: AsyncSession,
+    period: str,
+    limit: int,
+    region: Optional[str] = None,
+    income_group: Optional[str] = None
+) -> dict:
+    """
+    Build a leaderboard from the score tables
+
+    Args:
+        db: Async database session
+        period: Horizon such as "3m" or "24m"
+        limit: Number of countries per list
+        region: Optional region filter
+        income_group: Optional income group filter
+
+    Returns:
+        Leaderboard dictionary matching the MomentumLeaderboard schema
+    """
+    latest_date = await db.scalar(select(func.max(MomentumScore.date)))
+    lists = {direction: [] for direction in DIRECTIONS}
+
+    if latest_date:
+        for direction in DIRECTIONS:
+            result = await db.execute(
+                leaderboard_query(period, latest_date, direction, limit, region, income_group)
+            )
+            lists[direction] = [
+                dict(zip(SUMMARY_FIELDS, row)) for row in result.all()
+            ]
+
+    return _leaderboard(period, region, income_group, lists)
+
+
+async def load_leaderboard(
+    db: AsyncSession,
+    run_id: int,
+    period: str,
+    limit: int,
+    region: Optional[str] = None,
+    income_group: Optional[str] = None
+) -> Optional[dict]:
+    """
+    Load a precomputed leaderboard for a snapshot
+
+    Args:
+        db: Async database session
+        run_id: Snapshot id
+        period: Horizon such as "3m"
+        limit: Number of countries per list
+        region: Optional region filter
+        income_group: Optional income group filter
+
+    Returns:
+        Leaderboard dictionary, or None if it was not precomputed (unknown
+        snapshot or horizon, or limit above LEADERBOARD_TOP_K)
+    """
+    if limit > settings.LEADERBOARD_TOP_K:
+        return None
+
+    result = await db.execute(
+        select(
+            LeaderboardEntry.direction,
+            *[getattr(LeaderboardEntry, field) for field in SUMMARY_FIELDS]
+        ).filter(
+            LeaderboardEntry.snapshot_id == run_id,
+            LeaderboardEntry.period == period,
+            LeaderboardEntry.region == (region or ALL_GROUPS),
+            LeaderboardEntry.income_group == (income_group or ALL_GROUPS),
+            LeaderboardEntry.position <= limit
+        ).order_by(
+            LeaderboardEntry.direction,
+            LeaderboardEntry.position
+        )
+    )
+    rows = result.all()
+
+    if not rows:
+        return None
+
+    lists = {direction: [] for direction in DIRECTIONS}
+    for direction, *values in rows:
+        lists[direction].append(dict(zip(SUMMARY_FIELDS, values)))
+
+    return _leaderboard(period, region, income_group, lists)
+
+
+def store_leaderboards(db: Session, snapshot: DataSnapshot):
+    """
+    Precompute top-k leaderboards for a snapshot and add them to the session
+
+    One score change query per horizon in LEADERBOARD_PERIODS; the rows are
+    then ranked for every region, income group and region x income group
+    combination. Entries of older snapshots are pruned.
+
+    Args:
+        db: Database session (caller commits)
+        snapshot: Snapshot being published (must have an id)
+    """
+    retained = select(DataSnapshot.id).order_by(
+        desc(DataSnapshot.id)
+    ).limit(RETAINED_SNAPSHOTS).scalar_subquery()
+    db.execute(
+        delete(LeaderboardEntry).where(LeaderboardEntry.snapshot_id.not_in(retained)),
+        execution_options={"synchronize_session": False}
+    )
+
+    if not snapshot.score_date:
+        return
+
+    top_k = settings.LEADERBOARD_TOP_K
+
+    for period in settings.LEADERBOARD_PERIODS:
+        stmt, change = score_changes_query(period, snapshot.score_date)
+        rows = db.execute(stmt.order_by(desc(change), MomentumScore.country_code)).all()
+
+        # Rows are sorted by change; bucket them per group, keeping the order
+        groups: Dict[Tuple[str, str], List] = defaultdict(list)
+        for row in rows:
+            region = row.region or ALL_GROUPS
+            income_group = row.income_group or ALL_GROUPS
+            for key in {
+                (ALL_GROUPS, ALL_GROUPS),
+                (region, ALL_GROUPS),
+                (ALL_GROUPS, income_group),
+                (region, income_group),
+            }:
+                groups[key].append(row)
+
+        for (region, income_group), group_rows in groups.items():
+            lists = {
+                "improvers": group_rows[:top_k],
+                "decliners": sorted(
+                    group_rows,
+                    key=lambda row: (row.score_change, row.country_code)
+                )[:top_k],
+            }
+            for direction, ranked in lists.items():
+                db.add_all([
+                    LeaderboardEntry(
+                        snapshot_id=snapshot.id,
+                        period=period,
+                        region=region,
+                        income_group=income_group,
+                        direction=direction,
+                        position=position,
+                        **{field: getattr(row, field) for field in SUMMARY_FIELDS}
+                    )
+                    for position, row in enumerate(ranked, 1)
+                ])
+
+
+def _leaderboard(
+    period: str,
+    region: Optional[str],
+    income_group: Optional[str],
+    lists: Dict[str, List[dict]]
+) -> dict:
+    """Assemble a MomentumLeaderboard dictionary"""
+    return {
+        "period": period,
+        "region": region,
+        "income_group": income_group,
+        "improvers": lists["improvers"],
+        "decliners": lists["decliners"]
+    }
+
+
+def build_leaderboard(
+    period: str,
+    scores: Iterable[Tuple[MomentumScore, Country]],
+    limit: int
+) -> dict:
+    """
+    Build the top improvers and decliners for a period
+
+    Args:
+        period: 1m, 3m, or 6m
+        scores: (MomentumScore, Country) pairs for the latest date
+        limit: Number of countries per list
+
+    Returns:
+        Leaderboard dictionary matching the MomentumLeaderboard schema
+    """
+    change_column = PERIOD_COLUMNS[period]
+
+    # Build list with change values
+    countries_with_change = []
+    for score, country in scores:
+        change_value = getattr(score, change_column)
+        if change_value is not None:
+            countries_with_change.append({
+                "country_code": country.code,
+                "country_name": country.name,
+                "momentum_score": score.momentum_score,
+                "score_change": change_value,
+                "classification": score.classification,
+                "global_rank": score.global_rank
+            })
+
+    # Sort by change (descending for improvers, ascending for decliners)
+    countries_with_change.sort(key=lambda x: x["score_change"], reverse=True)
+
+    # Get top improvers and decliners
+    improvers = countries_with_change[:limit]
+    decliners = countries_with_change[-limit:][::-1]  # Reverse to get worst first
+
+    return {
+        "period": period,
+        "improvers": improvers,
+        "decliners": decliners
+    }
@@ -0,0 +1,187 @@
+"""
+Map Payload Service
+Builds the GeoJSON map payload and stores pre-serialized, pre-compressed
+variants of it with each published data snapshot
+"""
+import gzip
+from typing import Dict, Iterable, Optional, Tuple
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps
+from app.models.country import Country
+from app.models.momentum import MomentumScore
+from app.models.snapshot import DataSnapshot, SnapshotPayload
+from app.utils.constants import CLASSIFICATION_COLORS, DEFAULT_CLASSIFICATION_COLOR
+
+PAYLOAD_ENCODING = "gzip"
+
+
+def map_payload_name(include_structural: bool) -> str:
+    """Name under which a map variant is stored"""
+    return "map-data-structural" if include_structural else "map-data"
+
+
+def map_scores_query(latest_date):
+    """
+    Select latest scores joined to countries that have coordinates
+
+    Args:
+        latest_date: Score date to select
+
+    Returns:
+        SQLAlchemy select of (MomentumScore, Country) rows
+    """
+    return select(
+        MomentumScore,
+        Country
+    ).join(
+        Country,
+        MomentumScore.country_code == Country.code
+    ).filter(
+        MomentumScore.date == latest_date,
+        Country.latitude.isnot(None),
+        Country.longitude.isnot(None)
+    )
+
+
+def build_feature_collection(
+    scores: Iterable[Tuple[MomentumScore, Country]],
+    include_structural: bool
+) -> dict:
+    """
+    Build the GeoJSON FeatureCollection for the map
+
+    Args:
+        scores: (MomentumScore, Country) pairs
+        include_structural: Display the combined score instead of momentum
+
+    Returns:
+        GeoJSON FeatureCollection
+    """
+    features = []
+    for score, country in scores:
+        score_value = score.combined_score if include_structural else score.momentum_score
+
+        feature = {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [country.longitude, country.latitude]
+            },
+            "properties": {
+                "country_code": country.code,
+                "country_name": country.name,
+                "momentum_score": score.momentum_score,
+                "structural_score": score.structural_score,
+                "combined_score": score.combined_score,
+                "classification": score.classification,
+                "global_rank": score.global_rank,
+                "color": CLASSIFICATION_COLORS.get(score.classification, DEFAULT_CLASSIFICATION_COLOR),
+                "score": score_value  # The score to display
+            }
+        }
+        features.append(feature)
+
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
+
+def encode_payload(data: dict) -> bytes:
+    """
+    Serialize and gzip a payload
+
+    Args:
+        data: JSON-serializable payload
+
+    Returns:
+        Gzip-compressed JSON bytes
+    """
+    body = dumps(data)
+    # mtime=0 keeps the output (and therefore the ETag) deterministic
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def store_map_payloads(db: Session, snapshot: DataSnapshot):
+    """
+    Build both map variants for a snapshot and add them to the session
+
+    Args:
+        db: Database session (caller commits)
+        snapshot: Snapshot being published (must have an id)
+    """
+    scores = []
+    if snapshot.score_date:
+        scores = db.execute(map_scores_query(snapshot.score_date)).all()
+
+    for include_structural in (False, True):
+        db.add(SnapshotPayload(
+            snapshot_id=snapshot.id,
+            name=map_payload_name(include_structural),
+            content_encoding=PAYLOAD_ENCODING,
+            content=encode_payload(build_feature_collection(scores, include_structural))
+        ))
+
+
+async def load_map_payload(
+    db: AsyncSession,
+    run_id: int,
+    include_structural: bool
+) -> Optional[bytes]:
+    """
+    Load a pre-compressed map payload for a snapshot
+
+    Args:
+        db: Async database session
+        run_id: Snapshot id
+        include_structural: Which map variant to load
+
+    Returns:
+        Gzip-compressed JSON bytes, or None if the snapshot has no payload
+    """
+    return await db.scalar(
+        select(SnapshotPayload.content).filter(
+            SnapshotPayload.snapshot_id == run_id,
+            SnapshotPayload.name == map_payload_name(include_structural),
+            SnapshotPayload.content_encoding == PAYLOAD_ENCODING
+        )
+    )
+
+
+async def load_map_features(
+    db: AsyncSession,
+    run_id: int,
+    include_structural: bool
+) -> Dict[str, dict]:
+    """
+    Load per-country map features for a snapshot
+
+    Uses the stored payload when available, otherwise builds the
+    collection from the latest scores.
+
+    Args:
+        db: Async database session
+        run_id: Snapshot id
+        include_structural: Which map variant to load
+
+    Returns:
+        Dictionary mapping country codes to GeoJSON features
+    """
+    compressed = await load_map_payload(db, run_id, include_structural)
+
+    if compressed is not None:
+        collection = orjson.loads(gzip.decompress(compressed))
+    else:
+        latest_date = await db.scalar(select(func.max(MomentumScore.date)))
+        scores = (await db.execute(map_scores_query(latest_date))).all() if latest_date else []
+        collection = build_feature_collection(scores, include_structural)
+
+    return {
+        feature["properties"]["country_code"]: feature
+        for feature in collection["features"]
+    }
@@ -0,0 +1,99 @@
+"""
+Data Version Notifications
+Postgres NOTIFY from the pipeline and LISTEN in each API worker
+"""
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Channel carrying the new data version as payload
+DATA_VERSION_CHANNEL = "cmi_data_version"
+
+# Delay before reconnecting a dropped LISTEN connection
+RECONNECT_SECONDS = 5.0
+
+
+def notifications_supported(url: str) -> bool:
+    """Check whether a database URL points at Postgres"""
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+def notify_data_version(db: Session, version: str):
+    """
+    Queue a data version notification in the current transaction
+
+    Postgres delivers NOTIFY only when the transaction commits, so
+    listeners never see a version before its rows are visible. A no-op on
+    other databases.
+
+    Args:
+        db: Database session with the open pipeline transaction
+        version: New data version
+    """
+    if not settings.DATA_VERSION_NOTIFY or db.get_bind().dialect.name != "postgresql":
+        return
+
+    db.execute(
+        text("SELECT pg_notify(:channel, :version)"),
+        {"channel": DATA_VERSION_CHANNEL, "version": version}
+    )
+
+
+async def listen_data_version(
+    on_version: Callable[[str], None],
+    on_connection_change: Callable[[bool], None]
+):
+    """
+    Hold a LISTEN connection and report new data versions
+
+    Runs until cancelled, reconnecting after connection loss. Returns
+    immediately if notifications are disabled or the database is not
+    Postgres, leaving callers on their polling fallback.
+
+    Args:
+        on_version: Called with each notified version
+        on_connection_change: Called with True once listening and False
+            when the connection is lost (notifications may have been missed)
+    """
+    if not settings.DATA_VERSION_NOTIFY or not notifications_supported(settings.DATABASE_URL_ASYNC):
+        return
+
+    import asyncpg
+
+    dsn = make_url(settings.DATABASE_URL_ASYNC).set(drivername="postgresql")
+    dsn = dsn.render_as_string(hide_password=False)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda conn: closed.set())
+
+            await connection.add_listener(
+                DATA_VERSION_CHANNEL,
+                lambda conn, pid, channel, payload: on_version(payload)
+            )
+            on_connection_change(True)
+            logger.info("Listening for data version notifications")
+
+            await closed.wait()
+            logger.warning("Data version LISTEN connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Data version LISTEN connection failed")
+        finally:
+            on_connection_change(False)
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+        await asyncio.sleep(RECONNECT_SECONDS)
@@ -0,0 +1,241 @@
+"""
+Pipeline Runner
+Runs a DAG of stages in parallel, checkpointing stage outputs for resuming
+"""
+import logging
+import re
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models.pipeline import PipelineRun, PipelineStageRun
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Marker written once all of a stage's outputs are on disk
+SUCCESS_MARKER = "_SUCCESS"
+
+# Named output frames of a stage
+Outputs = Dict[str, pd.DataFrame]
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline step
+
+    run receives the outputs of the stages it depends on, keyed by stage
+    name, and returns its own outputs. Stages run in worker threads, so
+    each one opens its own database session.
+    """
+    name: str
+    run: Callable[[Dict[str, Outputs]], Outputs]
+    depends_on: List[str] = field(default_factory=list)
+
+
+class PipelineRunner:
+    """
+    Executes stages once their dependencies have succeeded
+
+    Independent stages run in parallel on a thread pool. Each stage's
+    outputs are written to Parquet under the run's checkpoint directory;
+    a resumed run loads the stages that already succeeded from there and
+    executes the rest. When a stage fails no new stages are started, the
+    running ones finish, and the run is marked failed.
+    """
+
+    def __init__(self, stages: List[Stage], db: Session, max_workers: int):
+        """
+        Initialize runner
+
+        Args:
+            stages: Stages of the DAG
+            db: Database session recording the run (used by this thread only)
+            max_workers: Stages executed at once
+
+        Raises:
+            ValueError: If a dependency is unknown or the stages form a cycle
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.db = db
+        self.max_workers = max_workers
+        self._check_graph()
+
+    def run(self, checkpoint_root: Path, resume: Optional[PipelineRun] = None) -> PipelineRun:
+        """
+        Execute the DAG
+
+        Args:
+            checkpoint_root: Directory holding the checkpoints of all runs
+            resume: Failed run to continue (reuses its checkpoints)
+
+        Returns:
+            The recorded PipelineRun (status succeeded or failed)
+        """
+        run = PipelineRun(
+            status=RUNNING,
+            started_at=datetime.utcnow(),
+            resumed_from_id=resume.id if resume else None,
+            checkpoint_dir=resume.checkpoint_dir if resume else "",
+        )
+        self.db.add(run)
+        self.db.flush()
+        if not resume:
+            run.checkpoint_dir = str(checkpoint_root / f"run-{run.id}")
+        self.db.commit()
+
+        started = time.monotonic()
+        checkpoint_dir = Path(run.checkpoint_dir)
+        outputs: Dict[str, Outputs] = {}
+        pending = dict(self.stages)
+        running: Dict[Future, Tuple[str, datetime]] = {}
+        failed = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cmi-stage") as executor:
+            while True:
+                ready = [
+                    name for name, stage in pending.items()
+                    if all(dependency in outputs for dependency in stage.depends_on)
+                ]
+                for name in ([] if failed else ready):
+                    stage = pending.pop(name)
+                    stage_dir = checkpoint_dir / _path_name(name)
+
+                    if (stage_dir / SUCCESS_MARKER).exists():
+                        outputs[name] = load_outputs(stage_dir)
+                        self._record_stage(run, name, SUCCEEDED, outputs[name], from_checkpoint=True)
+                        logger.info("Stage %s restored from checkpoint", name)
+                        continue
+
+                    inputs = {dependency: outputs[dependency] for dependency in stage.depends_on}
+                    future = executor.submit(_execute_stage, stage, inputs, stage_dir)
+                    running[future] = (name, datetime.utcnow())
+
+                if not running:
+                    if ready and not failed:
+                        # Restored stages may have unblocked others
+                        continue
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, stage_started = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception as e:
+                        logger.exception("Stage %s failed", name)
+                        failed = True
+                        self._record_stage(run, name, FAILED, started_at=stage_started, error=f"{type(e).__name__}: {e}")
+                    else:
+                        self._record_stage(run, name, SUCCEEDED, outputs[name], started_at=stage_started)
+
+        run.status = FAILED if failed or pending else SUCCEEDED
+        run.finished_at = datetime.utcnow()
+        run.duration_seconds = round(time.monotonic() - started, 3)
+        self.db.commit()
+
+        if run.status == SUCCEEDED:
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+        return run
+
+    def _record_stage(
+        self,
+        run: PipelineRun,
+        name: str,
+        status: str,
+        outputs: Optional[Outputs] = None,
+        started_at: Optional[datetime] = None,
+        from_checkpoint: bool = False,
+        error: Optional[str] = None
+    ):
+        """Store a stage's outcome, wall time and output row count"""
+        finished_at = datetime.utcnow()
+        self.db.add(PipelineStageRun(
+            run_id=run.id,
+            stage=name,
+            status=status,
+            started_at=started_at or finished_at,
+            finished_at=finished_at,
+            duration_seconds=round((finished_at - started_at).total_seconds(), 3) if started_at else 0.0,
+            rows=sum(len(frame) for frame in outputs.values()) if outputs is not None else None,
+            from_checkpoint=from_checkpoint,
+            error=error,
+        ))
+        self.db.commit()
+
+    def _check_graph(self):
+        """Validate dependencies and reject cycles"""
+        for stage in self.stages.values():
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {sorted(unknown)}")
+
+        resolved = set()
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if set(stage.depends_on) <= resolved]
+            if not ready:
+                raise ValueError(f"Stages {sorted(remaining)} form a dependency cycle")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+
+
+def _execute_stage(stage: Stage, inputs: Dict[str, Outputs], stage_dir: Path) -> Outputs:
+    """Run a stage in a worker thread and checkpoint its outputs"""
+    logger.info("Stage %s started", stage.name)
+    outputs = stage.run(inputs)
+    save_outputs(stage_dir, outputs)
+    logger.info("Stage %s finished", stage.name)
+    return outputs
+
+
+def save_outputs(stage_dir: Path, outputs: Outputs):
+    """
+    Write a stage's output frames as Parquet files
+
+    The success marker is written last, so a stage interrupted while
+    saving is executed again on resume.
+
+    Args:
+        stage_dir: Checkpoint directory of the stage
+        outputs: Output frames by name
+    """
+    if stage_dir.exists():
+        shutil.rmtree(stage_dir)
+    stage_dir.mkdir(parents=True)
+
+    for name, frame in outputs.items():
+        frame.to_parquet(stage_dir / f"{name}.parquet", index=False)
+
+    (stage_dir / SUCCESS_MARKER).touch()
+
+
+def load_outputs(stage_dir: Path) -> Outputs:
+    """
+    Read a checkpointed stage's output frames
+
+    Args:
+        stage_dir: Checkpoint directory of the stage
+
+    Returns:
+        Output frames by name
+    """
+    return {path.stem: pd.read_parquet(path) for path in sorted(stage_dir.glob("*.parquet"))}
+
+
+def _path_name(stage_name: str) -> str:
+    """Directory name for a stage, e.g. "fetch:World Bank" -> "fetch-World_Bank" """
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", stage_name.replace(":", "-"))
@@ -0,0 +1,182 @@
+"""
+Data Update Scheduler
+Runs incremental refreshes per data source on DATA_UPDATE_CRON
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from dateutil.relativedelta import relativedelta
+
+from app.core.config import settings
+from app.db.session import PipelineSessionLocal
+from app.models.indicator import Indicator
+from app.services.jobs import (
+    REFRESH_STAGES,
+    Job,
+    PipelineBusyError,
+    job_runner,
+    pipeline_lock,
+    run_refresh_stages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Months between fetches by Indicator.frequency (unknown: monthly)
+CADENCE_MONTHS = {
+    "monthly": 1,
+    "quarterly": 3,
+    "annual": 12,
+}
+
+# A fetch counts as due this much before its cadence has fully elapsed,
+# so a monthly cron run is not missed because the last fetch ran later in the day
+DUE_SLACK = timedelta(days=3)
+
+
+def indicator_due(indicator: Indicator, now: datetime) -> bool:
+    """
+    Check whether an indicator's release cadence calls for a new fetch
+
+    Args:
+        indicator: Indicator model
+        now: Current time (UTC)
+
+    Returns:
+        True if it was never fetched or its cadence has elapsed
+    """
+    if indicator.last_fetched_at is None:
+        return True
+
+    months = CADENCE_MONTHS.get(indicator.frequency, 1)
+    return indicator.last_fetched_at + relativedelta(months=months) - DUE_SLACK <= now
+
+
+def staggered_crontab(crontab: str, offset_minutes: int) -> str:
+    """
+    Shift a crontab expression by a number of minutes
+
+    Only fixed minute and hour fields can be shifted (wrapping past
+    midnight is not supported); other expressions are returned unchanged.
+
+    Args:
+        crontab: Five-field crontab expression
+        offset_minutes: Minutes to add
+
+    Returns:
+        Shifted crontab expression
+    """
+    fields = crontab.split()
+    if len(fields) != 5 or not (fields[0].isdigit() and fields[1].isdigit()):
+        logger.warning("Cannot stagger cron %r; sources share its start time", crontab)
+        return crontab
+
+    total = int(fields[1]) * 60 + int(fields[0]) + offset_minutes
+    if total >= 24 * 60:
+        logger.warning("Staggered cron %r passes midnight; sources share its start time", crontab)
+        return crontab
+
+    hour, minute = divmod(total, 60)
+    return " ".join([str(minute), str(hour), *fields[2:]])
+
+
+def indicator_sources() -> List[str]:
+    """Distinct indicator sources, in a stable order"""
+    db = PipelineSessionLocal()
+    try:
+        rows = db.query(Indicator.source).filter(Indicator.source.isnot(None)).distinct().all()
+        return sorted(source for source, in rows)
+    finally:
+        db.close()
+
+
+def run_source_refresh(source: str, job: Job):
+    """
+    Incrementally refresh the due indicators of one source
+
+    Waits up to SCHEDULER_LOCK_WAIT_SECONDS for a running pipeline (e.g. the
+    previous source) to finish. Due indicators are selected after taking the
+    lock, so a worker that waited does not refetch what another worker
+    just fetched.
+
+    Args:
+        source: Indicator source, e.g. "IMF"
+        job: Job receiving stage and progress updates
+
+    Raises:
+        PipelineBusyError: If the pipeline lock could not be taken in time
+    """
+    with pipeline_lock(wait_seconds=settings.SCHEDULER_LOCK_WAIT_SECONDS) as acquired:
+        if not acquired:
+            raise PipelineBusyError("Another pipeline run holds the lock")
+
+        db = PipelineSessionLocal()
+        try:
+            now = datetime.utcnow()
+            indicators = [
+                indicator
+                for indicator in db.query(Indicator).filter(Indicator.source == source).all()
+                if indicator_due(indicator, now)
+            ]
+            job.result = {
+                "source": source,
+                "indicators": [indicator.code for indicator in indicators],
+            }
+
+            if not indicators:
+                logger.info("No %s indicators due", source)
+                return
+
+            run_refresh_stages(job, db, indicators, incremental=True)
+        finally:
+            db.close()
+
+
+async def refresh_source(source: str):
+    """Scheduled job: queue an incremental refresh of one source"""
+    job, created = job_runner.submit(
+        f"refresh:{source}",
+        REFRESH_STAGES,
+        lambda job: run_source_refresh(source, job)
+    )
+    if not created:
+        logger.info("Refresh of %s still running (job %s)", source, job.id)
+
+
+def create_scheduler(sources: List[str]) -> AsyncIOScheduler:
+    """
+    Create the data update scheduler
+
+    Each source gets its own DATA_UPDATE_CRON job, shifted by
+    SCHEDULER_STAGGER_MINUTES per source so the external APIs are not hit
+    at once. Runs of a source never overlap (max_instances=1), missed runs
+    are coalesced into one, and the pipeline lock keeps different sources
+    (and other workers) from running at the same time.
+
+    Args:
+        sources: Indicator sources to schedule
+
+    Returns:
+        Scheduler (not started)
+    """
+    scheduler = AsyncIOScheduler(timezone="UTC")
+
+    for position, source in enumerate(sources):
+        crontab = staggered_crontab(
+            settings.DATA_UPDATE_CRON,
+            position * settings.SCHEDULER_STAGGER_MINUTES
+        )
+        scheduler.add_job(
+            refresh_source,
+            CronTrigger.from_crontab(crontab, timezone="UTC"),
+            args=[source],
+            id=f"refresh:{source}",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600
+        )
+        logger.info("Scheduled %s refresh at %r", source, crontab)
+
+    return scheduler
@@ -0,0 +1,179 @@
+"""
+Shared Score Snapshot
+Publishes the score history arrays as memory-mapped files shared by all
+API worker processes on a host
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from app.services.history_store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+# Snapshot directories kept (older ones are removed by the next writer)
+RETAINED_SNAPSHOTS = 2
+
+# How long a worker waits for another worker to finish writing a snapshot
+WRITE_WAIT_SECONDS = 30.0
+WRITE_POLL_SECONDS = 0.05
+
+
+def write_history_snapshot(store: HistoryStore, directory: Path) -> Path:
+    """
+    Write a HistoryStore as one .npy file per array
+
+    Files are written to a temporary directory that is renamed into place,
+    so readers never see a partial snapshot.
+
+    Args:
+        store: Store to publish
+        directory: Snapshot root directory
+
+    Returns:
+        Path of the published snapshot directory
+    """
+    final = directory / store.version
+    staging = directory / f".{store.version}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    arrays = {
+        "offsets": store.offsets,
+        "dates": store.dates,
+        "ranks": store.ranks,
+        "classifications": store.classifications,
+        **{f"score.{name}": values for name, values in store.scores.items()},
+        **{f"pillar.{name}": values for name, values in store.pillars.items()},
+        **{f"as_of.{name}": values for name, values in store.pillar_as_of.items()},
+        **{f"stale.{name}": values for name, values in store.pillar_stale.items()},
+    }
+    for name, values in arrays.items():
+        np.save(staging / f"{name}.npy", np.ascontiguousarray(values))
+
+    meta = {
+        "version": store.version,
+        "names": store.names,
+        "codes": store.codes,
+        "classification_labels": store.classification_labels,
+        "score_series": list(store.scores),
+        "pillar_names": list(store.pillars),
+        "slow_pillar_names": list(store.pillar_as_of),
+    }
+    (staging / META_FILE).write_text(json.dumps(meta))
+
+    os.rename(staging, final)
+    _remove_old_snapshots(directory)
+
+    return final
+
+
+def map_history_snapshot(path: Path) -> HistoryStore:
+    """
+    Map a published snapshot read-only
+
+    The arrays are zero-copy views of the files, so every worker on the
+    host shares the same page cache memory.
+
+    Args:
+        path: Snapshot directory written by write_history_snapshot
+
+    Returns:
+        HistoryStore backed by the mapped files
+    """
+    meta = json.loads((path / META_FILE).read_text())
+    # Snapshots written before pillar vintages were kept have none
+    slow_pillar_names = meta.get("slow_pillar_names", [])
+
+    def load(name: str) -> np.ndarray:
+        # Plain ndarray view of the memmap (orjson does not accept the subclass)
+        return np.asarray(np.load(path / f"{name}.npy", mmap_mode="r"))
+
+    return HistoryStore(
+        version=meta["version"],
+        names=meta["names"],
+        codes=meta["codes"],
+        offsets=load("offsets"),
+        dates=load("dates"),
+        scores={name: load(f"score.{name}") for name in meta["score_series"]},
+        ranks=load("ranks"),
+        classifications=load("classifications"),
+        classification_labels=meta["classification_labels"],
+        pillars={name: load(f"pillar.{name}") for name in meta["pillar_names"]},
+        pillar_as_of={name: load(f"as_of.{name}") for name in slow_pillar_names},
+        pillar_stale={name: load(f"stale.{name}") for name in slow_pillar_names}
+    )
+
+
+async def load_shared_history_store(
+    directory: Path,
+    version: str,
+    build: Callable[[], Awaitable[HistoryStore]]
+) -> HistoryStore:
+    """
+    Map the shared snapshot for a version, publishing it first if needed
+
+    The first worker to take the directory lock builds the store from
+    the database and writes it; the others wait for the snapshot to appear
+    and map it. If it does not appear in time, the worker builds a private
+    copy.
+
+    Args:
+        directory: Snapshot root directory
+        version: Data version
+        build: Coroutine function loading the store from the database
+
+    Returns:
+        HistoryStore
+    """
+    final = directory / version
+    directory.mkdir(parents=True, exist_ok=True)
+    waited = 0.0
+
+    while waited < WRITE_WAIT_SECONDS:
+        if (final / META_FILE).exists():
+            return await asyncio.to_thread(map_history_snapshot, final)
+
+        with open(directory / LOCK_FILE, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is writing a snapshot
+                pass
+            else:
+                try:
+                    if not (final / META_FILE).exists():
+                        store = await build()
+                        await asyncio.to_thread(write_history_snapshot, store, directory)
+                        logger.info("Published shared score history %s", version)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                continue
+
+        await asyncio.sleep(WRITE_POLL_SECONDS)
+        waited += WRITE_POLL_SECONDS
+
+    logger.warning("Shared score history %s not published in time; loading a private copy", version)
+    return await build()
+
+
+def _remove_old_snapshots(directory: Path):
+    """Remove all but the newest RETAINED_SNAPSHOTS snapshot directories"""
+    snapshots = sorted(
+        (path for path in directory.iterdir() if path.is_dir() and not path.name.startswith(".")),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    # Workers still mapping a removed snapshot keep their mapping until they remap
+    for path in snapshots[RETAINED_SNAPSHOTS:]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,68 @@
+"""
+Data Snapshot Service
+Publishes and reads the data version used to key API response caches
+"""
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.momentum import MomentumScore
+from app.models.snapshot import DataSnapshot, format_data_version
+from app.services.leaderboard import store_leaderboards
+from app.services.map_payload import store_map_payloads
+from app.services.notifications import notify_data_version
+
+
+def publish_snapshot(db: Session) -> DataSnapshot:
+    """
+    Record a new data snapshot at the end of a pipeline run
+
+    Publishing a snapshot changes the data version, which invalidates
+    every cached API response keyed on the previous version. The
+    pre-compressed map payloads and the top-k leaderboards are written in
+    the same transaction, so a version is never visible without them. On Postgres, API workers
+    are notified of the new version when the transaction commits.
+
+    Args:
+        db: Database session
+
+    Returns:
+        The new DataSnapshot
+    """
+    score_date = db.query(func.max(MomentumScore.date)).scalar()
+
+    snapshot = DataSnapshot(score_date=score_date)
+    db.add(snapshot)
+    db.flush()
+
+    store_map_payloads(db, snapshot)
+    store_leaderboards(db, snapshot)
+    notify_data_version(db, snapshot.version)
+
+    db.commit()
+    db.refresh(snapshot)
+
+    return snapshot
+
+
+async def get_data_version(db: AsyncSession) -> str:
+    """
+    Get the current data version
+
+    Args:
+        db: Async database session
+
+    Returns:
+        Version string of the latest snapshot, or one derived from the
+        latest score date if no snapshot has been published yet
+    """
+    result = await db.execute(
+        select(DataSnapshot).order_by(desc(DataSnapshot.id)).limit(1)
+    )
+    snapshot = result.scalars().first()
+
+    if snapshot:
+        return snapshot.version
+
+    latest_date = await db.scalar(select(func.max(MomentumScore.date)))
+
+    return format_data_version(latest_date, 0)
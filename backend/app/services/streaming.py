@@ -0,0 +1,342 @@
+"""
+Streaming Ingest
+Overlaps fetching, momentum calculation and database writes through bounded
+queues, with a single writer upserting indicator values in batches
+"""
+import io
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+import pandas as pd
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from app.models.indicator import IndicatorValue
+
+logger = logging.getLogger(__name__)
+
+Task = TypeVar("Task")
+
+# Columns written by the ingest, in COPY order
+VALUE_COLUMNS = ["country_code", "indicator_id", "date", "raw_value", "calculated_value"]
+
+# Ends a worker's input stream
+_DONE = object()
+
+# How often blocked queue operations re-check for an aborted run
+_POLL_SECONDS = 0.5
+
+
+@dataclass
+class StreamStats:
+    """
+    Outcome of a streaming run
+
+    The busy times are summed over each stage's workers; when the stages
+    overlap, wall_seconds approaches the largest of them rather than
+    their sum.
+    """
+    series: int = 0
+    failed: int = 0
+    rows: int = 0
+    batches: int = 0
+    fetch_seconds: float = 0.0
+    transform_seconds: float = 0.0
+    write_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+
+class StreamingPipeline(Generic[Task]):
+    """
+    Fetch, transform and write stages connected by bounded queues
+
+    Fetch workers (I/O bound) download one series per task; transform
+    workers turn a series into rows; one writer collects rows and flushes
+    a batch once it holds batch_rows rows or its oldest row has waited
+    flush_seconds. When a downstream stage falls behind, the full queue
+    blocks the stage feeding it, so at most queue_size series and
+    queue_size row lists (plus one batch) are held in memory.
+
+    A task that fails to fetch or transform is logged and counted; a
+    failed write aborts the run and is re-raised.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Task], Optional[pd.DataFrame]],
+        transform: Callable[[Task, pd.DataFrame], List[dict]],
+        write: Callable[[List[dict]], None],
+        fetch_workers: int,
+        transform_workers: int,
+        queue_size: int,
+        batch_rows: int,
+        flush_seconds: float,
+        progress: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            fetch: Downloads a task's series (None or empty: nothing to store)
+            transform: Converts a fetched series into rows to write
+            write: Stores a batch of rows
+            fetch_workers: Concurrent fetches
+            transform_workers: Concurrent transforms
+            queue_size: Items buffered between stages
+            batch_rows: Rows per write
+            flush_seconds: Longest time buffered rows wait for a write
+            progress: Optional callback receiving the completed fraction (0-1)
+        """
+        self.fetch = fetch
+        self.transform = transform
+        self.write = write
+        self.fetch_workers = fetch_workers
+        self.transform_workers = transform_workers
+        self.queue_size = queue_size
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.progress = progress
+
+    def run(self, tasks: Iterable[Task]) -> StreamStats:
+        """
+        Process all tasks
+
+        Args:
+            tasks: Work items, one per series
+
+        Returns:
+            Run statistics
+
+        Raises:
+            Exception: The writer's error, if a write failed
+        """
+        tasks = list(tasks)
+        stats = StreamStats()
+        started = time.perf_counter()
+
+        pending: "queue.Queue" = queue.Queue()
+        fetched: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        transformed: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        for task in tasks:
+            pending.put(task)
+
+        lock = threading.Lock()
+        abort = threading.Event()
+        errors: List[BaseException] = []
+        done = 0
+
+        def put(target: "queue.Queue", item) -> bool:
+            """Blocking put that gives up once the run is aborted"""
+            while not abort.is_set():
+                try:
+                    target.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def finish_task(failed: bool):
+            nonlocal done
+            with lock:
+                done += 1
+                stats.series += 1
+                stats.failed += failed
+                if self.progress:
+                    self.progress(done / len(tasks))
+
+        def fetch_worker():
+            while not abort.is_set():
+                try:
+                    task = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                tick = time.perf_counter()
+                try:
+                    df = self.fetch(task)
+                except Exception as e:
+                    logger.warning("Fetching %s failed: %s", task, e)
+                    df, failed = None, True
+                else:
+                    failed = False
+                with lock:
+                    stats.fetch_seconds += time.perf_counter() - tick
+
+                if df is None or df.empty:
+                    finish_task(failed)
+                elif not put(fetched, (task, df)):
+                    return
+
+        def transform_worker():
+            while True:
+                try:
+                    item = fetched.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    if abort.is_set():
+                        return
+                    continue
+                if item is _DONE:
+                    return
+
+                task, df = item
+                tick = time.perf_counter()
+                try:
+                    rows = self.transform(task, df)
+                except Exception as e:
+                    logger.warning("Transforming %s failed: %s", task, e)
+                    rows, failed = [], True
+                else:
+                    failed = False
+                with lock:
+                    stats.transform_seconds += time.perf_counter() - tick
+
+                if rows and not put(transformed, rows):
+                    return
+                finish_task(failed)
+
+        def writer():
+            buffer: List[dict] = []
+            oldest: Optional[float] = None
+
+            def flush():
+                nonlocal buffer, oldest
+                tick = time.perf_counter()
+                self.write(buffer)
+                stats.write_seconds += time.perf_counter() - tick
+                stats.rows += len(buffer)
+                stats.batches += 1
+                buffer, oldest = [], None
+
+            try:
+                while True:
+                    timeout = None if oldest is None else max(0.0, oldest + self.flush_seconds - time.monotonic())
+                    try:
+                        item = transformed.get(timeout=timeout)
+                    except queue.Empty:
+                        flush()
+                        continue
+
+                    if item is _DONE:
+                        if buffer:
+                            flush()
+                        return
+
+                    if oldest is None:
+                        oldest = time.monotonic()
+                    buffer.extend(item)
+                    if len(buffer) >= self.batch_rows:
+                        flush()
+            except BaseException as e:
+                errors.append(e)
+                abort.set()
+
+        fetchers = [
+            threading.Thread(target=fetch_worker, name=f"cmi-fetch-{i}", daemon=True)
+            for i in range(min(self.fetch_workers, max(len(tasks), 1)))
+        ]
+        transformers = [
+            threading.Thread(target=transform_worker, name=f"cmi-transform-{i}", daemon=True)
+            for i in range(self.transform_workers)
+        ]
+        writer_thread = threading.Thread(target=writer, name="cmi-writer", daemon=True)
+
+        for thread in fetchers + transformers + [writer_thread]:
+            thread.start()
+
+        for thread in fetchers:
+            thread.join()
+        for _ in transformers:
+            put(fetched, _DONE)
+        for thread in transformers:
+            thread.join()
+        put(transformed, _DONE)
+        writer_thread.join()
+
+        stats.wall_seconds = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+        return stats
+
+
+def upsert_indicator_values(engine: Engine, rows: List[dict]):
+    """
+    Insert or update a batch of indicator values
+
+    On Postgres the batch is loaded with COPY into a temporary staging
+    table and merged with INSERT ... ON CONFLICT; SQLite uses
+    INSERT ... ON CONFLICT directly. Both rely on the unique
+    (country_code, indicator_id, date) index. Percentile ranks of
+    existing rows are kept.
+
+    Args:
+        engine: Sync engine
+        rows: Dictionaries with the VALUE_COLUMNS keys
+    """
+    # A statement may not update the same row twice: the last value wins
+    unique: Dict[Tuple, dict] = {
+        (row["country_code"], row["indicator_id"], row["date"]): row for row in rows
+    }
+    rows = list(unique.values())
+    if not rows:
+        return
+
+    if engine.dialect.name == "postgresql":
+        _copy_upsert(engine, rows)
+    else:
+        _insert_upsert(engine, rows)
+
+
+def _copy_upsert(engine: Engine, rows: List[dict]):
+    """Upsert through COPY into a staging table (Postgres)"""
+    buffer = io.StringIO()
+    pd.DataFrame(rows, columns=VALUE_COLUMNS).to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+
+    columns = ", ".join(VALUE_COLUMNS)
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS indicator_values_stage ("
+                "country_code varchar(3), indicator_id integer, date timestamp, "
+                "raw_value double precision, calculated_value double precision"
+                ") ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(f"COPY indicator_values_stage ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                f"INSERT INTO indicator_values ({columns}, is_estimate, created_at, updated_at) "
+                f"SELECT {columns}, false, timezone('utc', now()), timezone('utc', now()) "
+                "FROM indicator_values_stage "
+                "ON CONFLICT (country_code, indicator_id, date) DO UPDATE SET "
+                "raw_value = EXCLUDED.raw_value, "
+                "calculated_value = EXCLUDED.calculated_value, "
+                "updated_at = EXCLUDED.updated_at"
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _insert_upsert(engine: Engine, rows: List[dict]):
+    """Upsert with INSERT ... ON CONFLICT (SQLite)"""
+    now = datetime.utcnow()
+    stmt = sqlite_insert(IndicatorValue.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["country_code", "indicator_id", "date"],
+        set_={
+            "raw_value": stmt.excluded.raw_value,
+            "calculated_value": stmt.excluded.calculated_value,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+
+    # Executed as multi-row statements within SQLite's parameter limit
+    with engine.begin() as conn:
+        conn.execute(stmt, [
+            {**row, "is_estimate": False, "created_at": now, "updated_at": now} for row in rows
+        ])
@@ -191,3 +191,14 @@ COUNTRY_COORDINATES = {
     'NGA': (9.08, 8.68),
     'KEN': (-0.02, 37.91),
 }
+
+# Map colors by momentum classification
+CLASSIFICATION_COLORS = {
+    'Strongly Improving': '#2E7D32',  # Dark green
+    'Improving': '#66BB6A',  # Green
+    'Neutral': '#FDD835',  # Yellow
+    'Deteriorating': '#FB8C00',  # Orange
+    'Strongly Deteriorating': '#D32F2F',  # Red
+}
+
+DEFAULT_CLASSIFICATION_COLOR = '#9E9E9E'  # Gray
@@ -0,0 +1,22 @@
+"""
+Query Parameter Helpers
+"""
+from typing import List, Optional
+
+
+def split_codes(value: Optional[str], upper: bool = True) -> List[str]:
+    """
+    Split a comma-separated list of codes
+
+    Args:
+        value: Raw parameter value, e.g. "usa, DEU"
+        upper: Upper-case each code (country codes)
+
+    Returns:
+        List of non-empty codes
+    """
+    if not value:
+        return []
+
+    codes = [code.strip() for code in value.split(",") if code.strip()]
+    return [code.upper() for code in codes] if upper else codes
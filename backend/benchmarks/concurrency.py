@@ -0,0 +1,171 @@
+"""
+API Concurrency Benchmark
+Measures latency percentiles of the read endpoints under many concurrent clients
+
+Usage (against a running API):
+    uvicorn app.main:app --workers 1 &
+    python benchmarks/concurrency.py --clients 200 --output after.json
+
+To compare against the synchronous session layer, run the same command
+against a server started from the previous revision and save it as
+before.json, then:
+    python benchmarks/concurrency.py --clients 200 --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+DEFAULT_ENDPOINTS = [
+    "/api/v1/momentum/latest",
+    "/api/v1/momentum/leaderboard?period=3m",
+    "/api/v1/momentum/map-data",
+    "/api/v1/countries/",
+    "/api/v1/countries/USA",
+    "/api/v1/indicators/USA/latest",
+]
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    endpoints: List[str],
+    requests_per_client: int,
+    offset: int,
+    latencies: List[float],
+    errors: List[str]
+):
+    """
+    Issue requests sequentially from a single simulated client
+
+    Args:
+        client: Shared HTTP client
+        endpoints: Endpoint paths to cycle through
+        requests_per_client: Number of requests this client sends
+        offset: Starting position in the endpoint list
+        latencies: List collecting request latencies (seconds)
+        errors: List collecting error descriptions
+    """
+    for i in range(requests_per_client):
+        path = endpoints[(offset + i) % len(endpoints)]
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(f"{path}: HTTP {response.status_code}")
+        except httpx.HTTPError as e:
+            errors.append(f"{path}: {e}")
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_benchmark(
+    base_url: str,
+    clients: int,
+    requests_per_client: int,
+    endpoints: List[str]
+) -> Dict:
+    """
+    Run the concurrency benchmark
+
+    Args:
+        base_url: API base URL
+        clients: Number of concurrent clients
+        requests_per_client: Requests issued by each client
+        endpoints: Endpoint paths to exercise
+
+    Returns:
+        Dictionary with latency percentiles and throughput
+    """
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # Warm up connections and caches
+        await asyncio.gather(*(client.get(path) for path in endpoints))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(client, endpoints, requests_per_client, i, latencies, errors)
+            for i in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+    values = np.array(latencies) * 1000
+
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "max_ms": round(float(values.max()), 2),
+    }
+
+
+def print_results(results: Dict, baseline: Optional[Dict] = None):
+    """
+    Print benchmark results, optionally next to a baseline run
+
+    Args:
+        results: Results of the current run
+        baseline: Results of a previous run to compare against
+    """
+    print(f"\n{'metric':<16}{'current':>12}", end="")
+    print(f"{'baseline':>12}{'change':>10}" if baseline else "")
+
+    for key in ["requests_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms", "errors"]:
+        print(f"{key:<16}{results[key]:>12}", end="")
+        if baseline:
+            before = baseline.get(key)
+            change = f"{(results[key] - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{before:>12}{change:>10}")
+        else:
+            print()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="API concurrency benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="Endpoint path to exercise (repeatable)")
+    parser.add_argument("--output", type=Path, help="Write results to a JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or DEFAULT_ENDPOINTS
+
+    print(f"Running {args.clients} concurrent clients x {args.requests} requests "
+          f"against {args.base_url}")
+
+    results = asyncio.run(run_benchmark(
+        args.base_url,
+        args.clients,
+        args.requests,
+        endpoints
+    ))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if results["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
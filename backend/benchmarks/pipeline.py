@@ -0,0 +1,570 @@
+"""
+Pipeline Benchmark
+Times the scoring pipeline and the read API on a synthetic country panel
+
+Runs fully in-process against a temporary SQLite database (requires aiosqlite):
+    python benchmarks/pipeline.py --countries 250 --indicators 100 --months 360 --output baseline.json
+
+After a change, run the same command with --compare; stages or endpoints
+slower than the baseline by more than --threshold are flagged and the exit
+status is 1:
+    python benchmarks/pipeline.py --countries 250 --indicators 100 --months 360 --compare baseline.json
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import platform
+import string
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Point the app at a throwaway database before it is imported; the benchmark
+# drops and recreates all tables, so it never uses a configured database
+_DB_PATH = Path(tempfile.mkdtemp()) / "pipeline_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["DATABASE_URL_ASYNC"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import Base, PipelineSessionLocal, pipeline_engine
+from app.main import app
+from app.models import Country, Indicator
+from app.services.calculators.pillar import PillarCalculator
+from app.services.snapshot import publish_snapshot
+from app.services.streaming import VALUE_COLUMNS, upsert_indicator_values
+from app.utils.constants import INDICATORS, MVP_COUNTRIES
+from scripts.calculate_scores import ScoreCalculationPipeline
+from scripts.fetch_data import DataFetchOrchestrator
+
+# Months between observations of each frequency
+FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3, "annual": 12}
+
+DEFAULT_FREQUENCY_MIX = "monthly=0.6,quarterly=0.25,annual=0.15"
+
+# Calculation methods given to synthetic indicators
+CALCULATION_METHODS = ["yoy_acceleration", "pct_change_6m", "pct_change_12m", "absolute_change_12m", "raw_value"]
+
+# Read endpoints timed through the ASGI app ({country}: first country)
+API_ENDPOINTS = [
+    "/momentum/latest",
+    "/momentum/leaderboard?period=3m",
+    "/momentum/map-data",
+    "/momentum/history?codes={country}",
+    "/countries/",
+    "/countries/{country}",
+    "/countries/{country}/momentum-history",
+    "/indicators/{country}/latest",
+    "/dashboard/bootstrap",
+]
+
+# Last month of the synthetic panel (fixed so runs are comparable)
+PANEL_END = pd.Timestamp("2025-12-31")
+
+# Timings below this are too noisy to flag as regressions
+NOISE_FLOOR_SECONDS = 0.005
+
+
+@dataclass
+class Panel:
+    """Synthetic country panel"""
+    countries: List[str]
+    indicators: List[dict]
+    values: pd.DataFrame  # country_code, indicator_code, date, value
+
+
+def parse_frequency_mix(text: str) -> Dict[str, float]:
+    """
+    Parse a frequency mix such as "monthly=0.6,quarterly=0.25,annual=0.15"
+
+    Args:
+        text: Comma-separated frequency=share pairs
+
+    Returns:
+        Shares by frequency, normalized to sum to 1
+
+    Raises:
+        argparse.ArgumentTypeError: If a frequency or share is invalid
+    """
+    mix = {}
+    for part in text.split(","):
+        frequency, _, share = part.partition("=")
+        frequency = frequency.strip()
+        if frequency not in FREQUENCY_MONTHS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown frequency {frequency!r} (expected one of {', '.join(FREQUENCY_MONTHS)})"
+            )
+        try:
+            mix[frequency] = float(share)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid share for {frequency}: {share!r}")
+
+    total = sum(mix.values())
+    if total <= 0 or any(share < 0 for share in mix.values()):
+        raise argparse.ArgumentTypeError("Shares must be non-negative with a positive sum")
+    return {frequency: share / total for frequency, share in mix.items()}
+
+
+def country_codes(count: int) -> List[str]:
+    """
+    Country codes for the panel: the real ones first, then synthetic
+    three-letter codes
+
+    Args:
+        count: Number of countries
+
+    Returns:
+        List of codes
+    """
+    codes = list(MVP_COUNTRIES[:count])
+    taken = set(codes)
+    for letters in itertools.product(string.ascii_uppercase, repeat=3):
+        if len(codes) >= count:
+            break
+        code = "".join(letters)
+        if code not in taken:
+            codes.append(code)
+    return codes
+
+
+def indicator_definitions(count: int, frequency_mix: Dict[str, float], rng: np.random.Generator) -> List[dict]:
+    """
+    Indicator definitions for the panel
+
+    The real indicators come first and keep their frequencies (so the
+    structural pillar stays annual); the synthetic ones drawn beyond them
+    follow the frequency mix. Synthetic indicators are not weighted into
+    pillars but go through the same transforms, storage and percentiles.
+
+    Args:
+        count: Number of indicators
+        frequency_mix: Shares by frequency
+        rng: Random generator
+
+    Returns:
+        List of dictionaries with the Indicator columns
+    """
+    definitions = [
+        {
+            "code": code,
+            "name": info["name"],
+            "pillar": info["pillar"],
+            "weight_in_pillar": info["weight"],
+            "source": info["source"],
+            "calculation_method": info["calculation"],
+            "frequency": info["frequency"],
+        }
+        for code, info in list(INDICATORS.items())[:count]
+    ]
+
+    pillars = list(PillarCalculator.PILLAR_WEIGHTS)
+    frequencies = list(frequency_mix)
+    for i in range(count - len(definitions)):
+        definitions.append({
+            "code": f"synthetic_{i:03d}",
+            "name": f"Synthetic Indicator {i}",
+            "pillar": pillars[i % len(pillars)],
+            "weight_in_pillar": 0.0,
+            "source": "Synthetic",
+            "calculation_method": CALCULATION_METHODS[i % len(CALCULATION_METHODS)],
+            "frequency": str(rng.choice(frequencies, p=[frequency_mix[f] for f in frequencies])),
+        })
+
+    return definitions
+
+
+def generate_panel(
+    countries: int,
+    indicators: int,
+    months: int,
+    frequency_mix: Dict[str, float],
+    seed: int
+) -> Panel:
+    """
+    Generate a synthetic panel of random-walk observations
+
+    Observations fall on month ends: monthly series every month, quarterly
+    ones at quarter ends and annual ones on Dec 31, as fetched releases are.
+
+    Args:
+        countries: Number of countries
+        indicators: Number of indicators
+        months: Months of history up to PANEL_END
+        frequency_mix: Shares of synthetic indicators by frequency
+        seed: Random seed
+
+    Returns:
+        Generated panel
+    """
+    rng = np.random.default_rng(seed)
+    codes = country_codes(countries)
+    definitions = indicator_definitions(indicators, frequency_mix, rng)
+    month_ends = pd.date_range(end=PANEL_END, periods=months, freq="ME")
+
+    frames = []
+    for definition in definitions:
+        dates = month_ends[month_ends.month % FREQUENCY_MONTHS[definition["frequency"]] == 0]
+        if dates.empty:
+            continue
+
+        levels = rng.uniform(50, 150, (len(codes), 1))
+        walks = levels + rng.normal(0, 1, (len(codes), len(dates))).cumsum(axis=1)
+        frames.append(pd.DataFrame({
+            "country_code": np.repeat(codes, len(dates)),
+            "indicator_code": definition["code"],
+            "date": np.tile(dates.to_numpy(), len(codes)),
+            "value": walks.ravel(),
+        }))
+
+    values = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["country_code", "indicator_code", "date", "value"]
+    )
+    return Panel(countries=codes, indicators=definitions, values=values)
+
+
+@contextmanager
+def timed(timings: Dict[str, float], stage: str):
+    """Record the wall time of a block under timings[stage]"""
+    print(f"  {stage}...", end="", flush=True)
+    start = time.perf_counter()
+    yield
+    timings[stage] = round(time.perf_counter() - start, 4)
+    print(f" {timings[stage]:.3f}s")
+
+
+def seed_database(panel: Panel) -> Dict[str, int]:
+    """
+    Recreate the tables with the panel's countries and indicators
+
+    Args:
+        panel: Generated panel
+
+    Returns:
+        Indicator ids by code
+    """
+    Base.metadata.drop_all(bind=pipeline_engine)
+    Base.metadata.create_all(bind=pipeline_engine)
+
+    now = datetime.utcnow()
+    with pipeline_engine.begin() as conn:
+        conn.execute(insert(Country), [
+            {"code": code, "name": f"Country {code}", "is_active": True, "created_at": now, "updated_at": now}
+            for code in panel.countries
+        ])
+        conn.execute(insert(Indicator), [
+            {**definition, "created_at": now, "updated_at": now} for definition in panel.indicators
+        ])
+
+    db = PipelineSessionLocal()
+    try:
+        return {indicator.code: indicator.id for indicator in db.query(Indicator).all()}
+    finally:
+        db.close()
+
+
+def transform(panel: Panel, indicator_ids: Dict[str, int]) -> pd.DataFrame:
+    """
+    Apply each indicator's momentum transform per country, as the fetch does
+
+    Args:
+        panel: Generated panel
+        indicator_ids: Indicator ids by code
+
+    Returns:
+        DataFrame with the VALUE_COLUMNS columns
+    """
+    db = PipelineSessionLocal()
+    try:
+        with redirect_stdout(io.StringIO()):
+            orchestrator = DataFetchOrchestrator(db)
+        indicators = {indicator.code: indicator for indicator in db.query(Indicator).all()}
+
+        columns = {column: [] for column in VALUE_COLUMNS}
+        observations = panel.values.set_index(["country_code", "indicator_code"])[["date", "value"]]
+        for (country_code, indicator_code), series in observations.groupby(level=[0, 1], sort=False):
+            df = orchestrator.calculate_momentum(indicators[indicator_code], series.reset_index(drop=True))
+            columns["country_code"].append(np.full(len(df), country_code))
+            columns["indicator_id"].append(np.full(len(df), indicator_ids[indicator_code]))
+            columns["date"].append(df["date"].to_numpy())
+            columns["raw_value"].append(df["value"].to_numpy())
+            columns["calculated_value"].append(df["momentum"].to_numpy() if "momentum" in df else np.full(len(df), np.nan))
+    finally:
+        db.close()
+
+    return pd.DataFrame({column: np.concatenate(arrays) for column, arrays in columns.items()})
+
+
+def ingest(rows: pd.DataFrame) -> int:
+    """
+    Store transformed rows with the batched upsert of the streaming fetch
+
+    Args:
+        rows: Output of transform
+
+    Returns:
+        Number of batches written
+    """
+    batch_rows = settings.STREAM_BATCH_ROWS
+    dates = pd.to_datetime(rows["date"]).dt.to_pydatetime()
+    rows = rows.astype(object).where(rows.notna(), None)
+
+    batches = 0
+    for start in range(0, len(rows), batch_rows):
+        batch = rows.iloc[start:start + batch_rows].to_dict("records")
+        for row, date in zip(batch, dates[start:start + batch_rows]):
+            row["date"] = date
+        upsert_indicator_values(pipeline_engine, batch)
+        batches += 1
+    return batches
+
+
+def score(dates: List[datetime], timings: Dict[str, float]):
+    """
+    Time percentiles, pillar aggregation, score persistence and ranking
+
+    Args:
+        dates: Calculation dates, oldest first
+        timings: Dictionary collecting stage timings
+    """
+    for stage in ["percentiles", "pillars", "persistence", "ranking"]:
+        timings[stage] = 0.0
+
+    db = PipelineSessionLocal()
+    try:
+        pipeline = ScoreCalculationPipeline(db)
+        countries = db.query(Country).filter(Country.is_active == True).all()
+
+        # The pipeline's per-country progress output is not part of the timings
+        with redirect_stdout(io.StringIO()):
+            score_dates(pipeline, countries, dates, timings)
+        publish_snapshot(db)
+    finally:
+        db.close()
+
+    for stage in ["percentiles", "pillars", "persistence", "ranking"]:
+        timings[stage] = round(timings[stage], 4)
+        print(f"  {stage}... {timings[stage]:.3f}s")
+
+
+def score_dates(
+    pipeline: ScoreCalculationPipeline,
+    countries: List[Country],
+    dates: List[datetime],
+    timings: Dict[str, float]
+):
+    """Run the timed scoring steps for each date"""
+    for date in dates:
+        start = time.perf_counter()
+        percentile_scores = pipeline.calculate_percentiles(date)
+        timings["percentiles"] += time.perf_counter() - start
+
+        # In-memory aggregation of the fast pillars only
+        start = time.perf_counter()
+        for country in countries:
+            country_percentiles = {
+                code: percentiles[country.code]
+                for code, percentiles in percentile_scores.items()
+                if country.code in percentiles
+            }
+            pillar_scores = pipeline.pillar_calc.calculate_all_pillars(country_percentiles)
+            pipeline.pillar_calc.calculate_momentum_score(pillar_scores)
+        timings["pillars"] += time.perf_counter() - start
+
+        # Per-country reads, slow pillars and writes of the score run
+        start = time.perf_counter()
+        for country in countries:
+            pipeline.calculate_country_scores(country, date, percentile_scores, update_ranks=False)
+        timings["persistence"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        pipeline.update_global_ranks(date)
+        timings["ranking"] += time.perf_counter() - start
+
+
+async def time_endpoints(country: str, requests: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time the read endpoints through an in-process ASGI client
+
+    Args:
+        country: Country code substituted into the paths
+        requests: Sequential requests per endpoint
+
+    Returns:
+        Latency percentiles by endpoint
+    """
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for template in API_ENDPOINTS:
+            path = template.format(country=country)
+            (await client.get(settings.API_V1_PREFIX + path)).raise_for_status()  # warm up
+
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                (await client.get(settings.API_V1_PREFIX + path)).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+            values = np.array(latencies) * 1000
+            results[template] = {
+                "p50_ms": round(float(np.percentile(values, 50)), 2),
+                "p95_ms": round(float(np.percentile(values, 95)), 2),
+            }
+            print(f"  {template}... p50 {results[template]['p50_ms']:.2f}ms")
+
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """Run the benchmark and collect its results"""
+    timings: Dict[str, float] = {}
+
+    print(f"Benchmarking {args.countries} countries x {args.indicators} indicators x {args.months} months")
+
+    with timed(timings, "generate"):
+        panel = generate_panel(args.countries, args.indicators, args.months, args.frequency_mix, args.seed)
+
+    indicator_ids = seed_database(panel)
+
+    with timed(timings, "transform"):
+        rows = transform(panel, indicator_ids)
+
+    with timed(timings, "ingest"):
+        batches = ingest(rows)
+
+    month_ends = pd.date_range(end=PANEL_END, periods=min(args.score_months, args.months), freq="ME")
+    score(list(month_ends.to_pydatetime()), timings)
+
+    api = asyncio.run(time_endpoints(panel.countries[0], args.requests))
+
+    return {
+        "params": {
+            "countries": args.countries,
+            "indicators": args.indicators,
+            "months": args.months,
+            "frequency_mix": args.frequency_mix,
+            "score_months": args.score_months,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": pipeline_engine.dialect.name,
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "rows": {
+            "observations": len(panel.values),
+            "stored": len(rows),
+            "batches": batches,
+        },
+        "stages": timings,
+        "api": api,
+    }
+
+
+def metrics(results: Dict) -> Dict[str, float]:
+    """Flatten results into comparable metrics (seconds)"""
+    flat = {f"stage {name}": seconds for name, seconds in results["stages"].items()}
+    for endpoint, latencies in results["api"].items():
+        flat[f"api {endpoint}"] = latencies["p50_ms"] / 1000
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Print results next to a baseline and find regressions
+
+    A metric regresses when it is slower than the baseline by more than
+    the threshold (and by more than the noise floor).
+
+    Args:
+        results: Results of the current run
+        baseline: Results of a previous run
+        threshold: Allowed slowdown as a fraction (0.2 = 20%)
+
+    Returns:
+        Names of the regressed metrics
+    """
+    if results["params"] != baseline.get("params"):
+        print("\nWarning: parameters differ from the baseline's; timings are not comparable")
+
+    current, before = metrics(results), metrics(baseline)
+    regressions = []
+
+    print(f"\n{'metric':<48}{'current':>12}{'baseline':>12}{'change':>10}")
+    for name, seconds in current.items():
+        previous = before.get(name)
+        if previous is None:
+            print(f"{name:<48}{seconds:>12.4f}{'n/a':>12}{'':>10}")
+            continue
+
+        change = (seconds - previous) / previous if previous else 0.0
+        regressed = change > threshold and seconds - previous > NOISE_FLOOR_SECONDS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<48}{seconds:>12.4f}{previous:>12.4f}{change * 100:>+9.1f}%{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+def print_results(results: Dict):
+    """Print the timings of a run"""
+    print(f"\n{'metric':<48}{'seconds':>12}")
+    for name, seconds in metrics(results).items():
+        print(f"{name:<48}{seconds:>12.4f}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Scoring pipeline and API benchmark")
+    parser.add_argument("--countries", type=int, default=100)
+    parser.add_argument("--indicators", type=int, default=30)
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--frequency-mix", type=parse_frequency_mix, default=parse_frequency_mix(DEFAULT_FREQUENCY_MIX),
+                        help=f"Shares of synthetic indicators by frequency (default: {DEFAULT_FREQUENCY_MIX})")
+    parser.add_argument("--score-months", type=int, default=1,
+                        help="Latest months to calculate scores for")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write results to a JSON baseline file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown flagged as a regression (fraction, default 0.2)")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    regressions = []
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+    else:
+        print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
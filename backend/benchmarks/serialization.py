@@ -0,0 +1,179 @@
+"""
+Serialization Microbenchmark
+Compares requests/sec of the ORM + Pydantic response path against the
+column-tuple + orjson fast path for list endpoints
+
+Runs fully in-process against a temporary SQLite database (requires aiosqlite):
+    python benchmarks/serialization.py --rows 200 10000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Point the app at a throwaway database before it is imported
+_DB_PATH = Path(tempfile.mkdtemp()) / "serialization_bench.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("DATABASE_URL_ASYNC", f"sqlite+aiosqlite:///{_DB_PATH}")
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import Base, engine, get_async_db
+from app.main import app
+from app.models import Country, MomentumScore
+from app.schemas.country import Country as CountrySchema
+from app.schemas.momentum import MomentumScore as MomentumScoreSchema
+
+# Previous implementation: ORM rows validated by response_model
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/momentum/latest", response_model=List[MomentumScoreSchema])
+async def legacy_latest_scores(db: AsyncSession = Depends(get_async_db)):
+    """Latest scores via ORM objects and Pydantic validation"""
+    latest_date = await db.scalar(select(func.max(MomentumScore.date)))
+    result = await db.execute(
+        select(MomentumScore).filter(
+            MomentumScore.date == latest_date
+        ).order_by(MomentumScore.global_rank)
+    )
+    return result.scalars().all()
+
+
+@legacy_app.get("/countries/", response_model=List[CountrySchema])
+async def legacy_countries(limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """Countries via ORM objects and Pydantic validation"""
+    result = await db.execute(
+        select(Country).filter(Country.is_active == True).limit(limit)
+    )
+    return result.scalars().all()
+
+
+def populate(rows: int):
+    """
+    Recreate the tables with `rows` countries and one score each
+
+    Args:
+        rows: Number of countries / score rows
+    """
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    now = datetime.utcnow()
+    codes = [f"C{i:05d}" for i in range(rows)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Country), [
+            {
+                "code": code,
+                "name": f"Country {i}",
+                "region": "Region",
+                "income_group": "High income",
+                "latitude": 10.0,
+                "longitude": 20.0,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, code in enumerate(codes)
+        ])
+        conn.execute(insert(MomentumScore), [
+            {
+                "country_code": code,
+                "date": now,
+                "momentum_score": 50.0 + i % 50,
+                "structural_score": 40.0,
+                "combined_score": 45.0,
+                "classification": "Neutral",
+                "global_rank": i + 1,
+                "score_change_1m": 1.5,
+                "score_change_3m": -2.5,
+                "score_change_6m": 0.5,
+                "created_at": now,
+            }
+            for i, code in enumerate(codes)
+        ])
+
+
+async def requests_per_second(target: FastAPI, path: str, duration: float) -> float:
+    """
+    Issue sequential requests for `duration` seconds
+
+    Args:
+        target: ASGI application
+        path: Request path
+        duration: Measurement window in seconds
+
+    Returns:
+        Requests per second
+    """
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get(path)).raise_for_status()  # warm up
+
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            (await client.get(path)).raise_for_status()
+            count += 1
+
+        return count / (time.perf_counter() - start)
+
+
+async def run(row_counts: List[int], duration: float) -> List[Dict]:
+    """Run all benchmark cases"""
+    prefix = settings.API_V1_PREFIX
+    results = []
+
+    for rows in row_counts:
+        populate(rows)
+
+        cases = [
+            ("/momentum/latest", "/momentum/latest"),
+            ("/countries/", f"/countries/?limit={rows}"),
+        ]
+        for name, path in cases:
+            current = await requests_per_second(legacy_app, path, duration)
+            fast = await requests_per_second(app, prefix + path, duration)
+            results.append({
+                "endpoint": name,
+                "rows": rows,
+                "current_rps": round(current, 1),
+                "fast_rps": round(fast, 1),
+                "speedup": round(fast / current, 2),
+            })
+
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Response serialization microbenchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 10000])
+    parser.add_argument("--duration", type=float, default=3.0,
+                        help="Seconds per measurement")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.rows, args.duration))
+
+    print(f"\n{'endpoint':<20}{'rows':>8}{'current rps':>14}{'fast rps':>12}{'speedup':>10}")
+    for r in results:
+        print(f"{r['endpoint']:<20}{r['rows']:>8}{r['current_rps']:>14}"
+              f"{r['fast_rps']:>12}{r['speedup']:>9}x")
+
+
+if __name__ == "__main__":
+    main()
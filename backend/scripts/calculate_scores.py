@@ -5,17 +5,19 @@ Calculates momentum scores from indicator values
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import SessionLocal
-from app.models import Country, Indicator, IndicatorValue, MomentumScore, PillarScore
+from sqlalchemy import and_, func
+import pandas as pd
+from app.db.session import PipelineSessionLocal
+from app.models import Country, Indicator, IndicatorValue, MomentumScore, PillarScore, SeriesFingerprint
 from app.services.calculators.momentum import MomentumCalculator
 from app.services.calculators.pillar import PillarCalculator
+from app.services.snapshot import publish_snapshot
 
 
 class ScoreCalculationPipeline:
@@ -34,12 +36,26 @@ class ScoreCalculationPipeline:
         self.momentum_calc = MomentumCalculator()
         self.pillar_calc = PillarCalculator()
 
-    def calculate_all_scores(self, calculation_date: datetime = None):
+        # Slow pillar scores by calculation date (see slow_pillar_scores)
+        self._slow_pillars: Dict[datetime, Dict[str, Dict[str, Tuple[float, datetime]]]] = {}
+
+    def calculate_all_scores(
+        self,
+        calculation_date: datetime = None,
+        progress: Optional[Callable[[float], None]] = None,
+        publish: bool = True
+    ):
         """
         Calculate scores for all countries
 
         Args:
             calculation_date: Date to calculate scores for (default: latest)
+            progress: Optional callback receiving the completed fraction (0-1)
+            publish: Publish a data snapshot afterwards (callers that
+                publish separately pass False)
+
+        Returns:
+            The calculation date (None if there is no indicator data)
         """
         if calculation_date is None:
             # Get the most recent date with indicator data
@@ -49,7 +65,7 @@ class ScoreCalculationPipeline:
 
             if not calculation_date:
                 print("No indicator data found")
-                return
+                return None
 
         print(f"\nCalculating scores for date: {calculation_date}")
 
@@ -60,21 +76,51 @@ class ScoreCalculationPipeline:
 
         print(f"Processing {len(countries)} countries...")
 
-        for country in countries:
+        # Percentiles are cross-country, so they are computed once per run
+        percentile_scores = self.calculate_percentiles(calculation_date)
+
+        for done, country in enumerate(countries, 1):
             try:
-                self.calculate_country_scores(country, calculation_date)
+                self.calculate_country_scores(
+                    country,
+                    calculation_date,
+                    percentile_scores,
+                    update_ranks=False
+                )
             except Exception as e:
                 print(f"Error calculating scores for {country.code}: {e}")
 
+            if progress:
+                progress(done / len(countries))
+
+        self.update_global_ranks(calculation_date)
+
+        if publish:
+            # Publish a new data version so API caches are invalidated
+            snapshot = publish_snapshot(self.db)
+            print(f"\nPublished data version {snapshot.version}")
+
         print("\nScore calculation completed!")
 
-    def calculate_country_scores(self, country: Country, date: datetime):
+        return calculation_date
+
+    def calculate_country_scores(
+        self,
+        country: Country,
+        date: datetime,
+        percentile_scores: Optional[Dict[str, Dict[str, float]]] = None,
+        update_ranks: bool = True
+    ):
         """
         Calculate scores for a specific country
 
         Args:
             country: Country model
             date: Calculation date
+            percentile_scores: Cross-country percentiles from
+                calculate_percentiles (default: calculated here)
+            update_ranks: Re-rank all countries after storing the score
+                (batch callers rank once at the end)
         """
         print(f"\n  Processing {country.code} - {country.name}")
 
@@ -86,7 +132,8 @@ class ScoreCalculationPipeline:
             return
 
         # Step 2: Calculate cross-country percentiles
-        percentile_scores = self.calculate_percentiles(date)
+        if percentile_scores is None:
+            percentile_scores = self.calculate_percentiles(date)
 
         # Step 3: Get percentile scores for this country
         country_percentiles = {
@@ -101,13 +148,25 @@ class ScoreCalculationPipeline:
 
         print(f"    Found {len(country_percentiles)} indicator percentiles")
 
-        # Step 4: Calculate pillar scores
+        # Step 4: Calculate pillar scores; slow pillars come from their
+        # latest release instead of the date window
         pillar_scores = self.pillar_calc.calculate_all_pillars(country_percentiles)
+        as_of_dates = {pillar_name: date for pillar_name in pillar_scores}
+
+        for pillar_name, country_scores in self.slow_pillar_scores(date).items():
+            pillar_scores[pillar_name], as_of_dates[pillar_name] = country_scores.get(country.code, (None, None))
 
         # Store pillar scores
         for pillar_name, score in pillar_scores.items():
             if score is not None:
-                self.store_pillar_score(country.code, date, pillar_name, score)
+                self.store_pillar_score(
+                    country.code,
+                    date,
+                    pillar_name,
+                    score,
+                    as_of_dates[pillar_name],
+                    self.pillar_calc.is_stale(pillar_name, as_of_dates[pillar_name], date)
+                )
 
         print(f"    Calculated {len([s for s in pillar_scores.values() if s is not None])} pillar scores")
 
@@ -145,7 +204,8 @@ class ScoreCalculationPipeline:
                 structural_score,
                 combined_score,
                 classification,
-                score_changes
+                score_changes,
+                update_ranks
             )
 
             print(f"    Momentum Score: {momentum_score:.2f} ({classification})")
@@ -189,7 +249,10 @@ class ScoreCalculationPipeline:
 
     def calculate_percentiles(self, date: datetime) -> Dict[str, Dict[str, float]]:
         """
-        Calculate cross-country percentiles for all indicators
+        Calculate cross-country percentiles for the fast-moving indicators
+
+        Indicators of slow pillars are ranked per release by
+        slow_pillar_scores instead.
 
         Args:
             date: Calculation date
@@ -209,7 +272,8 @@ class ScoreCalculationPipeline:
             IndicatorValue.indicator_id == Indicator.id
         ).filter(
             IndicatorValue.date >= date_start,
-            IndicatorValue.date <= date_end
+            IndicatorValue.date <= date_end,
+            Indicator.code.notin_(self.slow_indicator_codes())
         ).all()
 
         # Group by indicator
@@ -222,31 +286,175 @@ class ScoreCalculationPipeline:
             if value.calculated_value is not None:
                 indicator_values[indicator.code][value.country_code] = value.calculated_value
 
+        indicator_ids = {indicator.code: indicator.id for _, indicator in values}
+
         # Calculate percentiles for each indicator
         percentiles = {}
         for indicator_code, country_values in indicator_values.items():
             if len(country_values) >= 3:  # Need at least 3 countries
                 # Create series and calculate percentiles
-                import pandas as pd
                 series = pd.Series(country_values)
                 percentile_series = self.momentum_calc.calculate_percentile_rank(series)
                 percentiles[indicator_code] = percentile_series.to_dict()
 
-                # Update database with percentile ranks
+                # Update database with percentile ranks; the loaded values
+                # are refreshed by the commit, so the session is not
+                # searched for them on every update
                 for country_code, percentile in percentile_series.items():
                     self.db.query(IndicatorValue).filter(
                         IndicatorValue.country_code == country_code,
-                        IndicatorValue.indicator_id == self.db.query(Indicator).filter(
-                            Indicator.code == indicator_code
-                        ).first().id,
+                        IndicatorValue.indicator_id == indicator_ids[indicator_code],
                         IndicatorValue.date >= date_start,
                         IndicatorValue.date <= date_end
-                    ).update({"percentile_rank": percentile})
+                    ).update({"percentile_rank": percentile}, synchronize_session=False)
 
         self.db.commit()
 
         return percentiles
 
+    @staticmethod
+    def slow_indicator_codes() -> List[str]:
+        """Codes of the indicators that make up slow pillars"""
+        return [
+            code
+            for pillar_name in PillarCalculator.SLOW_PILLARS
+            for code in PillarCalculator.INDICATOR_WEIGHTS[pillar_name]
+        ]
+
+    def slow_pillar_scores(self, date: datetime) -> Dict[str, Dict[str, Tuple[float, datetime]]]:
+        """
+        Get the slow pillar scores in effect on a date
+
+        Slow pillars (annual data) are computed once per release and carried
+        forward; results are cached per date.
+
+        Args:
+            date: Calculation date
+
+        Returns:
+            Nested dictionary: {pillar_name: {country_code: (score, as_of_date)}}
+        """
+        if date not in self._slow_pillars:
+            self._slow_pillars[date] = {
+                pillar_name: self.calculate_slow_pillar(pillar_name, date)
+                for pillar_name in PillarCalculator.SLOW_PILLARS
+            }
+        return self._slow_pillars[date]
+
+    def calculate_slow_pillar(self, pillar_name: str, date: datetime) -> Dict[str, Tuple[float, datetime]]:
+        """
+        Score a slow pillar from each country's latest release as of a date
+
+        The latest stored scores of the pillar are carried forward unless a
+        release came into view since they were computed: an observation
+        dated after their date, or a series whose fingerprint changed after
+        them.
+        Otherwise each indicator is ranked across countries on its latest
+        observation up to the date (an as-of lookup, so annual observations
+        dated Dec 31 are found all year).
+
+        Args:
+            pillar_name: Slow pillar name
+            date: Calculation date
+
+        Returns:
+            Dictionary: {country_code: (score, as_of_date)}
+        """
+        codes = list(PillarCalculator.INDICATOR_WEIGHTS[pillar_name])
+
+        previous_date = self.db.query(func.max(PillarScore.date)).filter(
+            PillarScore.pillar_name == pillar_name,
+            PillarScore.date <= date
+        ).scalar()
+        previous = self.db.query(PillarScore).filter(
+            PillarScore.pillar_name == pillar_name,
+            PillarScore.date == previous_date
+        ).all() if previous_date else []
+
+        if previous and all(score.as_of_date is not None for score in previous):
+            computed_at = min(score.created_at for score in previous)
+            new_observation = self.db.query(IndicatorValue.id).join(
+                Indicator,
+                IndicatorValue.indicator_id == Indicator.id
+            ).filter(
+                Indicator.code.in_(codes),
+                IndicatorValue.date > previous_date,
+                IndicatorValue.date <= date
+            ).first()
+            revised = self.db.query(SeriesFingerprint.id).join(
+                Indicator,
+                SeriesFingerprint.indicator_id == Indicator.id
+            ).filter(
+                Indicator.code.in_(codes),
+                SeriesFingerprint.changed_at > computed_at
+            ).first()
+
+            if new_observation is None and revised is None:
+                print(f"    {pillar_name}: carried forward from {previous_date:%Y-%m-%d}")
+                return {score.country_code: (score.raw_score, score.as_of_date) for score in previous}
+
+        print(f"    {pillar_name}: computing from the latest release")
+
+        # Latest observation per country and indicator up to the date
+        latest = self.db.query(
+            IndicatorValue.country_code,
+            IndicatorValue.indicator_id,
+            func.max(IndicatorValue.date).label("date")
+        ).join(
+            Indicator,
+            IndicatorValue.indicator_id == Indicator.id
+        ).filter(
+            Indicator.code.in_(codes),
+            IndicatorValue.date <= date
+        ).group_by(
+            IndicatorValue.country_code,
+            IndicatorValue.indicator_id
+        ).subquery()
+
+        values = self.db.query(IndicatorValue, Indicator.code).join(
+            Indicator,
+            IndicatorValue.indicator_id == Indicator.id
+        ).join(
+            latest,
+            and_(
+                IndicatorValue.country_code == latest.c.country_code,
+                IndicatorValue.indicator_id == latest.c.indicator_id,
+                IndicatorValue.date == latest.c.date
+            )
+        ).all()
+
+        # Rank each indicator across countries
+        by_indicator: Dict[str, Dict[str, IndicatorValue]] = {}
+        for value, code in values:
+            if value.calculated_value is not None:
+                by_indicator.setdefault(code, {})[value.country_code] = value
+
+        country_percentiles: Dict[str, Dict[str, float]] = {}
+        as_of: Dict[str, datetime] = {}
+        for code, country_values in by_indicator.items():
+            if len(country_values) < 3:  # Need at least 3 countries
+                continue
+
+            series = pd.Series({
+                country_code: value.calculated_value
+                for country_code, value in country_values.items()
+            })
+            for country_code, percentile in self.momentum_calc.calculate_percentile_rank(series).items():
+                value = country_values[country_code]
+                value.percentile_rank = percentile
+                country_percentiles.setdefault(country_code, {})[code] = percentile
+                as_of[country_code] = max(as_of.get(country_code, value.date), value.date)
+
+        self.db.commit()
+
+        scores = {}
+        for country_code, percentiles in country_percentiles.items():
+            score = self.pillar_calc.calculate_pillar_score(percentiles, pillar_name)
+            if score is not None:
+                scores[country_code] = (score, as_of[country_code])
+
+        return scores
+
     def calculate_score_changes(
         self,
         country_code: str,
@@ -300,7 +508,9 @@ class ScoreCalculationPipeline:
         country_code: str,
         date: datetime,
         pillar_name: str,
-        score: float
+        score: float,
+        as_of_date: Optional[datetime] = None,
+        is_stale: bool = False
     ):
         """
         Store pillar score in database
@@ -310,7 +520,12 @@ class ScoreCalculationPipeline:
             date: Date
             pillar_name: Pillar name
             score: Score value
+            as_of_date: Latest observation the score is based on (default: date)
+            is_stale: Whether that observation is older than the pillar's limit
         """
+        if as_of_date is None:
+            as_of_date = date
+
         # Check if exists
         existing = self.db.query(PillarScore).filter(
             PillarScore.country_code == country_code,
@@ -321,13 +536,17 @@ class ScoreCalculationPipeline:
         if existing:
             existing.raw_score = score
             existing.percentile_rank = score  # Already a percentile
+            existing.as_of_date = as_of_date
+            existing.is_stale = is_stale
         else:
             pillar_score = PillarScore(
                 country_code=country_code,
                 date=date,
                 pillar_name=pillar_name,
                 raw_score=score,
-                percentile_rank=score
+                percentile_rank=score,
+                as_of_date=as_of_date,
+                is_stale=is_stale
             )
             self.db.add(pillar_score)
 
@@ -341,7 +560,8 @@ class ScoreCalculationPipeline:
         structural_score: float,
         combined_score: float,
         classification: str,
-        score_changes: Dict
+        score_changes: Dict,
+        update_ranks: bool = True
     ):
         """
         Store momentum score in database
@@ -354,6 +574,7 @@ class ScoreCalculationPipeline:
             combined_score: Combined score
             classification: Classification
             score_changes: Dictionary of score changes
+            update_ranks: Update global ranks for the date afterwards
         """
         # Check if exists
         existing = self.db.query(MomentumScore).filter(
@@ -386,7 +607,8 @@ class ScoreCalculationPipeline:
         self.db.commit()
 
         # Update global ranks
-        self.update_global_ranks(date)
+        if update_ranks:
+            self.update_global_ranks(date)
 
     def update_global_ranks(self, date: datetime):
         """
@@ -411,7 +633,7 @@ def main():
     """Main function"""
     print("Starting score calculation pipeline...")
 
-    db = SessionLocal()
+    db = PipelineSessionLocal()
 
     try:
         pipeline = ScoreCalculationPipeline(db)
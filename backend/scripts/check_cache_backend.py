@@ -0,0 +1,109 @@
+"""
+Redis Cache Backend Check
+Exercises the Redis response cache backend against fakeredis (or a real server)
+
+Usage:
+    python scripts/check_cache_backend.py
+    python scripts/check_cache_backend.py --url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.cache import CachedResponse, ResponseCache, make_etag
+from app.core.cache_backends import RedisCacheBackend
+
+
+def check(condition: bool, message: str):
+    """Print a passed check or exit with the failed one"""
+    if not condition:
+        print(f"✗ {message}")
+        sys.exit(1)
+    print(f"✓ {message}")
+
+
+async def check_backend(backend: RedisCacheBackend):
+    """
+    Round trip, miss and expiry through a ResponseCache on the backend
+
+    Entries are stored under the data version "check-1" and removed
+    afterwards, so a shared server is left as it was.
+
+    Args:
+        backend: Backend to check
+    """
+    try:
+        await backend.client.ping()
+    except Exception as e:
+        check(False, f"server is reachable ({e})")
+
+    cache = ResponseCache(backend, ttl_seconds=60)
+    body = b'{"data": [' + b",".join([b'{"score": 50.0}'] * 1000) + b"]}"
+    entry = CachedResponse(body=body, etag=make_etag(body), version="check-1")
+
+    check(await cache.get(("/check",), "check-1") is None, "unknown key is a miss")
+    check(backend.stats.misses == 1, "miss is counted")
+
+    await cache.set(("/check",), entry)
+    stored = await cache.get(("/check",), "check-1")
+    check(stored == entry, "stored entry round-trips (body, ETag, version)")
+    check(backend.stats.hits == 1 and backend.stats.sets == 1, "hit and set are counted")
+    check(backend.stats.bytes_written < len(body), "large body is stored compressed")
+
+    storage_key = cache.storage_key(("/check",), "check-1")
+    try:
+        ttl = await backend.client.ttl(storage_key)
+        check(0 < ttl <= 60, "entry expires after the cache TTL")
+    finally:
+        await backend.client.delete(storage_key)
+
+    check(await cache.get(("/check",), "check-2") is None, "entry is not served for another data version")
+
+
+async def check_errors():
+    """Server errors are logged, counted and treated as misses"""
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    server.connected = False
+    backend = RedisCacheBackend(fakeredis.FakeAsyncRedis(server=server))
+
+    await backend.set("cmi:response:check", b"body", 60)
+    check(backend.stats.errors == 1 and backend.stats.sets == 0, "failed set is counted as an error")
+
+    check(await backend.get("cmi:response:check") is None, "failed get is a miss")
+    check(backend.stats.errors == 2, "failed get is counted as an error")
+
+
+async def main(url: str = None):
+    """Run the checks against fakeredis or the server at url"""
+    if url:
+        backend = RedisCacheBackend.from_url(url)
+    else:
+        import fakeredis
+
+        backend = RedisCacheBackend(fakeredis.FakeAsyncRedis())
+
+    try:
+        await check_backend(backend)
+    finally:
+        await backend.client.aclose()
+
+    await check_errors()
+    print("\nRedis cache backend checks passed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the Redis response cache backend")
+    parser.add_argument("--url", help="Redis URL to check (default: in-process fakeredis)")
+    args = parser.parse_args()
+
+    # The error checks log expected warnings
+    logging.basicConfig(level=logging.ERROR)
+
+    asyncio.run(main(args.url))
@@ -0,0 +1,54 @@
+"""
+Columnar Panel Export
+Writes the indicator panel or score history to an Arrow IPC stream or Parquet file
+
+Usage:
+    python scripts/export_panel.py --dataset indicator-panel --output panel.parquet
+    python scripts/export_panel.py --dataset score-history --format arrow --output scores.arrows
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import pipeline_engine
+from app.services.columnar import DATASETS, build_table, encode_table
+from app.utils.params import split_codes
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Export the scoring panel in columnar format")
+    parser.add_argument("--dataset", choices=list(DATASETS), default="indicator-panel")
+    parser.add_argument("--format", choices=["arrow", "parquet"],
+                        help="Output format (default: inferred from --output suffix)")
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--start-date", type=datetime.fromisoformat)
+    parser.add_argument("--end-date", type=datetime.fromisoformat)
+    parser.add_argument("--countries", help="Comma-separated country codes")
+    args = parser.parse_args()
+
+    fmt = args.format or ("parquet" if args.output.suffix == ".parquet" else "arrow")
+
+    print(f"Exporting {args.dataset} as {fmt}...")
+    start = time.perf_counter()
+
+    table = build_table(
+        pipeline_engine,
+        args.dataset,
+        args.start_date,
+        args.end_date,
+        split_codes(args.countries)
+    )
+    args.output.write_bytes(encode_table(table, fmt))
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Wrote {table.num_rows} rows to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
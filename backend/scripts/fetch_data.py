@@ -2,21 +2,34 @@
 Data Fetching Script
 Fetches data from all sources and updates database
 """
+import argparse
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Callable, Dict, List, Optional
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import PipelineSessionLocal
 from app.models import Country, Indicator, IndicatorValue
 from app.services.data_fetchers.world_bank import WorldBankFetcher
 from app.services.data_fetchers.fred import FREDFetcher
 from app.services.data_fetchers.imf import IMFFetcher
 from app.services.calculators.momentum import MomentumCalculator
+from app.services.fingerprints import (
+    FingerprintStore,
+    RevisionStats,
+    diff_series,
+    series_hash,
+    stored_series,
+)
+from app.services.streaming import StreamingPipeline, StreamStats, upsert_indicator_values
 from app.core.config import settings
 
 
@@ -44,46 +57,267 @@ class DataFetchOrchestrator:
             print("Warning: FRED API key not configured")
 
         self.calculator = MomentumCalculator()
+        self.fingerprints = FingerprintStore(db)
 
-    def fetch_all_indicators(self):
+        # Revision counts by source of the current fetch
+        self.revisions: Dict[str, RevisionStats] = {}
+        self._revisions_lock = threading.Lock()
+
+    def fetch_all_indicators(
+        self,
+        progress: Optional[Callable[[float], None]] = None,
+        stream: Optional[bool] = None
+    ):
         """
         Fetch all indicators for all active countries
+
+        Args:
+            progress: Optional callback receiving the completed fraction (0-1)
+            stream: Use the streaming mode (default: FETCH_STREAMING)
+
+        Returns:
+            Revision counts by source
+        """
+        return self.fetch_indicators(self.db.query(Indicator).all(), progress=progress, stream=stream)
+
+    def fetch_indicators(
+        self,
+        indicators: List[Indicator],
+        incremental: bool = False,
+        revision_months: int = 12,
+        progress: Optional[Callable[[float], None]] = None,
+        stream: Optional[bool] = None
+    ) -> Dict[str, RevisionStats]:
+        """
+        Fetch indicators for all active countries
+
+        Incremental fetches still download the full window (momentum needs
+        the history) but only store observations from revision_months
+        before the latest stored date, where sources publish revisions.
+        Series whose content is unchanged since they were last stored are
+        skipped; for changed series only new or revised observations are
+        written.
+
+        Args:
+            indicators: Indicators to fetch
+            incremental: Only store recent observations
+            revision_months: Months before the latest stored date that
+                are rewritten in incremental mode
+            progress: Optional callback receiving the completed fraction (0-1)
+            stream: Overlap fetching, momentum calculation and batched
+                writes (default: FETCH_STREAMING)
+
+        Returns:
+            Revision counts by source
         """
+        if stream is None:
+            stream = settings.FETCH_STREAMING
+
+        self.revisions = {}
+        self.fingerprints.load(indicator.id for indicator in indicators)
+
         # Get active countries
         countries = self.db.query(Country).filter(Country.is_active == True).all()
         print(f"Fetching data for {len(countries)} countries")
-
-        # Get all indicators
-        indicators = self.db.query(Indicator).all()
         print(f"Fetching {len(indicators)} indicators")
 
         # Date range (last 5 years)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=5*365)
 
+        if stream:
+            self.stream_indicators(
+                indicators,
+                countries,
+                start_date,
+                end_date,
+                incremental,
+                revision_months,
+                progress
+            )
+            self.print_revisions()
+            return self.revisions
+
+        total = len(indicators) * len(countries)
+        done = 0
+
         # Fetch data for each indicator
         for indicator in indicators:
             print(f"\nFetching {indicator.code} ({indicator.name})...")
 
+            latest_dates = self.latest_dates(indicator) if incremental else {}
+            fetched = False
+
             for country in countries:
+                latest = latest_dates.get(country.code)
+                store_from = latest - relativedelta(months=revision_months) if latest else None
+
                 try:
-                    self.fetch_indicator_for_country(
+                    fetched |= self.fetch_indicator_for_country(
                         country,
                         indicator,
                         start_date,
-                        end_date
+                        end_date,
+                        store_from
                     )
                 except Exception as e:
                     print(f"  Error fetching {indicator.code} for {country.code}: {e}")
 
+                done += 1
+                if progress:
+                    progress(done / total)
+
+            # Failed or unsupported fetches stay due for the next run
+            if fetched:
+                indicator.last_fetched_at = datetime.utcnow()
+            self.db.commit()
+
+        self.print_revisions()
         print("\nData fetching completed!")
+        return self.revisions
+
+    def stream_indicators(
+        self,
+        indicators: List[Indicator],
+        countries: List[Country],
+        start_date: datetime,
+        end_date: datetime,
+        incremental: bool = False,
+        revision_months: int = 12,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> StreamStats:
+        """
+        Fetch indicators with downloads, momentum calculation and writes overlapping
+
+        Series are downloaded concurrently, transformed by a worker pool
+        and upserted in batches by a single writer (COPY on Postgres), see
+        StreamingPipeline. Arguments as for fetch_indicators.
+
+        Returns:
+            Stream statistics
+        """
+        tasks = []
+        for indicator in indicators:
+            if self.fetcher_for(indicator) is None or not indicator.source_series_id:
+                print(f"  No fetcher available for {indicator.code} ({indicator.source})")
+                continue
+
+            latest_dates = self.latest_dates(indicator) if incremental else {}
+            for country in countries:
+                latest = latest_dates.get(country.code)
+                store_from = latest - relativedelta(months=revision_months) if latest else None
+                tasks.append((indicator, country.code, store_from))
+
+        fetched = set()
+
+        def fetch(task):
+            indicator, country_code, _ = task
+            df = self.fetcher_for(indicator).fetch_indicator(
+                country_code,
+                indicator.source_series_id,
+                start_date,
+                end_date
+            )
+            if df is not None and not df.empty:
+                with self._revisions_lock:
+                    fetched.add(indicator.id)
+            return df
+
+        engine = self.db.get_bind()
+        fingerprints = []
+
+        def load_stored(country_code, indicator_id):
+            with engine.connect() as conn:
+                return stored_series(conn, country_code, indicator_id)
+
+        def transform(task, df):
+            indicator, country_code, store_from = task
+            observations = len(df)
+            df, content_hash = self.revised_observations(
+                country_code,
+                indicator,
+                df,
+                store_from,
+                lambda: load_stored(country_code, indicator.id)
+            )
+            if df is None:
+                return []
+
+            if 'momentum' not in df:
+                df = df.assign(momentum=None)
+            rows = [
+                {
+                    "country_code": country_code,
+                    "indicator_id": indicator.id,
+                    "date": date.to_pydatetime(),
+                    "raw_value": _optional_float(value),
+                    "calculated_value": _optional_float(momentum),
+                }
+                for date, value, momentum in zip(pd.to_datetime(df['date']), df['value'], df['momentum'])
+            ]
+
+            # Only once the rows exist: a series whose transform failed
+            # must not hash as unchanged on the next run
+            with self._revisions_lock:
+                fingerprints.append((country_code, indicator.id, content_hash, observations))
+            return rows
+
+        pipeline = StreamingPipeline(
+            fetch,
+            transform,
+            lambda rows: upsert_indicator_values(engine, rows),
+            fetch_workers=settings.STREAM_FETCH_WORKERS,
+            transform_workers=settings.STREAM_TRANSFORM_WORKERS,
+            queue_size=settings.STREAM_QUEUE_SIZE,
+            batch_rows=settings.STREAM_BATCH_ROWS,
+            flush_seconds=settings.STREAM_FLUSH_SECONDS,
+            progress=progress
+        )
+        stats = pipeline.run(tasks)
+
+        # Fingerprints are recorded once their values are written
+        for fingerprint in fingerprints:
+            self.fingerprints.record(*fingerprint)
+        # Failed or unsupported fetches stay due for the next run
+        for indicator in indicators:
+            if indicator.id in fetched:
+                indicator.last_fetched_at = datetime.utcnow()
+        self.db.commit()
+
+        print(
+            f"\nStreamed {stats.series} series ({stats.failed} failed), "
+            f"{stats.rows} rows in {stats.batches} batches, {stats.wall_seconds:.1f}s "
+            f"(busy: fetch {stats.fetch_seconds:.1f}s, transform {stats.transform_seconds:.1f}s, "
+            f"write {stats.write_seconds:.1f}s)"
+        )
+        return stats
+
+    def latest_dates(self, indicator: Indicator) -> Dict[str, datetime]:
+        """
+        Get the latest stored observation date per country for an indicator
+
+        Args:
+            indicator: Indicator model
+
+        Returns:
+            Dictionary of country code to latest date
+        """
+        rows = self.db.query(
+            IndicatorValue.country_code,
+            func.max(IndicatorValue.date)
+        ).filter(
+            IndicatorValue.indicator_id == indicator.id
+        ).group_by(IndicatorValue.country_code).all()
+
+        return dict(rows)
 
     def fetch_indicator_for_country(
         self,
         country: Country,
         indicator: Indicator,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        store_from: Optional[datetime] = None
     ):
         """
         Fetch specific indicator data for a country
@@ -93,18 +327,16 @@ class DataFetchOrchestrator:
             indicator: Indicator model
             start_date: Start date
             end_date: End date
+            store_from: Only store observations from this date
+
+        Returns:
+            True if observations were fetched (the fetchers report errors
+            as empty results)
         """
-        # Select appropriate fetcher
-        fetcher = None
-        if indicator.source == 'World Bank':
-            fetcher = self.wb_fetcher
-        elif indicator.source == 'IMF':
-            fetcher = self.imf_fetcher
-        elif indicator.source == 'FRED' and self.fred_fetcher:
-            fetcher = self.fred_fetcher
-        else:
+        fetcher = self.fetcher_for(indicator)
+        if fetcher is None:
             print(f"  No fetcher available for {indicator.source}")
-            return
+            return False
 
         # Fetch raw data
         # Note: This is a placeholder - actual series IDs need to be mapped
@@ -118,20 +350,135 @@ class DataFetchOrchestrator:
 
             if not df.empty:
                 print(f"  Fetched {len(df)} observations for {country.code}")
-                self.process_and_store(country, indicator, df)
-            else:
-                print(f"  No data available for {country.code}")
+                self.process_and_store(country, indicator, df, store_from)
+                return True
+
+            print(f"  No data available for {country.code}")
+
+        return False
+
+    def fetcher_for(self, indicator: Indicator):
+        """
+        Select the fetcher for an indicator's source
+
+        Args:
+            indicator: Indicator model
+
+        Returns:
+            Fetcher, or None if the source is not supported
+        """
+        if indicator.source == 'World Bank':
+            return self.wb_fetcher
+        elif indicator.source == 'IMF':
+            return self.imf_fetcher
+        elif indicator.source == 'FRED' and self.fred_fetcher:
+            return self.fred_fetcher
+        return None
 
-    def process_and_store(self, country: Country, indicator: Indicator, df):
+    def process_and_store(
+        self,
+        country: Country,
+        indicator: Indicator,
+        df,
+        store_from: Optional[datetime] = None
+    ):
         """
         Process data and store in database
 
+        Unchanged series are skipped; otherwise only new or revised
+        observations are written.
+
         Args:
             country: Country model
             indicator: Indicator model
             df: DataFrame with raw data
+            store_from: Only store observations from this date (momentum
+                is still calculated on the full history)
+        """
+        observations = len(df)
+        df, content_hash = self.revised_observations(
+            country.code,
+            indicator,
+            df,
+            store_from,
+            lambda: stored_series(self.db, country.code, indicator.id)
+        )
+        if df is None:
+            return
+
+        self.fingerprints.record(country.code, indicator.id, content_hash, observations)
+        self.store_values(country.code, indicator.id, df)
+
+    def revised_observations(
+        self,
+        country_code: str,
+        indicator: Indicator,
+        df,
+        store_from: Optional[datetime],
+        load_stored: Callable[[], pd.DataFrame]
+    ):
+        """
+        Process a fetched series down to the observations that need writing
+
+        Unchanged series (same content hash as when last stored) are not
+        processed at all. Otherwise momentum is calculated and the result
+        diffed against the stored values. Counts go to self.revisions;
+        safe to call from worker threads.
+
+        Args:
+            country_code: Country code
+            indicator: Indicator model
+            df: DataFrame with raw data
+            store_from: Only consider observations from this date
+            load_stored: Loads the stored series (see stored_series)
+
+        Returns:
+            Tuple of (new or revised rows with a momentum column, or None
+            if the series is unchanged; content hash)
+        """
+        content_hash = series_hash(df, indicator.calculation_method)
+        unchanged = self.fingerprints.matches(country_code, indicator.id, content_hash)
+
+        if not unchanged:
+            df = self.calculate_momentum(indicator, df)
+            if store_from is not None:
+                df = df[df['date'] >= store_from]
+            df, new, revised = diff_series(df, load_stored())
+
+        with self._revisions_lock:
+            stats = self.revisions.setdefault(indicator.source, RevisionStats())
+            stats.series += 1
+            if unchanged:
+                stats.unchanged += 1
+            else:
+                stats.new_observations += new
+                stats.revised_observations += revised
+
+        return (None if unchanged else df), content_hash
+
+    def print_revisions(self):
+        """Print series and observation revision counts per source"""
+        if not self.revisions:
+            return
+
+        print("\nRevisions by source:")
+        for source, stats in sorted(self.revisions.items()):
+            print(
+                f"  {source}: {stats.changed}/{stats.series} series changed, "
+                f"{stats.new_observations} new and {stats.revised_observations} revised observations"
+            )
+
+    def calculate_momentum(self, indicator: Indicator, df):
+        """
+        Add the momentum column for an indicator's calculation method
+
+        Args:
+            indicator: Indicator model
+            df: DataFrame with date and value columns
+
+        Returns:
+            DataFrame with a momentum column (if the method is known)
         """
-        # Calculate momentum based on calculation method
         if indicator.calculation_method == 'yoy_acceleration':
             df = self.calculator.calculate_yoy_acceleration(df)
         elif indicator.calculation_method == 'pct_change_6m':
@@ -143,12 +490,22 @@ class DataFetchOrchestrator:
         elif indicator.calculation_method == 'raw_value':
             df['momentum'] = df['value']
 
-        # Store in database
+        return df
+
+    def store_values(self, country_code: str, indicator_id: int, df):
+        """
+        Upsert processed observations
+
+        Args:
+            country_code: Country code
+            indicator_id: Indicator id
+            df: DataFrame with date, value and momentum columns
+        """
         for _, row in df.iterrows():
             # Check if record exists
             existing = self.db.query(IndicatorValue).filter(
-                IndicatorValue.country_code == country.code,
-                IndicatorValue.indicator_id == indicator.id,
+                IndicatorValue.country_code == country_code,
+                IndicatorValue.indicator_id == indicator_id,
                 IndicatorValue.date == row['date']
             ).first()
 
@@ -159,8 +516,8 @@ class DataFetchOrchestrator:
             else:
                 # Create new
                 value = IndicatorValue(
-                    country_code=country.code,
-                    indicator_id=indicator.id,
+                    country_code=country_code,
+                    indicator_id=indicator_id,
                     date=row['date'],
                     raw_value=row['value'],
                     calculated_value=row.get('momentum')
@@ -170,15 +527,29 @@ class DataFetchOrchestrator:
         self.db.commit()
 
 
+def _optional_float(value) -> Optional[float]:
+    """Convert a pandas value to float, with NaN as None"""
+    return None if pd.isna(value) else float(value)
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Fetch data from all sources")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=None,
+        help="Overlap downloads, momentum calculation and batched writes"
+    )
+    args = parser.parse_args()
+
     print("Starting data fetch...")
 
-    db = SessionLocal()
+    db = PipelineSessionLocal()
 
     try:
         orchestrator = DataFetchOrchestrator(db)
-        orchestrator.fetch_all_indicators()
+        orchestrator.fetch_all_indicators(stream=args.stream)
 
     except Exception as e:
         print(f"Error: {e}")
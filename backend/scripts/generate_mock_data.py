@@ -11,7 +11,7 @@ import random
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import PipelineSessionLocal
 from app.models import Country, Indicator, IndicatorValue
 
 
@@ -24,7 +24,7 @@ def generate_mock_data(months: int = 24):
     """
     print(f"Generating {months} months of mock data...")
 
-    db = SessionLocal()
+    db = PipelineSessionLocal()
 
     try:
         # Get all countries and indicators
@@ -0,0 +1,40 @@
+"""
+Data Update Scheduler Daemon
+Runs the per-source refresh schedule outside the API (ENABLE_SCHEDULER=False there)
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.services.jobs import job_runner
+from app.services.scheduler import create_scheduler, indicator_sources
+
+
+async def run_scheduler():
+    """Start the scheduler and run until interrupted"""
+    scheduler = create_scheduler(indicator_sources())
+    scheduler.start()
+
+    print(f"Scheduler started ({settings.DATA_UPDATE_CRON}, "
+          f"{settings.SCHEDULER_STAGGER_MINUTES} min between sources)")
+    for job in scheduler.get_jobs():
+        print(f"  {job.id}: next run {job.next_run_time}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        scheduler.shutdown(wait=False)
+        job_runner.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    try:
+        asyncio.run(run_scheduler())
+    except KeyboardInterrupt:
+        print("\nScheduler stopped")
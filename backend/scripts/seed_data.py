@@ -9,7 +9,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal, engine, Base
+from app.db.session import PipelineSessionLocal, pipeline_engine, Base
 from app.models import Country, Indicator
 from app.utils.constants import MVP_COUNTRIES, INDICATORS, COUNTRY_COORDINATES
 
@@ -120,10 +120,10 @@ def main():
 
     # Create tables
     print("\nCreating tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=pipeline_engine)
 
     # Create session
-    db = SessionLocal()
+    db = PipelineSessionLocal()
 
     try:
         # Seed data
@@ -1,112 +1,445 @@
 """
 Complete Data Update Pipeline
-Orchestrates: data fetching → score calculation → database update
+Orchestrates: data fetching → transformation → standardization → scoring → ranking → snapshot
 """
+import argparse
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+import pandas as pd
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.core.config import settings
+from app.db.session import PipelineSessionLocal
+from app.models import Country, Indicator, IndicatorValue, MomentumScore, PipelineRun
+from app.services.jobs import pipeline_lock
+from app.services.pipeline import FAILED, SUCCEEDED, Outputs, PipelineRunner, Stage
+from app.services.fingerprints import stored_series
+from app.services.scheduler import indicator_sources
+from app.services.snapshot import publish_snapshot
 from scripts.fetch_data import DataFetchOrchestrator
 from scripts.calculate_scores import ScoreCalculationPipeline
 
+RAW_COLUMNS = ["country_code", "indicator_id", "date", "value"]
 
-def run_complete_update():
+
+def build_refresh_dag(sources: List[str]) -> List[Stage]:
+    """
+    Build the stages of a full data update
+
+    Each source is fetched and transformed independently of the others;
+    standardization waits for all of them, followed by scoring, ranking
+    and publishing a snapshot.
+
+    Args:
+        sources: Indicator sources, e.g. ["IMF", "World Bank"]
+
+    Returns:
+        Stages of the DAG
+    """
+    stages = []
+    for source in sources:
+        stages.append(Stage(
+            f"fetch:{source}",
+            lambda inputs, source=source: fetch_source(source)
+        ))
+        stages.append(Stage(
+            f"transform:{source}",
+            lambda inputs, source=source: transform_source(source, inputs[f"fetch:{source}"]["raw"]),
+            depends_on=[f"fetch:{source}"]
+        ))
+
+    stages += [
+        Stage(
+            "standardize",
+            lambda inputs: standardize(),
+            depends_on=[f"transform:{source}" for source in sources]
+        ),
+        Stage(
+            "score",
+            lambda inputs: score(inputs["standardize"]),
+            depends_on=["standardize"]
+        ),
+        Stage(
+            "rank",
+            lambda inputs: rank(inputs["standardize"]),
+            depends_on=["standardize", "score"]
+        ),
+        Stage(
+            "snapshot",
+            lambda inputs: snapshot(),
+            depends_on=["rank"]
+        ),
+    ]
+    return stages
+
+
+def fetch_source(source: str) -> Outputs:
+    """
+    Stage: download the raw series of one source for all active countries
+
+    Args:
+        source: Indicator source
+
+    Returns:
+        {"raw": frame with country_code, indicator_id, date and value}
+    """
+    db = PipelineSessionLocal()
+    try:
+        orchestrator = DataFetchOrchestrator(db)
+        countries = db.query(Country).filter(Country.is_active == True).all()
+        indicators = db.query(Indicator).filter(Indicator.source == source).all()
+
+        # Date range (last 5 years)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=5*365)
+
+        frames = []
+        for indicator in indicators:
+            fetcher = orchestrator.fetcher_for(indicator)
+            if fetcher is None or not indicator.source_series_id:
+                print(f"  No fetcher available for {indicator.code} ({source})")
+                continue
+
+            for country in countries:
+                try:
+                    df = fetcher.fetch_indicator(
+                        country.code,
+                        indicator.source_series_id,
+                        start_date,
+                        end_date
+                    )
+                except Exception as e:
+                    print(f"  Error fetching {indicator.code} for {country.code}: {e}")
+                    continue
+
+                if not df.empty:
+                    frames.append(df[["date", "value"]].assign(
+                        country_code=country.code,
+                        indicator_id=indicator.id
+                    ))
+
+        raw = pd.concat(frames, ignore_index=True)[RAW_COLUMNS] if frames else pd.DataFrame(columns=RAW_COLUMNS)
+        print(f"  Fetched {len(raw)} {source} observations")
+        return {"raw": raw}
+    finally:
+        db.close()
+
+
+def transform_source(source: str, raw: pd.DataFrame) -> Outputs:
+    """
+    Stage: calculate momentum values for one source's series and store them
+
+    Series unchanged since they were last stored are skipped, and only new
+    or revised observations are written.
+
+    Args:
+        source: Indicator source
+        raw: Output of the source's fetch stage
+
+    Returns:
+        {"values": written observations with their momentum}
+    """
+    db = PipelineSessionLocal()
+    try:
+        orchestrator = DataFetchOrchestrator(db)
+        indicators = {
+            indicator.id: indicator
+            for indicator in db.query(Indicator).filter(Indicator.source == source).all()
+        }
+
+        frames = []
+        for (indicator_id, country_code), series in raw.groupby(["indicator_id", "country_code"]):
+            indicator = indicators[indicator_id]
+            df = series[["date", "value"]].sort_values("date").reset_index(drop=True)
+            observations = len(df)
+            df, content_hash = orchestrator.revised_observations(
+                country_code,
+                indicator,
+                df,
+                None,
+                lambda: stored_series(db, country_code, indicator.id)
+            )
+            if df is None:
+                continue
+
+            orchestrator.fingerprints.record(country_code, indicator.id, content_hash, observations)
+            orchestrator.store_values(country_code, indicator.id, df)
+            frames.append(df.assign(country_code=country_code, indicator_id=indicator_id))
+
+        orchestrator.print_revisions()
+
+        # Only indicators with fetched observations; failed fetches stay due
+        for indicator_id in raw["indicator_id"].unique():
+            indicators[indicator_id].last_fetched_at = datetime.utcnow()
+        db.commit()
+
+        columns = RAW_COLUMNS + ["momentum"]
+        values = pd.concat(frames, ignore_index=True).reindex(columns=columns) if frames else pd.DataFrame(columns=columns)
+        print(f"  Stored {len(values)} {source} values")
+        return {"values": values}
+    finally:
+        db.close()
+
+
+def standardize() -> Outputs:
+    """
+    Stage: calculate cross-country percentiles at the latest data date
+
+    Returns:
+        {"calculation": one row with the date,
+         "percentiles": indicator_code, country_code and percentile}
+    """
+    db = PipelineSessionLocal()
+    try:
+        calculation_date = db.query(func.max(IndicatorValue.date)).scalar()
+        if calculation_date is None:
+            print("  No indicator data found")
+            return {
+                "calculation": pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]")}),
+                "percentiles": pd.DataFrame(columns=["indicator_code", "country_code", "percentile"]),
+            }
+
+        percentiles = ScoreCalculationPipeline(db).calculate_percentiles(calculation_date)
+        rows = [
+            (indicator_code, country_code, percentile)
+            for indicator_code, country_percentiles in percentiles.items()
+            for country_code, percentile in country_percentiles.items()
+        ]
+        return {
+            "calculation": pd.DataFrame({"date": [calculation_date]}),
+            "percentiles": pd.DataFrame(rows, columns=["indicator_code", "country_code", "percentile"]),
+        }
+    finally:
+        db.close()
+
+
+def score(standardized: Outputs) -> Outputs:
+    """
+    Stage: calculate pillar and momentum scores for all active countries
+
+    Args:
+        standardized: Output of the standardize stage
+
+    Returns:
+        {"scores": momentum scores stored for the calculation date}
+    """
+    columns = ["country_code", "momentum_score", "structural_score", "combined_score", "classification"]
+    if standardized["calculation"].empty:
+        return {"scores": pd.DataFrame(columns=columns)}
+
+    calculation_date = standardized["calculation"]["date"].iloc[0].to_pydatetime()
+    percentile_scores: Dict[str, Dict[str, float]] = {}
+    for row in standardized["percentiles"].itertuples(index=False):
+        percentile_scores.setdefault(row.indicator_code, {})[row.country_code] = row.percentile
+
+    db = PipelineSessionLocal()
+    try:
+        pipeline = ScoreCalculationPipeline(db)
+        countries = db.query(Country).filter(Country.is_active == True).all()
+        print(f"\nCalculating scores for {len(countries)} countries on {calculation_date}")
+
+        for country in countries:
+            try:
+                pipeline.calculate_country_scores(
+                    country,
+                    calculation_date,
+                    percentile_scores,
+                    update_ranks=False
+                )
+            except Exception as e:
+                db.rollback()
+                print(f"Error calculating scores for {country.code}: {e}")
+
+        scores = db.query(*[getattr(MomentumScore, column) for column in columns]).filter(
+            MomentumScore.date == calculation_date
+        ).all()
+        return {"scores": pd.DataFrame(scores, columns=columns)}
+    finally:
+        db.close()
+
+
+def rank(standardized: Outputs) -> Outputs:
+    """
+    Stage: rank countries by momentum score on the calculation date
+
+    Args:
+        standardized: Output of the standardize stage
+
+    Returns:
+        {"ranks": country_code and global_rank}
+    """
+    if standardized["calculation"].empty:
+        return {"ranks": pd.DataFrame(columns=["country_code", "global_rank"])}
+
+    calculation_date = standardized["calculation"]["date"].iloc[0].to_pydatetime()
+
+    db = PipelineSessionLocal()
+    try:
+        ScoreCalculationPipeline(db).update_global_ranks(calculation_date)
+        ranks = db.query(MomentumScore.country_code, MomentumScore.global_rank).filter(
+            MomentumScore.date == calculation_date
+        ).order_by(MomentumScore.global_rank).all()
+        return {"ranks": pd.DataFrame(ranks, columns=["country_code", "global_rank"])}
+    finally:
+        db.close()
+
+
+def snapshot() -> Outputs:
+    """
+    Stage: publish a new data version so API caches are invalidated
+
+    Returns:
+        {"snapshot": one row with the data version}
+    """
+    db = PipelineSessionLocal()
+    try:
+        published = publish_snapshot(db)
+        print(f"\nPublished data version {published.version}")
+        return {"snapshot": pd.DataFrame({"version": [published.version]})}
+    finally:
+        db.close()
+
+
+def print_summary(db: Session):
+    """Print database totals and the top 5 countries"""
+    print("\n" + "=" * 60)
+    print("UPDATE SUMMARY")
+    print("=" * 60)
+
+    # Count statistics
+    num_countries = db.query(Country).filter(Country.is_active == True).count()
+    num_indicators = db.query(IndicatorValue.indicator_id).distinct().count()
+    num_values = db.query(IndicatorValue).count()
+    num_scores = db.query(MomentumScore).count()
+
+    latest_date = db.query(func.max(MomentumScore.date)).scalar()
+
+    print(f"\nActive Countries: {num_countries}")
+    print(f"Indicators Tracked: {num_indicators}")
+    print(f"Total Data Points: {num_values}")
+    print(f"Momentum Scores: {num_scores}")
+    print(f"Latest Score Date: {latest_date}")
+
+    # Get top 5 countries
+    if latest_date:
+        top_countries = db.query(
+            MomentumScore,
+            Country
+        ).join(
+            Country,
+            MomentumScore.country_code == Country.code
+        ).filter(
+            MomentumScore.date == latest_date
+        ).order_by(
+            MomentumScore.global_rank
+        ).limit(5).all()
+
+        print("\nTop 5 Countries by Momentum:")
+        for score, country in top_countries:
+            print(f"  {score.global_rank}. {country.name} - {score.momentum_score:.1f} ({score.classification})")
+
+
+def print_stages(run: PipelineRun):
+    """Print wall time and row count per stage"""
+    print(f"\nPipeline run {run.id}: {run.status} in {run.duration_seconds:.1f}s")
+    for stage in sorted(run.stages, key=lambda stage: stage.started_at):
+        source = " (checkpoint)" if stage.from_checkpoint else ""
+        rows = stage.rows if stage.rows is not None else "-"
+        print(f"  {stage.stage:<28} {stage.status:<10} {stage.duration_seconds:>8.2f}s {rows:>8} rows{source}")
+        if stage.error:
+            print(f"    {stage.error}")
+
+
+def run_complete_update(resume=None, workers: int = None, checkpoint_dir: str = None) -> bool:
     """
     Run the complete data update pipeline:
-    1. Fetch latest data from external APIs
-    2. Calculate momentum scores
-    3. Update rankings
+    1. Fetch latest data from external APIs (per source, in parallel)
+    2. Calculate momentum values (per source)
+    3. Calculate cross-country percentiles
+    4. Calculate momentum scores
+    5. Update rankings
+    6. Publish a data snapshot
+
+    Args:
+        resume: Id of a failed run to continue, or -1 for the latest
+            run if it failed (None: start from scratch)
+        workers: Stages run in parallel (default: PIPELINE_WORKERS)
+        checkpoint_dir: Checkpoint root (default: PIPELINE_CHECKPOINT_DIR)
+
+    Returns:
+        True if the run succeeded
     """
     print("=" * 60)
     print("COUNTRY MOMENTUM INDEX - DATA UPDATE PIPELINE")
     print("=" * 60)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-    db = SessionLocal()
+    with pipeline_lock() as acquired:
+        if not acquired:
+            print("✗ Another pipeline run holds the lock")
+            return False
 
-    try:
-        # Step 1: Fetch Data
-        print("\n" + "=" * 60)
-        print("STEP 1: FETCHING DATA FROM EXTERNAL SOURCES")
-        print("=" * 60)
-
-        fetch_orchestrator = DataFetchOrchestrator(db)
-        fetch_orchestrator.fetch_all_indicators()
-
-        print("\n✓ Data fetching completed")
-
-        # Step 2: Calculate Scores
-        print("\n" + "=" * 60)
-        print("STEP 2: CALCULATING MOMENTUM SCORES")
-        print("=" * 60)
-
-        calc_pipeline = ScoreCalculationPipeline(db)
-        calc_pipeline.calculate_all_scores()
-
-        print("\n✓ Score calculation completed")
-
-        # Step 3: Summary
-        print("\n" + "=" * 60)
-        print("UPDATE SUMMARY")
-        print("=" * 60)
-
-        from app.models import Country, IndicatorValue, MomentumScore
-        from sqlalchemy import func
-
-        # Count statistics
-        num_countries = db.query(Country).filter(Country.is_active == True).count()
-        num_indicators = db.query(IndicatorValue.indicator_id).distinct().count()
-        num_values = db.query(IndicatorValue).count()
-        num_scores = db.query(MomentumScore).count()
-
-        latest_date = db.query(func.max(MomentumScore.date)).scalar()
-
-        print(f"\nActive Countries: {num_countries}")
-        print(f"Indicators Tracked: {num_indicators}")
-        print(f"Total Data Points: {num_values}")
-        print(f"Momentum Scores: {num_scores}")
-        print(f"Latest Score Date: {latest_date}")
-
-        # Get top 5 countries
-        if latest_date:
-            top_countries = db.query(
-                MomentumScore,
-                Country
-            ).join(
-                Country,
-                MomentumScore.country_code == Country.code
-            ).filter(
-                MomentumScore.date == latest_date
-            ).order_by(
-                MomentumScore.global_rank
-            ).limit(5).all()
-
-            print("\nTop 5 Countries by Momentum:")
-            for score, country in top_countries:
-                print(f"  {score.global_rank}. {country.name} - {score.momentum_score:.1f} ({score.classification})")
-
-        print("\n" + "=" * 60)
-        print("✓ PIPELINE COMPLETED SUCCESSFULLY")
-        print("=" * 60)
-        print(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    except Exception as e:
-        print("\n" + "=" * 60)
-        print("✗ ERROR DURING UPDATE")
-        print("=" * 60)
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+        db = PipelineSessionLocal()
 
-    finally:
-        db.close()
+        try:
+            resumed = None
+            if resume is not None:
+                query = db.query(PipelineRun)
+                if resume != -1:
+                    query = query.filter(PipelineRun.id == resume)
+                resumed = query.order_by(PipelineRun.id.desc()).first()
+                if resumed is None or resumed.status != FAILED:
+                    print("✗ No failed pipeline run to resume")
+                    return False
+                print(f"Resuming pipeline run {resumed.id} from {resumed.checkpoint_dir}")
+
+            runner = PipelineRunner(
+                build_refresh_dag(indicator_sources()),
+                db,
+                workers or settings.PIPELINE_WORKERS
+            )
+            run = runner.run(Path(checkpoint_dir or settings.PIPELINE_CHECKPOINT_DIR), resume=resumed)
+
+            print_stages(run)
+
+            if run.status != SUCCEEDED:
+                print("\n" + "=" * 60)
+                print("✗ PIPELINE FAILED")
+                print("=" * 60)
+                print(f"Continue with: python scripts/update_all.py --resume {run.id}")
+                return False
+
+            print_summary(db)
+
+            print("\n" + "=" * 60)
+            print("✓ PIPELINE COMPLETED SUCCESSFULLY")
+            print("=" * 60)
+            print(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            return True
+
+        finally:
+            db.close()
 
 
 if __name__ == "__main__":
-    run_complete_update()
+    parser = argparse.ArgumentParser(description="Run the complete data update pipeline")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        type=int,
+        const=-1,
+        metavar="RUN_ID",
+        help="Continue a failed run after its last successful stages (default: the latest run)"
+    )
+    parser.add_argument("--workers", type=int, help="Stages run in parallel")
+    parser.add_argument("--checkpoint-dir", help="Directory for stage checkpoints")
+    args = parser.parse_args()
+
+    succeeded = run_complete_update(args.resume, args.workers, args.checkpoint_dir)
+    sys.exit(0 if succeeded else 1)
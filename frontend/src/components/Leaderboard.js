@@ -3,15 +3,21 @@ import { useNavigate } from 'react-router-dom';
 import { getLeaderboard } from '../services/api';
 import './Leaderboard.css';
 
-function Leaderboard({ period = '1m', limit = 10 }) {
+function Leaderboard({ period = '1m', limit = 10, preloaded = null }) {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const navigate = useNavigate();
 
   useEffect(() => {
+    if (preloaded) {
+      // Preloaded by the dashboard bootstrap
+      setData(preloaded);
+      setLoading(false);
+      return;
+    }
     loadLeaderboard();
-  }, [period, limit]);
+  }, [period, limit, preloaded]);
 
   const loadLeaderboard = async () => {
     try {
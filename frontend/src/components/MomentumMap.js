@@ -5,7 +5,7 @@ import './MomentumMap.css';
 
 const MAPBOX_TOKEN = process.env.REACT_APP_MAPBOX_TOKEN;
 
-function MomentumMap({ includeStructural = false, onCountryClick }) {
+function MomentumMap({ includeStructural = false, preloaded = null, onCountryClick }) {
   const [mapData, setMapData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -18,8 +18,14 @@ function MomentumMap({ includeStructural = false, onCountryClick }) {
   });
 
   useEffect(() => {
+    if (preloaded) {
+      // Preloaded by the dashboard bootstrap
+      setMapData(preloaded);
+      setLoading(false);
+      return;
+    }
     loadMapData();
-  }, [includeStructural]);
+  }, [includeStructural, preloaded]);
 
   const loadMapData = async () => {
     try {
@@ -1,14 +1,61 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import MomentumMap from '../components/MomentumMap';
 import Leaderboard from '../components/Leaderboard';
+import { getDashboardBootstrap, subscribeToEvents } from '../services/api';
 import './Dashboard.css';
 
+// Apply a snapshot map delta to a GeoJSON feature collection
+const applyMapDelta = (collection, delta) => {
+  const changed = Object.fromEntries(
+    delta.changed.map((feature) => [feature.properties.country_code, feature])
+  );
+  const removed = new Set(delta.removed);
+  const features = collection.features
+    .filter((feature) => !removed.has(feature.properties.country_code))
+    .map((feature) => {
+      const code = feature.properties.country_code;
+      const replacement = changed[code];
+      delete changed[code];
+      return replacement || feature;
+    });
+  return { ...collection, features: features.concat(Object.values(changed)) };
+};
+
 function Dashboard() {
   const [includeStructural, setIncludeStructural] = useState(false);
   const [period, setPeriod] = useState('1m');
+  const [bootstrap, setBootstrap] = useState(null);
+  const [bootstrapLoaded, setBootstrapLoaded] = useState(false);
   const navigate = useNavigate();
 
+  useEffect(() => {
+    // One request for map, leaderboards and scores; components fetch
+    // individually only if this fails
+    getDashboardBootstrap(10)
+      .then(setBootstrap)
+      .catch((err) => console.error(err))
+      .finally(() => setBootstrapLoaded(true));
+  }, []);
+
+  useEffect(() => {
+    // Patch the map in place when a new snapshot is published; leaderboards
+    // refetch their own period
+    return subscribeToEvents({
+      snapshot: ({ version, map_delta }) => {
+        setBootstrap((current) => current && {
+          ...current,
+          data_version: version,
+          leaderboards: {},
+          map_data: {
+            momentum: applyMapDelta(current.map_data.momentum, map_delta.momentum),
+            combined: applyMapDelta(current.map_data.combined, map_delta.combined),
+          },
+        });
+      },
+    });
+  }, []);
+
   const handleCountryClick = (countryCode) => {
     navigate(`/country/${countryCode}`);
   };
@@ -44,6 +91,7 @@ function Dashboard() {
                 <option value="1m">1 Month</option>
                 <option value="3m">3 Months</option>
                 <option value="6m">6 Months</option>
+                <option value="12m">12 Months</option>
               </select>
             </div>
           </div>
@@ -51,15 +99,24 @@ function Dashboard() {
 
         <div className="map-section card">
           <h3 className="card-title">World Map</h3>
-          <MomentumMap
-            includeStructural={includeStructural}
-            onCountryClick={handleCountryClick}
-          />
+          {bootstrapLoaded && (
+            <MomentumMap
+              includeStructural={includeStructural}
+              preloaded={bootstrap && bootstrap.map_data[includeStructural ? 'combined' : 'momentum']}
+              onCountryClick={handleCountryClick}
+            />
+          )}
         </div>
 
         <div className="leaderboard-section">
           <h3 className="section-title">Top Movers</h3>
-          <Leaderboard period={period} limit={10} />
+          {bootstrapLoaded && (
+            <Leaderboard
+              period={period}
+              limit={10}
+              preloaded={bootstrap && bootstrap.leaderboards[period]}
+            />
+          )}
         </div>
 
         <div className="info-section card">
@@ -21,6 +21,13 @@ export const getCountryDetail = async (countryCode) => {
   return response.data;
 };
 
+export const getCountriesBatch = async (countryCodes) => {
+  const response = await api.get('/countries/batch', {
+    params: { codes: countryCodes.join(',') }
+  });
+  return response.data;
+};
+
 export const getCountryHistory = async (countryCode, months = 12) => {
   const response = await api.get(`/countries/${countryCode}/momentum-history`, {
     params: { months }
@@ -48,6 +55,14 @@ export const getMapData = async (includeStructural = false) => {
   return response.data;
 };
 
+// Dashboard API
+export const getDashboardBootstrap = async (limit = 10) => {
+  const response = await api.get('/dashboard/bootstrap', {
+    params: { limit }
+  });
+  return response.data;
+};
+
 // Indicators API
 export const getIndicators = async () => {
   const response = await api.get('/indicators');
@@ -59,9 +74,26 @@ export const getCountryIndicators = async (countryCode) => {
   return response.data;
 };
 
+export const getMultiCountryIndicators = async (countryCodes) => {
+  const response = await api.get('/indicators/latest', {
+    params: { countries: countryCodes.join(',') }
+  });
+  return response.data;
+};
+
 export const refreshData = async () => {
   const response = await api.post('/indicators/refresh');
   return response.data;
 };
 
+// Events API (Server-Sent Events)
+export const subscribeToEvents = (handlers) => {
+  const source = new EventSource(`${API_BASE_URL}/events/stream`);
+  Object.entries(handlers).forEach(([event, handler]) => {
+    source.addEventListener(event, (message) => handler(JSON.parse(message.data)));
+  });
+  // EventSource reconnects on its own and resumes from the last event id
+  return () => source.close();
+};
+
 export default api;